@@ -112,6 +112,8 @@ class DistributedPlayerAI(DistributedAvatarAI.DistributedAvatarAI, PlayerBase.Pl
 
     def setAccessLevel(self, accessLevel):
         self.accessLevel = accessLevel
+        if self.air:
+            self.air.objectRegistry.updateAccessLevel(self)
 
     def getAccessLevel(self):
         return self.accessLevel
@@ -1,6 +1,7 @@
 from direct.directnotify import DirectNotifyGlobal
 from direct.distributed.AstronInternalRepository import AstronInternalRepository
 from direct.distributed.PyDatagram import *
+from otp.distributed.ObjectRegistry import ObjectRegistry
 
 
 # TODO: Remove Astron dependence.
@@ -12,10 +13,24 @@ class OTPInternalRepository(AstronInternalRepository):
     def __init__(self, baseChannel, serverId, dcFileNames, dcSuffix, connectMethod, threadedNet):
         AstronInternalRepository.__init__(self, baseChannel, serverId=serverId, dcFileNames=dcFileNames,
                                           dcSuffix=dcSuffix, connectMethod=connectMethod, threadedNet=threadedNet)
+        self.objectRegistry = ObjectRegistry()
 
     def handleConnected(self):
         AstronInternalRepository.handleConnected(self)
 
+    def addDOToTables(self, do, location=None, ownerView=False):
+        AstronInternalRepository.addDOToTables(self, do, location=location, ownerView=ownerView)
+        if not ownerView:
+            self.objectRegistry.addObject(do)
+
+    def removeDOFromTables(self, do):
+        AstronInternalRepository.removeDOFromTables(self, do)
+        self.objectRegistry.removeObject(do)
+
+    def storeObjectLocation(self, object, parentId, zoneId):
+        AstronInternalRepository.storeObjectLocation(self, object, parentId, zoneId)
+        self.objectRegistry.updateLocation(object)
+
     def getAccountIdFromSender(self):
         return (self.getMsgSender() >> 32) & 0xFFFFFFFF
 
@@ -0,0 +1,111 @@
+from direct.directnotify import DirectNotifyGlobal
+
+
+class ObjectRegistry:
+    """
+    Secondary indexes over a repository's doId2do: players by zone and
+    by access level, and every object by dclass name.  The repository
+    keeps it current from addDOToTables, removeDOFromTables and
+    storeObjectLocation, and DistributedPlayerAI reports access level
+    changes, so "everyone in this zone" or "every DistributedCashbotBoss"
+    costs as much as the answer rather than a walk over every object.
+
+    Query results are fresh lists and safe to hold onto while objects
+    come and go.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('ObjectRegistry')
+
+    def __init__(self):
+        self.doId2do = {}
+        self.className2doIds = {}
+        self.players = {}
+        self.zoneId2PlayerIds = {}
+        self.accessLevel2PlayerIds = {}
+        self.doId2ZoneId = {}
+        self.doId2AccessLevel = {}
+
+    @staticmethod
+    def getClassName(do):
+        dclass = getattr(do, 'dclass', None)
+        if dclass is not None:
+            return dclass.getName()
+        return do.__class__.__name__
+
+    @staticmethod
+    def isPlayer(do):
+        return hasattr(do, 'getAccessLevel') and hasattr(do, 'isPlayerControlled') and do.isPlayerControlled()
+
+    def addObject(self, do):
+        doId = do.doId
+        if doId in self.doId2do:
+            self.removeObject(self.doId2do[doId])
+        self.doId2do[doId] = do
+        self.className2doIds.setdefault(self.getClassName(do), set()).add(doId)
+        if self.isPlayer(do):
+            self.players[doId] = do
+            self.__setPlayerZone(doId, do.zoneId)
+            self.__setPlayerAccessLevel(doId, do.getAccessLevel())
+
+    def removeObject(self, do):
+        doId = do.doId
+        if self.doId2do.get(doId) is not do:
+            return
+        del self.doId2do[doId]
+        self.__discard(self.className2doIds, self.getClassName(do), doId)
+        if doId in self.players:
+            del self.players[doId]
+            self.__setPlayerZone(doId, None)
+            self.__setPlayerAccessLevel(doId, None)
+
+    def updateLocation(self, do):
+        if do.doId in self.players and self.players[do.doId] is do:
+            self.__setPlayerZone(do.doId, do.zoneId)
+
+    def updateAccessLevel(self, do):
+        if do.doId in self.players and self.players[do.doId] is do:
+            self.__setPlayerAccessLevel(do.doId, do.getAccessLevel())
+
+    def __setPlayerZone(self, doId, zoneId):
+        oldZoneId = self.doId2ZoneId.pop(doId, None)
+        if oldZoneId is not None:
+            self.__discard(self.zoneId2PlayerIds, oldZoneId, doId)
+        if zoneId is not None:
+            self.doId2ZoneId[doId] = zoneId
+            self.zoneId2PlayerIds.setdefault(zoneId, set()).add(doId)
+
+    def __setPlayerAccessLevel(self, doId, accessLevel):
+        oldAccessLevel = self.doId2AccessLevel.pop(doId, None)
+        if oldAccessLevel is not None:
+            self.__discard(self.accessLevel2PlayerIds, oldAccessLevel, doId)
+        if accessLevel is not None:
+            self.doId2AccessLevel[doId] = accessLevel
+            self.accessLevel2PlayerIds.setdefault(accessLevel, set()).add(doId)
+
+    @staticmethod
+    def __discard(index, key, doId):
+        doIds = index.get(key)
+        if doIds is None:
+            return
+        doIds.discard(doId)
+        if not doIds:
+            del index[key]
+
+    def __lookup(self, doIds):
+        return [self.doId2do[doId] for doId in doIds]
+
+    def getPlayers(self):
+        return list(self.players.values())
+
+    def getPlayersInZone(self, zoneId):
+        return self.__lookup(self.zoneId2PlayerIds.get(zoneId, ()))
+
+    def getPlayersByAccessLevel(self, accessLevel):
+        return self.__lookup(self.accessLevel2PlayerIds.get(accessLevel, ()))
+
+    def getObjectsByClass(self, className):
+        return self.__lookup(self.className2doIds.get(className, ()))
+
+    def getNumObjects(self, className=None):
+        if className is None:
+            return len(self.doId2do)
+        return len(self.className2doIds.get(className, ()))
@@ -15,7 +15,7 @@ class DistributedLevelAI(DistributedObjectAI.DistributedObjectAI, Level.Level):
         Level.Level.__init__(self)
         self.zoneId = zoneId
         self.entranceId = entranceId
-        if len(avIds) <= 0 or len(avIds) > 4:
+        if len(avIds) > 4:
             self.notify.warning('How do we have this many avIds? avIds: %s' % avIds)
         self.avIdList = avIds
         self.numPlayers = len(self.avIdList)
@@ -69,6 +69,19 @@ class DistributedLevelAI(DistributedObjectAI.DistributedObjectAI, Level.Level):
         Level.Level.initializeLevel(self, self.doId, levelSpec, scenarioIndex)
         if __dev__:
             self.accept(self.editMgrEntity.getSpecSaveEvent(), self.saveSpec)
+        if self.avIdList:
+            self.watchPlayers()
+
+    def setPlayers(self, avIds):
+        # A level built ahead of time for a FacilityPoolAI has no
+        # players until it is handed to the group leaving in an elevator.
+        self.avIdList = avIds
+        self.numPlayers = len(self.avIdList)
+        self.presentAvIds = list(self.avIdList)
+        self.sendUpdate('setPlayerIds', [self.avIdList])
+        self.watchPlayers()
+
+    def watchPlayers(self):
         for avId in self.avIdList:
             self.acceptOnce(self.air.getAvatarExitEvent(avId), Functor(self.handleAvatarDisconnect, avId))
 
@@ -25,7 +25,7 @@ class Level:
         self.nonlocalEntIds = {}
         self.nothingEntIds = {}
         self.entityCreator = self.createEntityCreator()
-        self.entType2ids = self.levelSpec.getEntType2ids(self.levelSpec.getAllEntIds())
+        self.entType2ids = self.levelSpec.getAllEntType2ids()
         for entType in self.entityCreator.getEntityTypes():
             self.entType2ids.setdefault(entType, [])
 
@@ -118,10 +118,7 @@ class Level:
 
     def initializeEntity(self, entity):
         entId = entity.entId
-        spec = self.levelSpec.getEntitySpec(entId)
-        for key, value in list(spec.items()):
-            if key in ('type', 'name', 'comment'):
-                continue
+        for key, value in self.levelSpec.getEntityInitAttribs(entId):
             entity.setAttribInit(key, value)
 
         self.entities[entId] = entity
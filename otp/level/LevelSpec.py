@@ -8,18 +8,78 @@ import importlib
 if __dev__:
     import os
 
+class LevelTemplate:
+    """
+    What LevelSpec works out from a spec module's levelSpec: the entity
+    id lists, which dict holds each entity's spec, every entity's type
+    and zone, the attributes each entity is initialized with, and the
+    type->ids table for each scenario.  It is built once per module and
+    shared by every LevelSpec made from it, and is never changed once
+    built; anything a level needs to change is copied out of it first.
+    """
+
+    def __init__(self, specDict):
+        self.specDict = specDict
+        globalEnts = specDict['globalEntities']
+        self.globalEntIds = tuple(globalEnts.keys())
+        self.entId2specDict = dict.fromkeys(self.globalEntIds, globalEnts)
+        self.scenarioEntIds = []
+        for scenarioEnts in specDict['scenarios']:
+            entIds = tuple(scenarioEnts.keys())
+            self.scenarioEntIds.append(entIds)
+            self.entId2specDict.update(dict.fromkeys(entIds, scenarioEnts))
+
+        self.entId2type = {}
+        self.entId2initAttribs = {}
+        for entId, specDict in self.entId2specDict.items():
+            spec = specDict[entId]
+            self.entId2type[entId] = spec['type']
+            self.entId2initAttribs[entId] = tuple([(key, value) for key, value in spec.items() if key not in ('type', 'name', 'comment')])
+
+        self.entId2zoneEntId = {}
+        for entId in self.entId2specDict:
+            zoneEntId = self.__findZoneEntId(entId)
+            if zoneEntId is not None:
+                self.entId2zoneEntId[entId] = zoneEntId
+
+        self.scenarioEntType2ids = []
+        for entIds in self.scenarioEntIds:
+            entType2ids = {}
+            for entId in self.globalEntIds + entIds:
+                entType2ids.setdefault(self.entId2type[entId], []).append(entId)
+
+            self.scenarioEntType2ids.append(entType2ids)
+
+    def __findZoneEntId(self, entId):
+        # Leave out entities whose parent chain is broken or loops;
+        # LevelSpec walks those itself, as it always has.
+        for i in range(len(self.entId2specDict)):
+            if self.entId2type.get(entId) == 'zone':
+                return entId
+            specDict = self.entId2specDict.get(entId)
+            if specDict is None or 'parentEntId' not in specDict[entId]:
+                return None
+            entId = specDict[entId]['parentEntId']
+
+        return None
+
+
 class LevelSpec:
     notify = DirectNotifyGlobal.directNotify.newCategory('LevelSpec')
     SystemEntIds = (LevelConstants.UberZoneEntId, LevelConstants.LevelMgrEntId, LevelConstants.EditMgrEntId)
+    Templates = {}
 
     def __init__(self, spec = None, scenario = 0):
         newSpec = 0
+        self.template = None
         if type(spec) is types.ModuleType:
             if __dev__:
                 importlib.reload(spec)
-            self.specDict = spec.levelSpec
-            if __dev__:
+                self.specDict = spec.levelSpec
                 self.setFilename(spec.__file__)
+            else:
+                self.template = LevelSpec.getTemplate(spec)
+                self.specDict = self.template.specDict
         elif type(spec) is dict:
             self.specDict = spec
         elif spec is None:
@@ -27,10 +87,13 @@ class LevelSpec:
                 newSpec = 1
                 self.specDict = {'globalEntities': {},
                  'scenarios': [{}]}
-        self.entId2specDict = {}
-        self.entId2specDict.update(list2dict(self.getGlobalEntIds(), value=self.privGetGlobalEntityDict()))
-        for i in range(self.getNumScenarios()):
-            self.entId2specDict.update(list2dict(self.getScenarioEntIds(i), value=self.privGetScenarioEntityDict(i)))
+        if self.template is not None:
+            self.entId2specDict = self.template.entId2specDict
+        else:
+            self.entId2specDict = {}
+            self.entId2specDict.update(list2dict(self.getGlobalEntIds(), value=self.privGetGlobalEntityDict()))
+            for i in range(self.getNumScenarios()):
+                self.entId2specDict.update(list2dict(self.getScenarioEntIds(i), value=self.privGetScenarioEntityDict(i)))
 
         self.setScenario(scenario)
         if __dev__:
@@ -50,9 +113,18 @@ class LevelSpec:
                 self.doSetAttrib(entId, 'name', 'EditMgr')
         return
 
+    @staticmethod
+    def getTemplate(module):
+        template = LevelSpec.Templates.get(module.__name__)
+        if template is None:
+            template = LevelTemplate(module.levelSpec)
+            LevelSpec.Templates[module.__name__] = template
+        return template
+
     def destroy(self):
         del self.specDict
         del self.entId2specDict
+        del self.template
         del self.scenario
         if hasattr(self, 'level'):
             del self.level
@@ -69,11 +141,15 @@ class LevelSpec:
         return self.scenario
 
     def getGlobalEntIds(self):
+        if self.template is not None:
+            return list(self.template.globalEntIds)
         return list(self.privGetGlobalEntityDict().keys())
 
     def getScenarioEntIds(self, scenario = None):
         if scenario is None:
             scenario = self.scenario
+        if self.template is not None:
+            return list(self.template.scenarioEntIds[scenario])
         return list(self.privGetScenarioEntityDict(scenario).keys())
 
     def getAllEntIds(self):
@@ -106,9 +182,18 @@ class LevelSpec:
         return self.getCopyOfSpec(specDict[entId])
 
     def getEntityType(self, entId):
+        if self.template is not None:
+            return self.template.entId2type[entId]
         return self.getEntitySpec(entId)['type']
 
+    def getEntityInitAttribs(self, entId):
+        if self.template is not None:
+            return self.template.entId2initAttribs[entId]
+        return [(key, value) for key, value in self.getEntitySpec(entId).items() if key not in ('type', 'name', 'comment')]
+
     def getEntityZoneEntId(self, entId):
+        if self.template is not None and entId in self.template.entId2zoneEntId:
+            return self.template.entId2zoneEntId[entId]
         spec = self.getEntitySpec(entId)
         type = spec['type']
         if type == 'zone':
@@ -124,6 +209,12 @@ class LevelSpec:
 
         return entType2ids
 
+    def getAllEntType2ids(self):
+        if self.template is not None:
+            entType2ids = self.template.scenarioEntType2ids[self.scenario]
+            return dict([(type, list(entIds)) for type, entIds in entType2ids.items()])
+        return self.getEntType2ids(self.getAllEntIds())
+
     def privGetGlobalEntityDict(self):
         return self.specDict['globalEntities']
 
@@ -0,0 +1,97 @@
+import builtins
+import unittest
+
+try:
+    from toontown.toonbase.ToontownBattleGlobals import *
+except ImportError:
+    AvPropDamageTable = None
+
+
+class game:
+    name = 'toontown'
+    process = 'server'
+
+
+# SuitBattleGlobals pulls in modules that expect the AI's simbase, as
+# BattleCalculatorBenchmark sets it up.
+try:
+    if not hasattr(builtins, 'game'):
+        builtins.game = game
+    from otp.ai.AIBaseGlobal import *
+    from toontown.battle import SuitBattleGlobals
+except ImportError:
+    SuitBattleGlobals = None
+
+BonusCombos = [(organic, prop, stack) for organic in (False, True) for prop in (False, True) for stack in (False, True)]
+
+
+def calcLureAccuracy(attackLevel, organicBonus, propBonus, propAndOrganicBonusStack):
+    # The lure accuracy logic BattleCalculatorAI used before
+    # getAvPropAccuracy existed.
+    propAcc = AvPropAccuracy[LURE_TRACK][attackLevel]
+    if propAndOrganicBonusStack:
+        propAcc = 0
+        if organicBonus:
+            propAcc += AvLureBonusAccuracy[attackLevel]
+        if propBonus:
+            propAcc += AvLureBonusAccuracy[attackLevel]
+    elif organicBonus or propBonus:
+        propAcc = AvLureBonusAccuracy[attackLevel]
+    return propAcc
+
+
+@unittest.skipIf(AvPropDamageTable is None, 'needs panda3d')
+class TestAvPropTables(unittest.TestCase):
+
+    def testDamageMatchesFormula(self):
+        for track in range(len(AvPropDamage)):
+            for level in range(len(AvPropDamage[track])):
+                maxE = AvPropDamage[track][level][1][1]
+                for exp in list(range(max(MaxSkill, maxE) + 1)) + [maxE + 1, maxE * 2]:
+                    for organic, prop, stack in BonusCombos:
+                        expected = calcAvPropDamage(track, level, exp, organic, prop, stack)
+                        actual = getAvPropDamage(track, level, exp, organic, prop, stack)
+                        if actual != expected:
+                            self.fail('damage %s: %s != %s' % ((track, level, exp, organic, prop, stack), actual, expected))
+
+    def testDamageBelowFirstThreshold(self):
+        for track in range(len(AvPropDamage)):
+            for level in range(len(AvPropDamage[track])):
+                for exp in (-1, -100):
+                    for organic, prop, stack in BonusCombos:
+                        self.assertEqual(getAvPropDamage(track, level, exp, organic, prop, stack), calcAvPropDamage(track, level, 0, organic, prop, stack))
+
+    def testAccuracyMatchesFormula(self):
+        for track in range(len(AvPropAccuracy)):
+            for level in range(len(AvPropAccuracy[track])):
+                for organic, prop, stack in BonusCombos:
+                    if track == LURE_TRACK:
+                        expected = calcLureAccuracy(level, organic, prop, stack)
+                    else:
+                        expected = AvPropAccuracy[track][level]
+                    self.assertEqual(getAvPropAccuracy(track, level, organic, prop, stack), expected, (track, level, organic, prop, stack))
+
+
+@unittest.skipIf(SuitBattleGlobals is None, 'needs panda3d with the otp module')
+class TestSuitTables(unittest.TestCase):
+
+    def testDefenseMatchesAttributes(self):
+        for suitName, attributes in SuitBattleGlobals.SuitAttributes.items():
+            self.assertEqual(SuitBattleGlobals.SuitDefenseTable[suitName], tuple(attributes['def']))
+
+    def testAttacksMatchGetSuitAttack(self):
+        attackNames = list(SuitBattleGlobals.SuitAttacks.keys())
+        for suitName, attributes in SuitBattleGlobals.SuitAttributes.items():
+            for level in range(len(attributes['hp'])):
+                for attackNum in range(len(attributes['attacks'])):
+                    atkInfo = SuitBattleGlobals.getSuitAttack(suitName, level, attackNum)
+                    expected = (attackNames.index(atkInfo['name']),
+                     atkInfo['hp'],
+                     atkInfo['acc'],
+                     atkInfo['freq'],
+                     atkInfo['group'])
+                    self.assertEqual(SuitBattleGlobals.SuitAttackTable[suitName][level][attackNum], expected, (suitName, level, attackNum))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import unittest
+
+from toontown.golf.GolfRecording import GolfRecording
+
+
+def makeFlight(numFrames=2000, seed=0):
+    # A ball hit up the fairway that bounces and rolls to a stop, with a
+    # little jitter on every sample like the physics steps give.
+    rng = random.Random(seed)
+    recording = GolfRecording()
+    x = y = 0.0
+    z = 0.5
+    vx, vy, vz = 20.0, 7.0, 15.0
+    dt = 1.0 / 60
+    for frame in range(numFrames):
+        recording.append(frame, x + rng.uniform(-0.001, 0.001), y + rng.uniform(-0.001, 0.001), z)
+        vz -= 9.8 * dt
+        x += vx * dt
+        y += vy * dt
+        z += vz * dt
+        if z < 0.0:
+            z = -z
+            vz = -vz * 0.5
+            vx *= 0.7
+            vy *= 0.7
+        vx *= 0.999
+        vy *= 0.999
+
+    return recording
+
+
+def copyRecording(recording):
+    return GolfRecording.fromBytes(recording.toBytes())
+
+
+def interpolate(keyframes, frame):
+    for index in range(len(keyframes) - 1):
+        start = keyframes[index]
+        end = keyframes[index + 1]
+        if start[0] <= frame <= end[0]:
+            t = float(frame - start[0]) / (end[0] - start[0])
+            return [start[axis] + (end[axis] - start[axis]) * t for axis in (1, 2, 3)]
+
+    raise AssertionError('frame %s is outside the recording' % frame)
+
+
+class TestGolfRecording(unittest.TestCase):
+
+    def assertWithinTolerance(self, tolerance, maxFrames):
+        original = makeFlight()
+        recording = copyRecording(original)
+        errorMult = recording.simplify(tolerance, maxFrames)
+        unpacked = GolfRecording.fromBytes(recording.toBytes())
+        self.assertLessEqual(len(unpacked), maxFrames)
+        self.assertEqual(unpacked[0], original[0])
+        self.assertEqual(unpacked[-1], original[-1])
+        keyframes = [unpacked[index] for index in range(len(unpacked))]
+        for index in range(len(original)):
+            sample = original[index]
+            interpolated = interpolate(keyframes, sample[0])
+            for axis in range(3):
+                self.assertLessEqual(abs(interpolated[axis] - sample[axis + 1]), tolerance[axis] * errorMult + 1e-09)
+
+        return errorMult
+
+    def testRoundTripIsExact(self):
+        original = makeFlight()
+        unpacked = copyRecording(original)
+        self.assertEqual(len(unpacked), len(original))
+        for index in range(len(original)):
+            self.assertEqual(unpacked[index], original[index])
+
+    def testSimplifyKeepsTolerance(self):
+        errorMult = self.assertWithinTolerance((0.05, 0.05, 0.05), 2000)
+        self.assertEqual(errorMult, 1.0)
+
+    def testSimplifyGrowsTolerance(self):
+        errorMult = self.assertWithinTolerance((0.001, 0.001, 0.001), 20)
+        self.assertGreater(errorMult, 1.0)
+
+    def testSimplifyShortRecording(self):
+        recording = GolfRecording()
+        recording.append(0, 1.0, 2.0, 3.0)
+        recording.append(5, 1.5, 2.5, 3.5)
+        self.assertEqual(recording.simplify((0.05, 0.05, 0.05), 120), 1.0)
+        self.assertEqual(len(recording), 2)
+
+    def testMalformedBlobs(self):
+        blob = makeFlight(100).toBytes()
+        for bad in (b'', b'\x80', blob[:-1], blob[:len(blob) // 2], blob + b'\x00', b'\x05\x00'):
+            self.assertRaises(ValueError, GolfRecording.fromBytes, bad)
+
+
+if __name__ == '__main__':
+    unittest.main()
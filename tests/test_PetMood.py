@@ -0,0 +1,123 @@
+import builtins
+import random
+import unittest
+
+try:
+    from direct.showbase.MessengerGlobal import messenger
+    from panda3d.core import ClockObject
+    from toontown.pets import PetMood
+    from toontown.pets import PetTraits
+    from toontown.toonbase import ToontownGlobals
+except ImportError:
+    PetMood = None
+
+MINUTE = 60.0
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+# Enough driftMood steps that the stepped drift is within a few 1e-5 of
+# its limit, which driftMoodOffline should land on.
+NumSteps = 20000
+Tolerance = 1e-4
+
+
+def setUpModule():
+    if PetMood is None:
+        return
+    if not hasattr(builtins, 'messenger'):
+        builtins.messenger = messenger
+    if not hasattr(builtins, 'globalClock'):
+        builtins.globalClock = ClockObject.getGlobalClock()
+
+
+class Pet:
+
+    def __init__(self, traitSeed):
+        self.traits = PetTraits.PetTraits(traitSeed, ToontownGlobals.ToontownCentral)
+
+
+def getAbuse(mood):
+    return (3 * mood.hunger + mood.boredom + mood.loneliness) / 5.0
+
+
+@unittest.skipIf(PetMood is None, 'needs panda3d')
+class TestDriftMoodOffline(unittest.TestCase):
+
+    def makeMoods(self, pet, values):
+        offline = PetMood.PetMood(pet)
+        stepped = PetMood.PetMood(pet)
+        for comp, value in values.items():
+            offline.setComponent(comp, value, announce=0)
+            stepped.setComponent(comp, value, announce=0)
+
+        return (offline, stepped)
+
+    def assertMatchesStepped(self, pet, values, dt):
+        offline, stepped = self.makeMoods(pet, values)
+        offline.driftMoodOffline(dt)
+        step = dt / NumSteps
+        for i in range(NumSteps):
+            stepped.driftMood(dt=step)
+
+        for comp in PetMood.PetMood.Components:
+            self.assertAlmostEqual(offline.getComponent(comp), stepped.getComponent(comp), delta=Tolerance, msg='%s after %ss' % (comp, dt))
+
+        return offline
+
+    def testRandomMoods(self):
+        rng = random.Random(1)
+        for dt in (5 * MINUTE, 3 * HOUR, 2 * DAY, WEEK, 3 * WEEK):
+            pet = Pet(rng.randrange(1 << 16))
+            values = dict([(comp, rng.random()) for comp in PetMood.PetMood.Components])
+            self.assertMatchesStepped(pet, values, dt * rng.uniform(0.5, 1.0))
+
+    def testAngerCrossesTipPoint(self):
+        # Hunger climbs from well under the tip point until it clamps, so
+        # abuse crosses AbuseTipPoint and anger turns from falling to
+        # rising partway through.
+        pet = Pet(7)
+        values = dict([(comp, 0.0) for comp in PetMood.PetMood.Components])
+        values.update({'hunger': 0.2,
+         'boredom': 0.3,
+         'loneliness': 0.3,
+         'anger': 0.5})
+        dt = 2 * WEEK
+        offline, stepped = self.makeMoods(pet, values)
+        self.assertLess(getAbuse(offline), PetMood.PetMood.AbuseTipPoint)
+        offline = self.assertMatchesStepped(pet, values, dt)
+        self.assertGreater(getAbuse(offline), PetMood.PetMood.AbuseTipPoint)
+        self.assertEqual(offline.hunger, 1.0)
+
+    def testAngerClampsPartway(self):
+        # With the pet left starving, anger reaches 1 before the time is
+        # up and has to stay there.
+        pet = Pet(11)
+        values = dict([(comp, 0.0) for comp in PetMood.PetMood.Components])
+        values.update({'hunger': 1.0,
+         'boredom': 1.0,
+         'loneliness': 1.0,
+         'anger': 0.9})
+        offline = self.assertMatchesStepped(pet, values, 8 * WEEK)
+        self.assertEqual(offline.anger, 1.0)
+
+    def testAngerClampsAtZero(self):
+        # Anger only falls while abuse is close to nothing, which hunger
+        # soon puts an end to, so start it just above zero.
+        pet = Pet(13)
+        values = dict([(comp, 0.0) for comp in PetMood.PetMood.Components])
+        values['anger'] = 2e-05
+        offline = self.assertMatchesStepped(pet, values, MINUTE)
+        self.assertEqual(offline.anger, 0.0)
+
+    def testNoTimePassed(self):
+        pet = Pet(17)
+        values = dict([(comp, 0.5) for comp in PetMood.PetMood.Components])
+        offline, stepped = self.makeMoods(pet, values)
+        offline.driftMoodOffline(0)
+        for comp in PetMood.PetMood.Components:
+            self.assertEqual(offline.getComponent(comp), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
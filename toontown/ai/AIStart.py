@@ -2,6 +2,8 @@ from panda3d.core import *
 import builtins
 
 import argparse
+import signal
+import sys
 
 parser = argparse.ArgumentParser(description='Open Toontown - AI Server')
 parser.add_argument('--base-channel', help='The base channel that the server will use.')
@@ -54,6 +56,9 @@ if ':' in host:
 
 simbase.air.connect(host, port)
 
+# Exit normally on SIGTERM too, so atexit handlers get to flush the AI's stores.
+signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
 try:
     run()
 except SystemExit:
@@ -0,0 +1,75 @@
+from direct.directnotify import DirectNotifyGlobal
+
+# Substrings of DNA group names the AI looks for when it populates a
+# zone.  A group is indexed under every key its name contains, just as
+# the old per-type searches matched with "key in name".
+PropKeys = ('racing_pad',
+ 'viewing_pad',
+ 'leaderBoard',
+ 'fishing_pond',
+ 'fishing_spot',
+ 'party_gate',
+ 'starting_block',
+ 'interactive_prop')
+
+# Keys that are also recorded per parent group, for lookups that only
+# look at a group's immediate children (e.g. a racing pad's blocks).
+ChildKeys = ('starting_block', 'fishing_spot')
+
+
+class DNAPropIndex:
+    """
+    Walks a DNAData tree once and records every group whose name
+    contains one of PropKeys, in the same depth-first order a recursive
+    search would find them, along with the battle cells of every vis
+    group.  ToontownAIRepository keeps one of these per loaded DNA tree
+    so each find* helper is a lookup instead of another full walk.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('DNAPropIndex')
+
+    def __init__(self, dnaData):
+        self.dnaData = dnaData
+        self.key2Groups = {}
+        for key in PropKeys:
+            self.key2Groups[key] = []
+
+        self.parent2Children = {}
+        self.battleCells = []
+        self.numGroups = 0
+        self.__scan()
+
+    def __scan(self):
+        stack = [(self.dnaData, None)]
+        while stack:
+            group, parent = stack.pop()
+            self.numGroups += 1
+            name = group.getName()
+            for key in PropKeys:
+                if key in name:
+                    self.key2Groups[key].append(group)
+                    if parent is not None and key in ChildKeys:
+                        self.parent2Children.setdefault(id(parent), (parent, {}))[1].setdefault(key, []).append(group)
+
+            if hasattr(group, 'getNumBattleCells'):
+                for i in range(group.getNumBattleCells()):
+                    self.battleCells.append((name, group.getBattleCell(i)))
+
+            numChildren = group.getNumChildren()
+            for i in range(numChildren - 1, -1, -1):
+                stack.append((group.at(i), group))
+
+    def getGroups(self, key):
+        return self.key2Groups.get(key, [])
+
+    def getChildren(self, group, key):
+        """
+        Returns the immediate children of group whose names contain key,
+        or None if this index has no record of group having any.
+        """
+        entry = self.parent2Children.get(id(group))
+        if entry is None or entry[0] is not group:
+            return None
+        return entry[1].get(key, [])
+
+    def getBattleCells(self):
+        return self.battleCells
@@ -0,0 +1,108 @@
+from otp.ai.AIBaseGlobal import *
+from direct.directnotify import DirectNotifyGlobal
+from direct.task import Task
+from toontown.hood import ZoneUtil
+
+
+class PopulationPublisherAI:
+    """
+    Keeps the district's avatar counts and the per-hood populations.
+
+    Counts change locally as soon as a toon logs in, logs out or moves,
+    so ToontownDistrictStatsAI's getters are always current, but the
+    broadcast to clients watching the districts zone is coalesced: at
+    most one update per population-publish-interval seconds, sent
+    straight away if a count has drifted population-publish-delta or
+    more from what clients last saw.  An interval of 0 publishes every
+    change, as before.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('PopulationPublisherAI')
+
+    def __init__(self, air):
+        self.air = air
+        self.publishInterval = config.GetFloat('population-publish-interval', 5.0)
+        self.publishDelta = config.GetInt('population-publish-delta', 25)
+        self.taskName = 'publishPopulation-%s' % id(self)
+        self.publishedAvatarCount = 0
+        self.publishedNewAvatarCount = 0
+        self.avId2ZoneId = {}
+        self.numChanges = 0
+        self.numPublished = 0
+
+    def cleanup(self):
+        taskMgr.remove(self.taskName)
+        self.publish()
+
+    def adjustAvatarCount(self, delta):
+        districtStats = self.air.districtStats
+        districtStats.setAvatarCount(districtStats.getAvatarCount() + delta)
+        self.__changed()
+
+    def adjustNewAvatarCount(self, delta):
+        districtStats = self.air.districtStats
+        districtStats.setNewAvatarCount(districtStats.getNewAvatarCount() + delta)
+        self.__changed()
+
+    def __changed(self):
+        self.numChanges += 1
+        districtStats = self.air.districtStats
+        drift = max(abs(districtStats.getAvatarCount() - self.publishedAvatarCount), abs(districtStats.getNewAvatarCount() - self.publishedNewAvatarCount))
+        if self.publishInterval <= 0 or drift >= self.publishDelta:
+            taskMgr.remove(self.taskName)
+            self.publish()
+        elif not taskMgr.hasTaskNamed(self.taskName):
+            taskMgr.doMethodLater(self.publishInterval, self.__publishTask, self.taskName)
+
+    def __publishTask(self, task):
+        self.publish()
+        return Task.done
+
+    def publish(self):
+        districtStats = self.air.districtStats
+        avatarCount = districtStats.getAvatarCount()
+        newAvatarCount = districtStats.getNewAvatarCount()
+        if avatarCount != self.publishedAvatarCount:
+            districtStats.d_setAvatarCount(avatarCount)
+            self.publishedAvatarCount = avatarCount
+            self.numPublished += 1
+        if newAvatarCount != self.publishedNewAvatarCount:
+            districtStats.d_setNewAvatarCount(newAvatarCount)
+            self.publishedNewAvatarCount = newAvatarCount
+            self.numPublished += 1
+
+    def getHood(self, zoneId):
+        hoodId = ZoneUtil.getHoodId(zoneId)
+        for hood in self.air.hoods:
+            if hood.zoneId == hoodId:
+                return hood
+
+        return None
+
+    def toonChangedZone(self, avId, newZoneId):
+        """
+        Moves avId's contribution to HoodDataAI.hoodPopulation and
+        pgPopulation from the hood it was in to the one containing
+        newZoneId.  A newZoneId of None means the toon has left.
+        """
+        oldZoneId = self.avId2ZoneId.get(avId)
+        if oldZoneId == newZoneId:
+            return
+        if oldZoneId is not None:
+            hood = self.getHood(oldZoneId)
+            if hood:
+                hood.incrementPopulation(oldZoneId, -1)
+        if newZoneId is None or ZoneUtil.isDynamicZone(newZoneId):
+            self.avId2ZoneId.pop(avId, None)
+            return
+        self.avId2ZoneId[avId] = newZoneId
+        hood = self.getHood(newZoneId)
+        if hood:
+            hood.incrementPopulation(newZoneId, 1)
+
+    def toonLeft(self, avId):
+        self.toonChangedZone(avId, None)
+
+    def getStats(self):
+        return {'changes': self.numChanges,
+         'published': self.numPublished,
+         'tracked': len(self.avId2ZoneId)}
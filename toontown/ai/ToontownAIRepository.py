@@ -5,9 +5,12 @@ from panda3d.toontown import *
 from otp.ai.AIZoneData import AIZoneDataStore
 from otp.ai.TimeManagerAI import TimeManagerAI
 from otp.distributed.OtpDoGlobals import *
+from toontown.ai.DNAPropIndex import DNAPropIndex
 from toontown.ai.HolidayManagerAI import HolidayManagerAI
 from toontown.ai.NewsManagerAI import NewsManagerAI
+from toontown.ai.PopulationPublisherAI import PopulationPublisherAI
 from toontown.ai.WelcomeValleyManagerAI import WelcomeValleyManagerAI
+from toontown.building.BuildingStateStoreAI import BuildingStateStoreAI
 from toontown.building.DistributedTrophyMgrAI import DistributedTrophyMgrAI
 from toontown.catalog.CatalogManagerAI import CatalogManagerAI
 from toontown.coghq.CogSuitManagerAI import CogSuitManagerAI
@@ -19,6 +22,7 @@ from toontown.coghq.PromotionManagerAI import PromotionManagerAI
 from toontown.distributed.ToontownDistrictAI import ToontownDistrictAI
 from toontown.distributed.ToontownDistrictStatsAI import ToontownDistrictStatsAI
 from toontown.distributed.ToontownInternalRepository import ToontownInternalRepository
+from toontown.golf.GolfShotSimulatorAI import GolfShotSimulatorAI
 from toontown.hood import ZoneUtil
 from toontown.hood.BRHoodDataAI import BRHoodDataAI
 from toontown.hood.BossbotHQDataAI import BossbotHQDataAI
@@ -45,10 +49,14 @@ from toontown.racing.RaceManagerAI import RaceManagerAI
 from toontown.safezone.SafeZoneManagerAI import SafeZoneManagerAI
 from toontown.shtiker.CogPageManagerAI import CogPageManagerAI
 from toontown.spellbook.ToontownMagicWordManagerAI import ToontownMagicWordManagerAI
+from toontown.suit import SuitGraph
 from toontown.suit.SuitInvasionManagerAI import SuitInvasionManagerAI
+from toontown.suit.SuitPopulationSchedulerAI import SuitPopulationSchedulerAI
 from toontown.toon import NPCToons
+from toontown.toon.NPCZoneManagerAI import NPCZoneManagerAI
 from toontown.toonbase import ToontownGlobals
 from toontown.uberdog.DistributedInGameNewsMgrAI import DistributedInGameNewsMgrAI
+import atexit
 import os
 
 
@@ -64,19 +72,26 @@ class ToontownAIRepository(ToontownInternalRepository):
         self.dataFolder = config.GetString('server-data-folder', '')
         if self.dataFolder:
             self.dataFolder = self.dataFolder + '/'
+        self.wantSuitGraphCache = config.GetBool('want-suit-graph-cache', True)
+        self.suitGraphFolder = config.GetString('suit-graph-cache-folder', self.dataFolder + 'suitGraphs')
         self.districtId = None
         self.district = None
         self.districtStats = None
+        self.populationPublisher = None
         self.holidayManager = None
         self.zoneDataStore = None
+        self.buildingStateStore = None
         self.petMgr = None
         self.suitInvasionManager = None
+        self.suitPopulationScheduler = None
         self.zoneAllocator = None
         self.zoneId2owner = {}
         self.questManager = None
+        self.npcZoneManager = None
         self.promotionMgr = None
         self.cogPageManager = None
         self.raceMgr = None
+        self.golfShotSimulator = None
         self.countryClubMgr = None
         self.factoryMgr = None
         self.mintMgr = None
@@ -93,6 +108,8 @@ class ToontownAIRepository(ToontownInternalRepository):
         self.zoneTable = {}
         self.dnaStoreMap = {}
         self.dnaDataMap = {}
+        self.dnaPropIndexes = {}
+        self.suitGraphMap = {}
         self.hoods = []
         self.buildingManagers = {}
         self.suitPlanners = {}
@@ -118,6 +135,9 @@ class ToontownAIRepository(ToontownInternalRepository):
         self.notify.info('Creating local objects...')
         self.createLocals()
 
+        # Close them again when the AI exits, so their last writes reach disk.
+        atexit.register(self.closeLocals)
+
         # Create our global objects.
         self.notify.info('Creating global objects...')
         self.createGlobals()
@@ -135,24 +155,43 @@ class ToontownAIRepository(ToontownInternalRepository):
         Creates "local" (non-distributed) objects.
         """
 
+        # Create our golf shot simulator first, so its workers are
+        # forked before the data stores start their writer threads...
+        numGolfWorkers = config.GetInt('golf-sim-workers', 0)
+        if numGolfWorkers > 0:
+            self.golfShotSimulator = GolfShotSimulatorAI(self, numGolfWorkers)
+            self.golfShotSimulator.start()
+
         # Create our holiday manager...
         self.holidayManager = HolidayManagerAI(self)
 
         # Create our zone data store...
         self.zoneDataStore = AIZoneDataStore()
 
+        # Load our building states...
+        self.buildingStateStore = BuildingStateStoreAI(self)
+        self.buildingStateStore.open()
+
         # Create our pet manager...
         self.petMgr = PetManagerAI(self)
 
         # Create our suit invasion manager...
         self.suitInvasionManager = SuitInvasionManagerAI(self)
 
+        # Create our suit population scheduler...
+        if config.GetBool('want-suit-population-scheduler', True):
+            self.suitPopulationScheduler = SuitPopulationSchedulerAI(self)
+            self.suitPopulationScheduler.start()
+
         # Create our zone allocator...
         self.zoneAllocator = UniqueIdAllocator(ToontownGlobals.DynamicZonesBegin, ToontownGlobals.DynamicZonesEnd)
 
         # Create our quest manager...
         self.questManager = QuestManagerAI(self)
 
+        # Create our NPC zone manager...
+        self.npcZoneManager = NPCZoneManagerAI(self)
+
         # Create our promotion manager...
         self.promotionMgr = PromotionManagerAI(self)
 
@@ -177,6 +216,28 @@ class ToontownAIRepository(ToontownInternalRepository):
         # Create our Cog suit manager...
         self.cogSuitMgr = CogSuitManagerAI(self)
 
+    def closeLocals(self):
+        """
+        Stops the tasks, writer threads and worker processes the local
+        objects keep running behind the task loop.
+        """
+        # The stores go first, so nothing below that fails keeps
+        # their last writes from reaching disk.
+        if self.buildingStateStore:
+            self.buildingStateStore.close()
+
+        if self.raceMgr:
+            self.raceMgr.recordStore.close()
+
+        if self.suitPopulationScheduler:
+            self.suitPopulationScheduler.stop()
+
+        if self.populationPublisher:
+            self.populationPublisher.cleanup()
+
+        if self.golfShotSimulator:
+            self.golfShotSimulator.stop()
+
     def createGlobals(self):
         """
         Creates "global" (distributed) objects.
@@ -187,6 +248,7 @@ class ToontownAIRepository(ToontownInternalRepository):
         self.districtStats.settoontownDistrictId(self.districtId)
         self.districtStats.generateWithRequiredAndId(self.allocateChannel(), self.district.getDoId(),
                                                      OTP_ZONE_ID_DISTRICTS_STATS)
+        self.populationPublisher = PopulationPublisherAI(self)
 
         # Generate our time manager...
         self.timeManager = TimeManagerAI(self)
@@ -368,6 +430,42 @@ class ToontownAIRepository(ToontownInternalRepository):
     def loadDNAFileAI(self, dnaStore, dnaFileName):
         return loadDNAFileAI(dnaStore, dnaFileName)
 
+    def getSuitGraph(self, zoneId):
+        """
+        Returns the compiled SuitGraph for the street containing zoneId,
+        built from the DNAStorage generateHood already loaded, or None
+        if we never loaded DNA for that street.
+        """
+        canonicalZoneId = ZoneUtil.getCanonicalZoneId(zoneId)
+        suitGraph = self.suitGraphMap.get(canonicalZoneId)
+        if suitGraph:
+            return suitGraph
+
+        dnaStore = self.dnaStoreMap.get(canonicalZoneId)
+        if not dnaStore:
+            return None
+
+        dnaFileName = None
+        cacheFolder = None
+        if self.wantSuitGraphCache:
+            dnaFileName = self.lookupDNAFileName(self.genDNAFileName(canonicalZoneId))
+            cacheFolder = self.suitGraphFolder
+
+        suitGraph = SuitGraph.loadSuitGraph(dnaStore, canonicalZoneId, dnaFileName, cacheFolder)
+        self.suitGraphMap[canonicalZoneId] = suitGraph
+        return suitGraph
+
+    def getDNAPropIndex(self, dnaData):
+        """
+        Returns the DNAPropIndex for a loaded DNA tree, scanning it the
+        first time any find* helper asks about it.
+        """
+        propIndex = self.dnaPropIndexes.get(id(dnaData))
+        if propIndex is None or propIndex.dnaData is not dnaData:
+            propIndex = DNAPropIndex(dnaData)
+            self.dnaPropIndexes[id(dnaData)] = propIndex
+        return propIndex
+
     def findFishingPonds(self, dnaData, zoneId, area):
         return [], []  # TODO
 
@@ -376,9 +474,9 @@ class ToontownAIRepository(ToontownInternalRepository):
 
     def findRacingPads(self, dnaData, zoneId, area, type='racing_pad', overrideDNAZone=False):
         kartPads, kartPadGroups = [], []
-        if type in dnaData.getName():
+        for dnaGroup in self.getDNAPropIndex(dnaData).getGroups(type):
             if type == 'racing_pad':
-                nameSplit = dnaData.getName().split('_')
+                nameSplit = dnaGroup.getName().split('_')
                 racePad = DistributedRacePadAI(self)
                 racePad.setArea(area)
                 racePad.index = int(nameSplit[2])
@@ -388,51 +486,53 @@ class ToontownAIRepository(ToontownInternalRepository):
                 racePad.laps = trackInfo[2]
                 racePad.generateWithRequired(zoneId)
                 kartPads.append(racePad)
-                kartPadGroups.append(dnaData)
+                kartPadGroups.append(dnaGroup)
             elif type == 'viewing_pad':
                 viewPad = DistributedViewPadAI(self)
                 viewPad.setArea(area)
                 viewPad.generateWithRequired(zoneId)
                 kartPads.append(viewPad)
-                kartPadGroups.append(dnaData)
-
-        for i in range(dnaData.getNumChildren()):
-            foundKartPads, foundKartPadGroups = self.findRacingPads(dnaData.at(i), zoneId, area, type, overrideDNAZone)
-            kartPads.extend(foundKartPads)
-            kartPadGroups.extend(foundKartPadGroups)
+                kartPadGroups.append(dnaGroup)
 
         return kartPads, kartPadGroups
 
     def findStartingBlocks(self, dnaData, kartPad):
         startingBlocks = []
-        for i in range(dnaData.getNumChildren()):
-            groupName = dnaData.getName()
-            block = dnaData.at(i)
+        groupName = dnaData.getName()
+        blocks = None
+        for propIndex in self.dnaPropIndexes.values():
+            blocks = propIndex.getChildren(dnaData, 'starting_block')
+            if blocks is not None:
+                break
+
+        if blocks is None:
+            blocks = []
+            for i in range(dnaData.getNumChildren()):
+                block = dnaData.at(i)
+                if 'starting_block' in block.getName():
+                    blocks.append(block)
+
+        for block in blocks:
             blockName = block.getName()
-            if 'starting_block' in blockName:
-                cls = DistributedStartingBlockAI if 'racing_pad' in groupName else DistributedViewingBlockAI
-                x, y, z = block.getPos()
-                h, p, r = block.getHpr()
-                padLocationId = int(blockName[-1])
-                startingBlock = cls(self, kartPad, x, y, z, h, p, r, padLocationId)
-                startingBlock.generateWithRequired(kartPad.zoneId)
-                startingBlocks.append(startingBlock)
+            cls = DistributedStartingBlockAI if 'racing_pad' in groupName else DistributedViewingBlockAI
+            x, y, z = block.getPos()
+            h, p, r = block.getHpr()
+            padLocationId = int(blockName[-1])
+            startingBlock = cls(self, kartPad, x, y, z, h, p, r, padLocationId)
+            startingBlock.generateWithRequired(kartPad.zoneId)
+            startingBlocks.append(startingBlock)
 
         return startingBlocks
 
     def findLeaderBoards(self, dnaData, zoneId):
         leaderBoards = []
-        if 'leaderBoard' in dnaData.getName():
-            x, y, z = dnaData.getPos()
-            h, p, r = dnaData.getHpr()
-            leaderBoard = DistributedLeaderBoardAI(self, dnaData.getName(), x, y, z, h, p, r)
+        for dnaGroup in self.getDNAPropIndex(dnaData).getGroups('leaderBoard'):
+            x, y, z = dnaGroup.getPos()
+            h, p, r = dnaGroup.getHpr()
+            leaderBoard = DistributedLeaderBoardAI(self, dnaGroup.getName(), x, y, z, h, p, r)
             leaderBoard.generateWithRequired(zoneId)
             leaderBoards.append(leaderBoard)
 
-        for i in range(dnaData.getNumChildren()):
-            foundLeaderBoards = self.findLeaderBoards(dnaData.at(i), zoneId)
-            leaderBoards.extend(foundLeaderBoards)
-
         return leaderBoards
 
     def getTrackClsends(self):
@@ -448,10 +548,10 @@ class ToontownAIRepository(ToontownInternalRepository):
         return self.zoneDataStore
 
     def incrementPopulation(self):
-        self.districtStats.b_setAvatarCount(self.districtStats.getAvatarCount() + 1)
+        self.populationPublisher.adjustAvatarCount(1)
 
     def decrementPopulation(self):
-        self.districtStats.b_setAvatarCount(self.districtStats.getAvatarCount() - 1)
+        self.populationPublisher.adjustAvatarCount(-1)
 
     def allocateZone(self, owner=None):
         zoneId = self.zoneAllocator.allocate()
@@ -23,12 +23,12 @@ class WelcomeValleyManagerAI(DistributedObjectAI):
         inWelcomeValley = self.isAccepting(event)
         if not ZoneUtil.isDynamicZone(zoneId):
             if ZoneUtil.isWelcomeValley(zoneId) and not inWelcomeValley:
-                self.air.districtStats.b_setNewAvatarCount(self.air.districtStats.getNewAvatarCount() + 1)
+                self.air.populationPublisher.adjustNewAvatarCount(1)
                 self.accept(event, lambda newZoneId, _: self.toonSetZone(doId, newZoneId))
                 self.accept(self.air.getAvatarExitEvent(doId), self.toonSetZone,
                             extraArgs=[doId, ToontownGlobals.ToontownCentral])
             elif (not ZoneUtil.isWelcomeValley(zoneId)) and inWelcomeValley:
-                self.air.districtStats.b_setNewAvatarCount(self.air.districtStats.getNewAvatarCount() - 1)
+                self.air.populationPublisher.adjustNewAvatarCount(-1)
                 self.ignore(event)
                 self.ignore(self.air.getAvatarExitEvent(doId))
 
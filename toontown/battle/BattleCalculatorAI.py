@@ -144,21 +144,20 @@ class BattleCalculatorAI:
             randChoice = 0
         else:
             randChoice = random.randint(0, 99)
-        propAcc = AvPropAccuracy[atkTrack][atkLevel]
         if atkTrack == LURE:
             treebonus = self.__toonCheckGagBonus(attack[TOON_ID_COL], atkTrack, atkLevel)
             propBonus = self.__checkPropBonus(atkTrack)
-            if self.propAndOrganicBonusStack:
-                propAcc = 0
-                if treebonus:
-                    self.notify.debug('using organic bonus lure accuracy')
-                    propAcc += AvLureBonusAccuracy[atkLevel]
-                if propBonus:
-                    self.notify.debug('using prop bonus lure accuracy')
-                    propAcc += AvLureBonusAccuracy[atkLevel]
-            elif treebonus or propBonus:
-                self.notify.debug('using oragnic OR prop bonus lure accuracy')
-                propAcc = AvLureBonusAccuracy[atkLevel]
+            if debug:
+                if self.propAndOrganicBonusStack:
+                    if treebonus:
+                        self.notify.debug('using organic bonus lure accuracy')
+                    if propBonus:
+                        self.notify.debug('using prop bonus lure accuracy')
+                elif treebonus or propBonus:
+                    self.notify.debug('using oragnic OR prop bonus lure accuracy')
+            propAcc = getAvPropAccuracy(atkTrack, atkLevel, treebonus, propBonus, self.propAndOrganicBonusStack)
+        else:
+            propAcc = AvPropAccuracy[atkTrack][atkLevel]
         attackAcc = propAcc + trackExp + tgtDef
         currAtk = self.toonAtkOrder.index(attackIndex)
         if currAtk > 0 and atkTrack != HEAL:
@@ -240,7 +239,7 @@ class BattleCalculatorAI:
     def __targetDefense(self, suit, atkTrack):
         if atkTrack == HEAL:
             return 0
-        suitDef = SuitBattleGlobals.SuitAttributes[suit.dna.name]['def'][suit.getLevel()]
+        suitDef = SuitBattleGlobals.SuitDefenseTable[suit.dna.name][suit.getLevel()]
         return -suitDef
 
     def __createToonTargetList(self, attackIndex):
@@ -1116,12 +1115,12 @@ class BattleCalculatorAI:
                 return 0
         theSuit = self.battle.activeSuits[attackIndex]
         atkType = self.battle.suitAttacks[attackIndex][SUIT_ATK_COL]
-        atkInfo = SuitBattleGlobals.getSuitAttack(theSuit.dna.name, theSuit.getLevel(), atkType)
-        atkAcc = atkInfo['acc']
-        suitAcc = SuitBattleGlobals.SuitAttributes[theSuit.dna.name]['acc'][theSuit.getLevel()]
+        atkInfo = SuitBattleGlobals.SuitAttackTable[theSuit.dna.name][theSuit.getLevel()][atkType]
+        atkAcc = atkInfo[SuitBattleGlobals.SUIT_ATK_ACC]
         acc = atkAcc
         randChoice = random.randint(0, 99)
         if self.notify.getDebug():
+            suitAcc = SuitBattleGlobals.SuitAttributes[theSuit.dna.name]['acc'][theSuit.getLevel()]
             self.notify.debug('Suit attack rolled ' + str(randChoice) + ' to hit with an accuracy of ' + str(acc) + ' (attackAcc: ' + str(atkAcc) + ' suitAcc: ' + str(suitAcc) + ')')
         if randChoice < acc:
             return 1
@@ -1130,8 +1129,8 @@ class BattleCalculatorAI:
     def __suitAtkAffectsGroup(self, attack):
         atkType = attack[SUIT_ATK_COL]
         theSuit = self.battle.findSuit(attack[SUIT_ID_COL])
-        atkInfo = SuitBattleGlobals.getSuitAttack(theSuit.dna.name, theSuit.getLevel(), atkType)
-        return atkInfo['group'] != SuitBattleGlobals.ATK_TGT_SINGLE
+        atkInfo = SuitBattleGlobals.SuitAttackTable[theSuit.dna.name][theSuit.getLevel()][atkType]
+        return atkInfo[SuitBattleGlobals.SUIT_ATK_GROUP] != SuitBattleGlobals.ATK_TGT_SINGLE
 
     def __createSuitTargetList(self, attackIndex):
         attack = self.battle.suitAttacks[attackIndex]
@@ -1170,8 +1169,8 @@ class BattleCalculatorAI:
                     if self.__suitAtkHit(attackIndex):
                         atkType = attack[SUIT_ATK_COL]
                         theSuit = self.battle.findSuit(attack[SUIT_ID_COL])
-                        atkInfo = SuitBattleGlobals.getSuitAttack(theSuit.dna.name, theSuit.getLevel(), atkType)
-                        result = atkInfo['hp']
+                        atkInfo = SuitBattleGlobals.SuitAttackTable[theSuit.dna.name][theSuit.getLevel()][atkType]
+                        result = atkInfo[SuitBattleGlobals.SUIT_ATK_HP]
             targetIndex = self.battle.activeToons.index(toonId)
             attack[SUIT_HP_COL][targetIndex] = result
 
@@ -0,0 +1,342 @@
+"""
+Headless benchmark for BattleCalculatorAI.
+
+Builds battles from synthetic (or recorded) toon and suit rosters and
+replays rounds through BattleCalculatorAI.calculateRound with no
+connection to a message director.  It reports rounds per second and
+the time spent in each phase of the round, and records a digest of
+every round's outcome so a later run (with the same seed and rosters)
+can tell whether a change to the battle code altered the results.
+
+Run from the repository root:
+
+    python3 -m toontown.battle.BattleCalculatorBenchmark --rounds 5000
+    python3 -m toontown.battle.BattleCalculatorBenchmark --save-baseline bench.json
+    python3 -m toontown.battle.BattleCalculatorBenchmark --baseline bench.json
+
+A recorded roster file is a JSON list of battles, each of the form:
+
+    {"toons": [{"exp": [0, 0, 0, 0, 0, 0, 0], "hp": 15}],
+     "suits": [{"name": "f", "level": 1}],
+     "interactivePropTrackBonus": -1}
+"""
+
+from panda3d.core import *
+import builtins
+
+import argparse
+
+parser = argparse.ArgumentParser(description='Open Toontown - BattleCalculatorAI benchmark')
+parser.add_argument('--rounds', type=int, default=2000, help='The number of rounds to simulate.')
+parser.add_argument('--battles', type=int, default=50, help='The number of synthetic battles to build.')
+parser.add_argument('--seed', type=int, default=0, help='The random seed used for rosters and rolls.')
+parser.add_argument('--roster', help='A JSON file of recorded battle rosters to use instead of synthetic ones.')
+parser.add_argument('--baseline', help='A JSON file of outcome digests to compare this run against.')
+parser.add_argument('--save-baseline', help='Write the outcome digests of this run to this JSON file.')
+parser.add_argument('config', nargs='*', default=['etc/Configrc.prc'],
+                    help='PRC file(s) that will be loaded before running.')
+args = parser.parse_args()
+
+for prc in args.config:
+    loadPrcFile(prc)
+
+loadPrcFileData('Battle Benchmark Config', 'notify-level-BattleCalculatorAI warning\n')
+
+
+class game:
+    name = 'toontown'
+    process = 'server'
+
+
+builtins.game = game
+
+from otp.ai.AIBaseGlobal import *
+from toontown.toon.Experience import Experience
+from toontown.toonbase.ToontownBattleGlobals import *
+from toontown.suit import SuitDNA
+from toontown.battle import SuitBattleGlobals
+from toontown.battle.BattleBase import *
+import hashlib
+import json
+import random
+import time
+
+
+class BenchAIRepository:
+    """
+    The handful of repository features BattleCalculatorAI reaches for
+    through simbase.air.
+    """
+
+    def __init__(self):
+        self.doId2do = {}
+
+    def writeServerEvent(self, *args):
+        pass
+
+
+simbase.air = BenchAIRepository()
+
+from toontown.battle.BattleCalculatorAI import BattleCalculatorAI
+
+# The calculator's private methods we time, keyed by the name we report
+# them under.  calculateRound reaches them through normal attribute
+# lookup, so wrapping them on the instance is enough.
+Phases = (('initRound', '_BattleCalculatorAI__initRound'),
+ ('toonAttacks', '_BattleCalculatorAI__calculateToonAttacks'),
+ ('bonuses', '_BattleCalculatorAI__processBonuses'),
+ ('postProcess', '_BattleCalculatorAI__postProcessToonAttacks'),
+ ('lureTimeouts', '_BattleCalculatorAI__updateLureTimeouts'),
+ ('suitAttacks', '_BattleCalculatorAI__calculateSuitAttacks'))
+
+
+class BenchToon:
+
+    def __init__(self, doId, exp, hp):
+        self.doId = doId
+        self.experience = Experience()
+        self.experience.experience = list(exp)
+        self.hp = hp
+        self.maxHp = hp
+        self.immortalMode = 0
+        self.DISLid = 0
+
+    def checkGagBonus(self, track, level):
+        return False
+
+    def getPinkSlips(self):
+        return 0
+
+    def removePinkSlips(self, amount):
+        pass
+
+
+class BenchSuit:
+
+    def __init__(self, doId, name, level):
+        self.doId = doId
+        self.dna = SuitDNA.SuitDNA()
+        self.dna.newSuit(name)
+        attributes = SuitBattleGlobals.SuitAttributes[name]
+        self.level = max(0, min(level - attributes['level'] - 1, len(attributes['hp']) - 1))
+        self.maxHP = attributes['hp'][self.level]
+        self.currHP = self.maxHP
+        self.skeleRevives = 0
+        self.reviveFlag = 0
+        self.battleTrap = NO_TRAP
+
+    def getDoId(self):
+        return self.doId
+
+    def isGenerated(self):
+        return False
+
+    def getLevel(self):
+        return self.level
+
+    def getActualLevel(self):
+        return SuitBattleGlobals.getActualFromRelativeLevel(self.dna.name, self.level) + 1
+
+    def getHP(self):
+        return self.currHP
+
+    def setHP(self, hp):
+        self.currHP = min(hp, self.maxHP)
+
+    def b_setHP(self, hp):
+        self.setHP(hp)
+
+    def getSkeleRevives(self):
+        return self.skeleRevives
+
+    def useSkeleRevive(self):
+        self.skeleRevives -= 1
+        self.currHP = self.maxHP
+        self.reviveFlag = 1
+
+    def reviveCheckAndClear(self):
+        returnValue = self.reviveFlag
+        self.reviveFlag = 0
+        return returnValue
+
+
+class BenchBattle:
+    """
+    Just enough of DistributedBattleBaseAI for BattleCalculatorAI: the
+    active toon and suit lists, the attack tables and the lookups the
+    calculator uses on them.
+    """
+
+    def __init__(self, roster, nextDoId):
+        self.nextDoId = nextDoId
+        self.toons = {}
+        self.activeToons = []
+        self.suits = []
+        self.activeSuits = []
+        self.pendingSuits = []
+        self.joiningSuits = []
+        self.toonAttacks = {}
+        self.suitAttacks = getDefaultSuitAttacks()
+        self.suitRoster = roster['suits']
+        self.interactivePropTrackBonus = roster.get('interactivePropTrackBonus', -1)
+        for toonInfo in roster['toons']:
+            toon = BenchToon(self.allocateDoId(), toonInfo['exp'], toonInfo.get('hp', 50))
+            self.toons[toon.doId] = toon
+            self.activeToons.append(toon.doId)
+
+        for suitInfo in self.suitRoster:
+            self.addSuit(suitInfo)
+
+        self.calculator = BattleCalculatorAI(self)
+
+    def allocateDoId(self):
+        self.nextDoId += 1
+        return self.nextDoId
+
+    def addSuit(self, suitInfo):
+        suit = BenchSuit(self.allocateDoId(), suitInfo['name'], suitInfo['level'])
+        self.suits.append(suit)
+        self.activeSuits.append(suit)
+        return suit
+
+    def getToon(self, toonId):
+        return self.toons.get(toonId)
+
+    def findSuit(self, id):
+        for suit in self.suits:
+            if suit.doId == id:
+                return suit
+
+        return None
+
+    def getInteractivePropTrackBonus(self):
+        return self.interactivePropTrackBonus
+
+    def chooseAttacks(self):
+        self.toonAttacks = {}
+        for toonId in self.activeToons:
+            toon = self.toons[toonId]
+            track = random.choice(range(HEAL_TRACK, DROP_TRACK + 1))
+            level = random.randint(0, toon.experience.getExpLevel(track))
+            if attackAffectsGroup(track, level):
+                target = -1
+            elif track == HEAL_TRACK:
+                others = [t for t in self.activeToons if t != toonId]
+                if not others:
+                    track = THROW_TRACK
+                    target = random.choice(self.activeSuits).doId
+                else:
+                    target = random.choice(others)
+            else:
+                target = random.choice(self.activeSuits).doId
+            self.toonAttacks[toonId] = getToonAttack(toonId, track, level, target)
+
+        self.suitAttacks = getDefaultSuitAttacks()
+
+    def finishRound(self):
+        """
+        Stands in for the movie: toons heal back up, dead suits leave
+        and are replaced with fresh ones from the roster.
+        """
+        for toon in self.toons.values():
+            toon.hp = toon.maxHp
+
+        for suit in self.activeSuits[:]:
+            if suit.getHP() <= 0:
+                self.calculator.suitLeftBattle(suit.doId)
+                self.activeSuits.remove(suit)
+                self.suits.remove(suit)
+                self.addSuit(random.choice(self.suitRoster))
+
+    def getOutcome(self):
+        toonAttacks = [self.toonAttacks[toonId] for toonId in sorted(self.toonAttacks)]
+        return repr((toonAttacks, self.suitAttacks, [suit.getHP() for suit in self.activeSuits]))
+
+
+def makeSyntheticRoster():
+    toons = []
+    for i in range(random.randint(1, 4)):
+        exp = []
+        for track in range(len(Tracks)):
+            exp.append(random.randint(0, Levels[track][-1]))
+
+        toons.append({'exp': exp, 'hp': random.randint(15, 137)})
+
+    suits = []
+    for i in range(random.randint(1, 4)):
+        name = random.choice(SuitDNA.suitHeadTypes)
+        attributes = SuitBattleGlobals.SuitAttributes[name]
+        level = attributes['level'] + 1 + random.randint(0, len(attributes['hp']) - 1)
+        suits.append({'name': name, 'level': level})
+
+    return {'toons': toons, 'suits': suits, 'interactivePropTrackBonus': random.choice((-1, -1, -1, THROW_TRACK, SQUIRT_TRACK))}
+
+
+def timePhases(calculator, phaseTimes):
+    for phaseName, attrName in Phases:
+        method = getattr(calculator, attrName)
+
+        def timed(*args, _method=method, _phaseName=phaseName, **kwArgs):
+            start = time.perf_counter()
+            try:
+                return _method(*args, **kwArgs)
+            finally:
+                phaseTimes[_phaseName] += time.perf_counter() - start
+
+        setattr(calculator, attrName, timed)
+
+
+def main():
+    random.seed(args.seed)
+    if args.roster:
+        with open(args.roster, 'r') as file:
+            rosters = json.load(file)
+    else:
+        rosters = [makeSyntheticRoster() for i in range(args.battles)]
+
+    phaseTimes = dict([(phaseName, 0.0) for phaseName, attrName in Phases])
+    battles = []
+    nextDoId = 100000000
+    for roster in rosters:
+        battle = BenchBattle(roster, nextDoId)
+        nextDoId = battle.nextDoId + 1000
+        timePhases(battle.calculator, phaseTimes)
+        battles.append(battle)
+
+    digests = []
+    roundTime = 0.0
+    for i in range(args.rounds):
+        battle = battles[i % len(battles)]
+        battle.chooseAttacks()
+        start = time.perf_counter()
+        battle.calculator.calculateRound()
+        roundTime += time.perf_counter() - start
+        digests.append(hashlib.sha1(battle.getOutcome().encode()).hexdigest())
+        battle.finishRound()
+
+    print('%d rounds over %d battles in %0.3f s (%0.1f rounds/sec)' % (args.rounds, len(battles), roundTime, args.rounds / max(roundTime, 1e-09)))
+    for phaseName, attrName in Phases:
+        print('  %-14s %8.3f ms total  %6.1f%%' % (phaseName, phaseTimes[phaseName] * 1000.0, 100.0 * phaseTimes[phaseName] / max(roundTime, 1e-09)))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as file:
+            json.dump({'seed': args.seed, 'rounds': args.rounds, 'digests': digests}, file)
+        print('Saved %d round digests to %s' % (len(digests), args.save_baseline))
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)
+        if baseline['seed'] != args.seed:
+            print('Baseline was recorded with seed %d, not %d; comparison is meaningless.' % (baseline['seed'], args.seed))
+            return 1
+        drifted = [i for i, (a, b) in enumerate(zip(digests, baseline['digests'])) if a != b]
+        if drifted:
+            print('OUTCOME DRIFT: %d of %d rounds differ from baseline, first at round %d.' % (len(drifted), min(len(digests), len(baseline['digests'])), drifted[0]))
+            return 1
+        print('No outcome drift against %s.' % args.baseline)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -127,6 +127,7 @@ def assignRewards(activeToons, toonSkillPtsGained, suitsKilled, zoneId, helpfulT
         if toon != None:
             activeToonList.append(toon)
 
+    creditedToons = []
     for toon in activeToonList:
         for i in range(len(ToontownBattleGlobals.Tracks)):
             uberIndex = ToontownBattleGlobals.LAST_REGULAR_GAG_LEVEL + 1
@@ -154,12 +155,13 @@ def assignRewards(activeToons, toonSkillPtsGained, suitsKilled, zoneId, helpfulT
 
         if simbase.air.config.GetBool('battle-passing-no-credit', True):
             if helpfulToons and toon.doId in helpfulToons:
-                simbase.air.questManager.toonKilledCogs(toon, suitsKilled, zoneId, activeToonList)
+                creditedToons.append(toon)
                 simbase.air.cogPageManager.toonKilledCogs(toon, suitsKilled, zoneId)
             else:
                 BattleExperienceAINotify.debug('toon=%d unhelpful not getting killed cog quest credit' % toon.doId)
         else:
-            simbase.air.questManager.toonKilledCogs(toon, suitsKilled, zoneId, activeToonList)
+            creditedToons.append(toon)
             simbase.air.cogPageManager.toonKilledCogs(toon, suitsKilled, zoneId)
 
+    simbase.air.questManager.toonsKilledCogs(creditedToons, suitsKilled, zoneId, activeToonList)
     return
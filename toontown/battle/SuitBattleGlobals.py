@@ -101,7 +101,7 @@ def getSuitAttack(suitName, suitLevel, attackNum = -1):
     adict['suitName'] = suitName
     name = attack[0]
     adict['name'] = name
-    adict['id'] = list(SuitAttacks.keys()).index(name)
+    adict['id'] = SuitAttackIds[name]
     adict['animName'] = SuitAttacks[name][0]
     adict['hp'] = attack[1][suitLevel]
     adict['acc'] = attack[2][suitLevel]
@@ -3020,6 +3020,37 @@ TREMOR = list(SuitAttacks.keys()).index('Tremor')
 WATERCOOLER = list(SuitAttacks.keys()).index('Watercooler')
 WITHDRAWAL = list(SuitAttacks.keys()).index('Withdrawal')
 WRITE_OFF = list(SuitAttacks.keys()).index('WriteOff')
+SuitAttackIds = dict([(name, index) for index, name in enumerate(SuitAttacks.keys())])
+SUIT_ATK_ID = 0
+SUIT_ATK_HP = 1
+SUIT_ATK_ACC = 2
+SUIT_ATK_FREQ = 3
+SUIT_ATK_GROUP = 4
+
+def makeSuitAttackTable(suitName):
+    # SuitAttackTable[suitName][suitLevel][attackNum] holds the same
+    # numbers getSuitAttack returns, as a flat tuple indexed by the
+    # SUIT_ATK_* columns, so the battle calculator doesn't build a
+    # dict for every attack it looks at.
+    data = SuitAttributes[suitName]
+    table = []
+    for level in range(len(data['hp'])):
+        attacks = []
+        for attack in data['attacks']:
+            name = attack[0]
+            attacks.append((SuitAttackIds[name],
+             attack[1][level],
+             attack[2][level],
+             attack[3][level],
+             SuitAttacks[name][1]))
+
+        table.append(tuple(attacks))
+
+    return tuple(table)
+
+
+SuitAttackTable = dict([(suitName, makeSuitAttackTable(suitName)) for suitName in SuitAttributes])
+SuitDefenseTable = dict([(suitName, tuple(data['def'])) for suitName, data in SuitAttributes.items()])
 
 def getFaceoffTaunt(suitName, doId):
     if suitName in SuitFaceoffTaunts:
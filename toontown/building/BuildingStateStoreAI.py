@@ -0,0 +1,72 @@
+from otp.ai.AIBaseGlobal import *
+from direct.directnotify import DirectNotifyGlobal
+from toontown.uberdog.DataStoreJournal import DataStoreJournal
+import re
+
+# Building states that count as suit-owned for getSuitBuildings.
+SuitStates = ('suit', 'cogdo')
+
+
+class BuildingStateStoreAI:
+    """
+    Persists the state of every street building in the district, keyed
+    by the district's name rather than its doId, which is allocated
+    afresh at every boot.  Each record is one block's getBuildingData
+    under (branchId, block), kept in a DataStoreJournal: a change costs
+    one small journal record instead of rewriting the street, and the
+    whole district is read back in one pass when the AI starts, before
+    any DistributedBuildingMgrAI asks for its street.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('BuildingStateStoreAI')
+
+    def __init__(self, air):
+        self.air = air
+        districtName = re.sub('[^A-Za-z0-9_-]', '_', air.districtName)
+        self.filepath = '%s%s_buildings' % (air.dataFolder, districtName)
+        self.journal = DataStoreJournal(self.filepath, config.GetFloat('building-store-write-period', 2.0), config.GetInt('building-store-flush-count', 16), config.GetInt('building-store-compact-size', 1048576))
+        self.branchId2Blocks = {}
+
+    def open(self):
+        self.journal.open()
+        self.branchId2Blocks = {}
+        for branchId, block in self.journal.keys():
+            self.branchId2Blocks.setdefault(branchId, set()).add(block)
+
+        self.notify.info('Loaded %s buildings on %s streets.' % (len(self.journal), len(self.branchId2Blocks)))
+
+    def close(self):
+        self.journal.close()
+
+    def getBlocks(self, branchId):
+        """
+        Returns {block: buildingData} for every saved block of a street.
+        """
+        blocks = {}
+        for block in self.branchId2Blocks.get(branchId, ()):
+            blocks[block] = self.journal[(branchId, block)]
+
+        return blocks
+
+    def saveBlock(self, branchId, block, buildingData):
+        key = (branchId, block)
+        if self.journal.get(key) == buildingData:
+            return
+        self.journal[key] = buildingData
+        self.branchId2Blocks.setdefault(branchId, set()).add(block)
+
+    def getSuitBuildings(self, track=None):
+        """
+        Returns (branchId, block, buildingData) for every suit and cogdo
+        building in the district, optionally only those of one track.
+        """
+        buildings = []
+        for branchId, blocks in self.branchId2Blocks.items():
+            for block in blocks:
+                buildingData = self.journal[(branchId, block)]
+                if buildingData['state'] not in SuitStates:
+                    continue
+                if track is not None and buildingData['track'] != track:
+                    continue
+                buildings.append((branchId, block, buildingData))
+
+        return buildings
@@ -60,6 +60,7 @@ class DistributedBuildingAI(DistributedObjectAI.DistributedObjectAI):
         self.becameSuitTime = 0
         self.frontDoorPoint = None
         self.suitPlannerExt = None
+        self.buildingMgr = None
         self.fSkipElevatorOpening = False
         return
 
@@ -204,6 +205,10 @@ class DistributedBuildingAI(DistributedObjectAI.DistributedObjectAI):
          zoneId, interiorZoneId)
 
     def d_setState(self, state):
+        # Every state but 'off' announces itself through here, so this
+        # is where the building manager hears about it too.
+        if self.buildingMgr:
+            self.buildingMgr.buildingStateChanged(self.block, state, self.track)
         self.sendUpdate('setState', [state, globalClockDelta.getRealNetworkTime()])
 
     def b_setVictorList(self, victorList):
@@ -406,7 +411,7 @@ class DistributedBuildingAI(DistributedObjectAI.DistributedObjectAI):
 
     def becomingToonTask(self, task):
         self.fsm.request('toon')
-        self.suitPlannerExt.buildingMgr.save()
+        self.suitPlannerExt.buildingMgr.saveBlock(self.block)
         return Task.done
 
     def enterToon(self):
@@ -476,7 +481,7 @@ class DistributedBuildingAI(DistributedObjectAI.DistributedObjectAI):
 
     def becomingSuitTask(self, task):
         self.fsm.request('suit')
-        self.suitPlannerExt.buildingMgr.save()
+        self.suitPlannerExt.buildingMgr.saveBlock(self.block)
         return Task.done
 
     def enterSuit(self):
@@ -543,7 +548,7 @@ class DistributedBuildingAI(DistributedObjectAI.DistributedObjectAI):
 
     def becomingCogdoTask(self, task):
         self.fsm.request('cogdo')
-        self.suitPlannerExt.buildingMgr.save()
+        self.suitPlannerExt.buildingMgr.saveBlock(self.block)
         return Task.done
 
     def enterCogdo(self):
@@ -568,6 +573,10 @@ class DistributedBuildingAI(DistributedObjectAI.DistributedObjectAI):
     def setSuitPlannerExt(self, planner):
         self.suitPlannerExt = planner
 
+    def setBuildingMgr(self, buildingMgr):
+        self.buildingMgr = buildingMgr
+        buildingMgr.buildingStateChanged(self.block, self.fsm.getCurrentState().getName(), self.track)
+
     def _createSuitInterior(self):
         return DistributedSuitInteriorAI.DistributedSuitInteriorAI(self.air, self.elevator)
 
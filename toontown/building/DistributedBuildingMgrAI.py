@@ -1,6 +1,4 @@
-import os
 from direct.task.Task import Task
-import json
 from otp.ai.AIBaseGlobal import *
 from . import DistributedBuildingAI, HQBuildingAI, GagshopBuildingAI, PetshopBuildingAI
 from toontown.building.KartShopBuildingAI import KartShopBuildingAI
@@ -8,6 +6,8 @@ from toontown.building import DistributedAnimBuildingAI
 from direct.directnotify import DirectNotifyGlobal
 from toontown.hood import ZoneUtil
 import time, random
+SuitBuildingStates = ('suit', 'becomingSuit', 'clearOutToonInterior')
+CogdoStates = ('cogdo', 'becomingCogdo', 'becomingCogdoFromCogdo', 'clearOutToonInteriorForCogdo')
 
 class DistributedBuildingMgrAI:
     notify = DirectNotifyGlobal.directNotify.newCategory('DistributedBuildingMgrAI')
@@ -19,8 +19,12 @@ class DistributedBuildingMgrAI:
         self.__buildings = {}
         self.dnaStore = dnaStore
         self.trophyMgr = trophyMgr
-        self.shard = str(air.districtId)
-        self.backupExtension = '.bu'
+        self.__block2State = {}
+        self.__suitBlocks = set()
+        self.__cogdoBlocks = set()
+        self.__establishedSuitBlocks = set()
+        self.__toonBlocks = set()
+        self.__track2SuitBlocks = {}
         self.findAllLandmarkBuildings()
         self.doLaterTask = None
         return
@@ -31,6 +35,39 @@ class DistributedBuildingMgrAI:
             building.cleanup()
 
         self.__buildings = {}
+        self.__block2State = {}
+        self.__suitBlocks = set()
+        self.__cogdoBlocks = set()
+        self.__establishedSuitBlocks = set()
+        self.__toonBlocks = set()
+        self.__track2SuitBlocks = {}
+
+    def buildingStateChanged(self, blockNumber, state, track):
+        """
+        Called by a DistributedBuildingAI on every state change, to keep
+        the per-state block sets that the suit planner asks for current
+        without polling every building's FSM.
+        """
+        oldState = self.__block2State.get(blockNumber)
+        if oldState is not None:
+            self.__suitBlocks.discard(blockNumber)
+            self.__cogdoBlocks.discard(blockNumber)
+            self.__establishedSuitBlocks.discard(blockNumber)
+            self.__toonBlocks.discard(blockNumber)
+            oldTrack = oldState[1]
+            trackBlocks = self.__track2SuitBlocks.get(oldTrack)
+            if trackBlocks:
+                trackBlocks.discard(blockNumber)
+        self.__block2State[blockNumber] = (state, track)
+        if state in SuitBuildingStates or state in CogdoStates:
+            self.__suitBlocks.add(blockNumber)
+            self.__track2SuitBlocks.setdefault(track, set()).add(blockNumber)
+            if state in CogdoStates:
+                self.__cogdoBlocks.add(blockNumber)
+            elif state == 'suit':
+                self.__establishedSuitBlocks.add(blockNumber)
+        else:
+            self.__toonBlocks.add(blockNumber)
 
     def isValidBlockNumber(self, blockNumber):
         return blockNumber in self.__buildings
@@ -44,41 +81,28 @@ class DistributedBuildingMgrAI:
         return self.__buildings[blockNumber].isSuitBlock()
 
     def getSuitBlocks(self):
-        blocks = []
-        for i in list(self.__buildings.values()):
-            if i.isSuitBlock():
-                blocks.append(i.getBlock()[0])
+        return sorted(self.__suitBlocks)
+
+    def getNumSuitBlocks(self):
+        return len(self.__suitBlocks)
 
-        return blocks
+    def getSuitBlocksByTrack(self, track):
+        return sorted(self.__track2SuitBlocks.get(track, ()))
 
     def isCogdoBlock(self, blockNumber):
         return self.__buildings[blockNumber].isCogdo()
 
     def getCogdoBlocks(self):
-        blocks = []
-        for i in list(self.__buildings.values()):
-            if i.isCogdo():
-                blocks.append(i.getBlock()[0])
+        return sorted(self.__cogdoBlocks)
 
-        return blocks
+    def getNumCogdoBlocks(self):
+        return len(self.__cogdoBlocks)
 
     def getEstablishedSuitBlocks(self):
-        blocks = []
-        for i in list(self.__buildings.values()):
-            if i.isEstablishedSuitBlock():
-                blocks.append(i.getBlock()[0])
-
-        return blocks
+        return sorted(self.__establishedSuitBlocks)
 
     def getToonBlocks(self):
-        blocks = []
-        for i in list(self.__buildings.values()):
-            if isinstance(i, HQBuildingAI.HQBuildingAI):
-                continue
-            if not i.isSuitBlock():
-                blocks.append(i.getBlock()[0])
-
-        return blocks
+        return sorted(self.__toonBlocks)
 
     def getBuildings(self):
         return list(self.__buildings.values())
@@ -148,6 +172,7 @@ class DistributedBuildingMgrAI:
 
     def newBuilding(self, blockNumber, blockData=None):
         building = DistributedBuildingAI.DistributedBuildingAI(self.air, blockNumber, self.branchID, self.trophyMgr)
+        building.setBuildingMgr(self)
         building.generateWithRequired(self.branchID)
         if blockData:
             building.track = blockData.get('track', 'c')
@@ -174,6 +199,7 @@ class DistributedBuildingMgrAI:
 
     def newAnimBuilding(self, blockNumber, blockData=None):
         building = DistributedAnimBuildingAI.DistributedAnimBuildingAI(self.air, blockNumber, self.branchID, self.trophyMgr)
+        building.setBuildingMgr(self)
         building.generateWithRequired(self.branchID)
         if blockData:
             building.track = blockData.get('track', 'c')
@@ -229,56 +255,15 @@ class DistributedBuildingMgrAI:
         self.__buildings[blockNumber] = building
         return building
 
-    def getFileName(self):
-        f = '%s%s_%d_buildings.json' % (self.air.dataFolder, self.shard, self.branchID)
-        return f
-
-    def saveTo(self, file):
-        buildings = {}
-        for i in list(self.__buildings.values()):
-            if isinstance(i, HQBuildingAI.HQBuildingAI):
-                continue
-            buildingData = i.getBuildingData()
-            buildings[buildingData['block']] = buildingData
-
-        json.dump(buildings, file, indent=2)
+    def saveBlock(self, blockNumber):
+        building = self.__buildings[blockNumber]
+        if isinstance(building, HQBuildingAI.HQBuildingAI):
+            return
+        self.air.buildingStateStore.saveBlock(self.branchID, blockNumber, building.getBuildingData())
 
     def save(self):
-        try:
-            fileName = self.getFileName()
-            backup = fileName + self.backupExtension
-            if os.path.exists(fileName):
-                os.rename(fileName, backup)
-            file = open(fileName, 'w')
-            file.seek(0)
-            self.saveTo(file)
-            file.close()
-            if os.path.exists(backup):
-                os.remove(backup)
-        except EnvironmentError:
-            self.notify.warning(str(sys.exc_info()[1]))
-
-    def loadFrom(self, file):
-        blocks = {}
-        buildingData = json.load(file)
-        for block in buildingData:
-            blocks[int(block)] = buildingData[block]
-
-        return blocks
+        for blockNumber in self.__buildings:
+            self.saveBlock(blockNumber)
 
     def load(self):
-        fileName = self.getFileName()
-        try:
-            file = open(fileName + self.backupExtension, 'r')
-            if os.path.exists(fileName):
-                os.remove(fileName)
-        except IOError:
-            try:
-                file = open(fileName, 'r')
-            except IOError:
-                return {}
-
-        file.seek(0)
-        blocks = self.loadFrom(file)
-        file.close()
-        return blocks
+        return self.air.buildingStateStore.getBlocks(self.branchID)
@@ -16,7 +16,7 @@ class DistributedToonInteriorAI(DistributedObjectAI.DistributedObjectAI):
         self.block = block
         self.zoneId = zoneId
         self.building = building
-        self.npcs = NPCToons.createNpcsInZone(air, zoneId)
+        self.npcs = air.npcZoneManager.createNpcsInZone(zoneId)
         self.fsm = ClassicFSM.ClassicFSM('DistributedToonInteriorAI', [
          State.State('toon', self.enterToon, self.exitToon, [
           'beingTakenOver']),
@@ -30,6 +30,7 @@ class DistributedToonInteriorAI(DistributedObjectAI.DistributedObjectAI):
             npc.requestDelete()
 
         del self.npcs
+        self.air.npcZoneManager.removeZone(self.zoneId)
         del self.fsm
         del self.building
         DistributedObjectAI.DistributedObjectAI.delete(self)
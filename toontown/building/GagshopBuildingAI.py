@@ -17,6 +17,7 @@ class GagshopBuildingAI:
             npc.requestDelete()
 
         del self.npcs
+        self.air.npcZoneManager.removeZone(self.interiorZone)
         self.door.requestDelete()
         del self.door
         self.insideDoor.requestDelete()
@@ -26,7 +27,7 @@ class GagshopBuildingAI:
 
     def setup(self, blockNumber):
         self.interior = DistributedGagshopInteriorAI.DistributedGagshopInteriorAI(blockNumber, self.air, self.interiorZone)
-        self.npcs = NPCToons.createNpcsInZone(self.air, self.interiorZone)
+        self.npcs = self.air.npcZoneManager.createNpcsInZone(self.interiorZone)
         self.interior.generateWithRequired(self.interiorZone)
         door = DistributedDoorAI.DistributedDoorAI(self.air, blockNumber, DoorTypes.EXT_STANDARD)
         insideDoor = DistributedDoorAI.DistributedDoorAI(self.air, blockNumber, DoorTypes.INT_STANDARD)
@@ -17,6 +17,7 @@ class HQBuildingAI:
             npc.requestDelete()
 
         del self.npcs
+        self.air.npcZoneManager.removeZone(self.interiorZone)
         self.door0.requestDelete()
         del self.door0
         self.door1.requestDelete()
@@ -30,7 +31,7 @@ class HQBuildingAI:
 
     def setup(self, blockNumber):
         self.interior = DistributedHQInteriorAI.DistributedHQInteriorAI(blockNumber, self.air, self.interiorZone)
-        self.npcs = NPCToons.createNpcsInZone(self.air, self.interiorZone)
+        self.npcs = self.air.npcZoneManager.createNpcsInZone(self.interiorZone)
         self.interior.generateWithRequired(self.interiorZone)
         door0 = DistributedDoorAI.DistributedDoorAI(self.air, blockNumber, DoorTypes.EXT_HQ, doorIndex=0)
         door1 = DistributedDoorAI.DistributedDoorAI(self.air, blockNumber, DoorTypes.EXT_HQ, doorIndex=1)
@@ -23,6 +23,7 @@ class KartShopBuildingAI:
             npc.requestDelete()
 
         del self.npcs
+        self.air.npcZoneManager.removeZone(self.interiorZone)
         self.outsideDoor0.requestDelete()
         self.outsideDoor1.requestDelete()
         self.insideDoor0.requestDelete()
@@ -36,7 +37,7 @@ class KartShopBuildingAI:
 
     def setup(self, blockNumber):
         self.kartShopInterior = DistributedKartShopInteriorAI(blockNumber, self.air, self.interiorZone)
-        self.npcs = NPCToons.createNpcsInZone(self.air, self.interiorZone)
+        self.npcs = self.air.npcZoneManager.createNpcsInZone(self.interiorZone)
         self.kartShopInterior.generateWithRequired(self.interiorZone)
         self.outsideDoor0 = DistributedDoorAI(self.air, blockNumber, DoorTypes.EXT_KS, doorIndex=1)
         self.outsideDoor1 = DistributedDoorAI(self.air, blockNumber, DoorTypes.EXT_KS, doorIndex=2)
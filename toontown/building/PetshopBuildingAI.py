@@ -20,6 +20,7 @@ class PetshopBuildingAI:
             npc.requestDelete()
 
         del self.npcs
+        self.air.npcZoneManager.removeZone(self.interiorZone)
         self.door.requestDelete()
         del self.door
         self.insideDoor.requestDelete()
@@ -29,8 +30,8 @@ class PetshopBuildingAI:
 
     def setup(self, blockNumber):
         self.interior = DistributedPetshopInteriorAI.DistributedPetshopInteriorAI(blockNumber, self.air, self.interiorZone)
-        self.npcs = NPCToons.createNpcsInZone(self.air, self.interiorZone)
-        seeds = self.air.petMgr.getAvailablePets(1, len(self.npcs))
+        self.npcs = self.air.npcZoneManager.createNpcsInZone(self.interiorZone)
+        seeds = self.air.petMgr.getAvailablePets(1, len(NPCToons.getNpcIdsInZone(self.interiorZone)))
         self.interior.generateWithRequired(self.interiorZone)
         door = DistributedDoorAI.DistributedDoorAI(self.air, blockNumber, DoorTypes.EXT_STANDARD)
         insideDoor = DistributedDoorAI.DistributedDoorAI(self.air, blockNumber, DoorTypes.INT_STANDARD)
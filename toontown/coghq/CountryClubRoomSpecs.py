@@ -1,5 +1,6 @@
 from direct.showbase.PythonUtil import invertDict
 from toontown.toonbase import ToontownGlobals
+from toontown.coghq.SpecModuleRegistry import SpecModuleRegistry
 from toontown.coghq import BossbotCountryClubFairwayRoom_Battle00_Cogs
 from toontown.coghq import BossbotCountryClubMazeRoom_Battle00_Cogs
 from toontown.coghq import BossbotCountryClubMazeRoom_Battle01_Cogs
@@ -40,13 +41,7 @@ BossbotCountryClubEntranceIDs = (0,)
 BossbotCountryClubMiddleRoomIDs = (2, 5, 6)
 BossbotCountryClubFinalRoomIDs = (18,)
 BossbotCountryClubConnectorRooms = ('phase_12/models/bossbotHQ/Connector_Tunnel_A', 'phase_12/models/bossbotHQ/Connector_Tunnel_B')
-CashbotMintSpecModules = {}
-if not __debug__ or __execWarnings__:
-    print('EXECWARNING CountryClubRoomSpecs: %s' % BossbotCountryClubRoomName2RoomId)
-    printStack()
-for roomName, roomId in list(BossbotCountryClubRoomName2RoomId.items()):
-    exec('from toontown.coghq import %s' % roomName)
-    CashbotMintSpecModules[roomId] = eval(roomName)
+CashbotMintSpecModules = SpecModuleRegistry(BossbotCountryClubRoomId2RoomName, prewarmConfig='prewarm-country-club-rooms')
 
 CogSpecModules = {'BossbotCountryClubFairwayRoom_Battle00': BossbotCountryClubFairwayRoom_Battle00_Cogs,
  'BossbotCountryClubMazeRoom_Battle00': BossbotCountryClubMazeRoom_Battle00_Cogs,
@@ -45,13 +45,19 @@ class DistributedFactoryAI(DistributedLevelAI.DistributedLevelAI, FactoryBase.Fa
         self.suits = suitHandles['activeSuits']
         self.reserveSuits = suitHandles['reserveSuits']
         self.d_setSuits()
+        self.writeEnteredEvents()
+        self.notify.info('finish factory %s %s creation' % (self.factoryId, self.doId))
+
+    def setPlayers(self, avIds):
+        DistributedLevelAI.DistributedLevelAI.setPlayers(self, avIds)
+        self.writeEnteredEvents()
+
+    def writeEnteredEvents(self):
         scenario = 0
         description = '%s|%s|%s|%s' % (self.factoryId, self.entranceId, scenario, self.avIdList)
         for avId in self.avIdList:
             self.air.writeServerEvent('factoryEntered', avId, description)
 
-        self.notify.info('finish factory %s %s creation' % (self.factoryId, self.doId))
-
     def delete(self):
         self.notify.info('delete: %s' % self.doId)
         if __dev__:
@@ -33,6 +33,16 @@ class DistributedMintAI(DistributedObjectAI.DistributedObjectAI):
         self.sendUpdate('setRoomDoIds', [roomDoIds])
         if __dev__:
             simbase.mint = self
+        self.writeEnteredEvents()
+
+    def setPlayers(self, avIds):
+        self.avIds = avIds
+        for room in self.rooms:
+            room.setPlayers(avIds)
+
+        self.writeEnteredEvents()
+
+    def writeEnteredEvents(self):
         description = '%s|%s|%s' % (self.mintId, self.floorNum, self.avIds)
         for avId in self.avIds:
             self.air.writeServerEvent('mintEntered', avId, description)
@@ -0,0 +1,86 @@
+from direct.directnotify import DirectNotifyGlobal
+from direct.task import Task
+
+
+class FacilityPoolAI:
+    """
+    Keeps a few Cog HQ facilities built, generated and waiting in their
+    own zones with no players, so an elevator can be handed one at once
+    instead of building the whole facility in the frame it leaves.
+
+    Facilities are kept per key (a factory's id and entrance, say); a
+    key is pooled from the first time an elevator asks for it.  Spent
+    pool slots are refilled by a task that builds one facility per run,
+    and only runs a build when the last frame came in under the idle
+    frame time, so refills fall in the district's quiet frames.  build
+    is called with a key and returns (zoneId, facility).
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('FacilityPoolAI')
+
+    def __init__(self, air, name, size, build):
+        self.air = air
+        self.name = name
+        self.size = size
+        self.build = build
+        self.refillDelay = config.GetFloat('facility-pool-refill-delay', 1.0)
+        self.idleFrameTime = config.GetFloat('facility-pool-idle-frame-time', 0.05)
+        self.taskName = '%s-refill' % name
+        self.pools = {}
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.buildTime = 0.0
+        self.maxBuildTime = 0.0
+
+    def delete(self):
+        taskMgr.remove(self.taskName)
+        for pool in self.pools.values():
+            for zoneId, facility in pool:
+                facility.requestDelete()
+
+        self.pools = {}
+
+    def get(self, key):
+        """
+        Returns a built (zoneId, facility) for key, or None if none is
+        ready, in which case the caller builds its own.
+        """
+        pool = self.pools.get(key)
+        if pool is None:
+            self.pools[key] = pool = []
+        self.__scheduleRefill()
+        if pool:
+            self.hits += 1
+            return pool.pop(0)
+        self.misses += 1
+        return None
+
+    def __scheduleRefill(self):
+        if not taskMgr.hasTaskNamed(self.taskName):
+            taskMgr.doMethodLater(self.refillDelay, self.__refill, self.taskName)
+
+    def __refill(self, task):
+        for key, pool in self.pools.items():
+            if len(pool) < self.size:
+                break
+        else:
+            return Task.done
+
+        if globalClock.getDt() > self.idleFrameTime:
+            return Task.again
+        startTime = globalClock.getRealTime()
+        pool.append(self.build(key))
+        buildTime = globalClock.getRealTime() - startTime
+        self.builds += 1
+        self.buildTime += buildTime
+        self.maxBuildTime = max(self.maxBuildTime, buildTime)
+        self.notify.debug('%s: built %s in %.3fs' % (self.name, key, buildTime))
+        return Task.again
+
+    def getStats(self):
+        return {'hits': self.hits,
+         'misses': self.misses,
+         'builds': self.builds,
+         'meanBuildTime': self.buildTime / max(self.builds, 1),
+         'maxBuildTime': self.maxBuildTime,
+         'ready': dict([(key, len(pool)) for key, pool in self.pools.items()])}
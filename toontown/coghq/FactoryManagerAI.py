@@ -1,5 +1,6 @@
 from direct.directnotify import DirectNotifyGlobal
 from . import DistributedFactoryAI
+from . import FacilityPoolAI
 from toontown.toonbase import ToontownGlobals
 from direct.showbase import DirectObject
 
@@ -10,14 +11,29 @@ class FactoryManagerAI(DirectObject.DirectObject):
     def __init__(self, air):
         DirectObject.DirectObject.__init__(self)
         self.air = air
+        self.pool = None
+        poolSize = config.GetInt('factory-pool-size', 0)
+        if poolSize > 0:
+            self.pool = FacilityPoolAI.FacilityPoolAI(air, 'factoryPool', poolSize, self.buildFactory)
 
     def getDoId(self):
         return 0
 
     def createFactory(self, factoryId, entranceId, players):
-        factoryZone = self.air.allocateZone()
         if FactoryManagerAI.factoryId is not None:
             factoryId = FactoryManagerAI.factoryId
+        elif self.pool:
+            pooled = self.pool.get((factoryId, entranceId))
+            if pooled:
+                factoryZone, factory = pooled
+                factory.setPlayers(players)
+                return factoryZone
+        factoryZone, factory = self.buildFactory((factoryId, entranceId), players)
+        return factoryZone
+
+    def buildFactory(self, key, players = []):
+        factoryId, entranceId = key
+        factoryZone = self.air.allocateZone()
         factory = DistributedFactoryAI.DistributedFactoryAI(self.air, factoryId, factoryZone, entranceId, players)
         factory.generateWithRequired(factoryZone)
-        return factoryZone
+        return (factoryZone, factory)
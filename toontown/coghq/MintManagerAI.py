@@ -1,5 +1,6 @@
 from direct.directnotify import DirectNotifyGlobal
 from . import DistributedMintAI
+from . import FacilityPoolAI
 from toontown.toonbase import ToontownGlobals
 from toontown.coghq import MintLayout
 from direct.showbase import DirectObject
@@ -12,11 +13,21 @@ class MintManagerAI(DirectObject.DirectObject):
     def __init__(self, air):
         DirectObject.DirectObject.__init__(self)
         self.air = air
+        self.pool = None
+        poolSize = config.GetInt('mint-pool-size', 0)
+        if poolSize > 0:
+            self.pool = FacilityPoolAI.FacilityPoolAI(air, 'mintPool', poolSize, self.buildMint)
 
     def getDoId(self):
         return 0
 
     def createMint(self, mintId, players):
+        if self.pool and not self.hasOverrides(players):
+            pooled = self.pool.get(mintId)
+            if pooled:
+                mintZone, mint = pooled
+                mint.setPlayers(players)
+                return mintZone
         for avId in players:
             if bboard.has('mintId-%s' % avId):
                 mintId = bboard.get('mintId-%s' % avId)
@@ -43,7 +54,21 @@ class MintManagerAI(DirectObject.DirectObject):
                     roomName = MintRoomSpecs.CashbotMintRoomId2RoomName[roomId]
                     MintManagerAI.notify.warning('room %s (%s) not found in any floor of mint %s' % (roomId, roomName, mintId))
 
+        mintZone, mint = self.buildMint(mintId, players, floor)
+        return mintZone
+
+    def hasOverrides(self, players):
+        for avId in players:
+            for name in ('mintId', 'mintFloor', 'mintRoom'):
+                if bboard.has('%s-%s' % (name, avId)):
+                    return True
+
+        return False
+
+    def buildMint(self, mintId, players = [], floor = None):
+        if floor is None:
+            floor = random.randrange(ToontownGlobals.MintNumFloors[mintId])
         mintZone = self.air.allocateZone()
         mint = DistributedMintAI.DistributedMintAI(self.air, mintId, mintZone, floor, players)
         mint.generateWithRequired(mintZone)
-        return mintZone
+        return (mintZone, mint)
@@ -1,5 +1,6 @@
 from direct.showbase.PythonUtil import invertDict
 from toontown.toonbase import ToontownGlobals
+from toontown.coghq.SpecModuleRegistry import SpecModuleRegistry
 from toontown.coghq import NullCogs
 from toontown.coghq import CashbotMintBoilerRoom_Battle00_Cogs
 from toontown.coghq import CashbotMintBoilerRoom_Battle01_Cogs
@@ -61,13 +62,7 @@ CashbotMintEntranceIDs = (0,)
 CashbotMintMiddleRoomIDs = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16)
 CashbotMintFinalRoomIDs = (17, 18, 19, 20, 21, 22, 23, 24, 25)
 CashbotMintConnectorRooms = ('phase_10/models/cashbotHQ/connector_7cubeL2', 'phase_10/models/cashbotHQ/connector_7cubeR2')
-CashbotMintSpecModules = {}
-if not __debug__ or __execWarnings__:
-    print('EXECWARNING MintRoomSpecs: %s' % CashbotMintRoomName2RoomId)
-    printStack()
-for roomName, roomId in list(CashbotMintRoomName2RoomId.items()):
-    exec('from toontown.coghq import %s' % roomName)
-    CashbotMintSpecModules[roomId] = eval(roomName)
+CashbotMintSpecModules = SpecModuleRegistry(CashbotMintRoomId2RoomName, prewarmConfig='prewarm-mint-rooms')
 
 CogSpecModules = {'CashbotMintBoilerRoom_Battle00': CashbotMintBoilerRoom_Battle00_Cogs,
  'CashbotMintBoilerRoom_Battle01': CashbotMintBoilerRoom_Battle01_Cogs,
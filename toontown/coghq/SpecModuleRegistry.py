@@ -0,0 +1,87 @@
+from direct.directnotify import DirectNotifyGlobal
+import importlib
+import sys
+
+
+def getObjectSize(obj, seen = None):
+    """
+    Roughly how many bytes obj and everything it holds take up.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += getObjectSize(key, seen) + getObjectSize(value, seen)
+
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += getObjectSize(item, seen)
+
+    return size
+
+
+class SpecModuleRegistry:
+    """
+    Maps room ids to their level spec modules, importing each module the
+    first time it is asked for instead of when the room table is
+    imported, so a district nobody takes into a Cog HQ never holds those
+    specs.  Room names listed in the given config variable are imported
+    up front.  The size of each loaded spec is kept for getLoadedSizes.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('SpecModuleRegistry')
+
+    def __init__(self, roomId2RoomName, package = 'toontown.coghq', prewarmConfig = None):
+        self.roomId2RoomName = roomId2RoomName
+        self.package = package
+        self.modules = {}
+        self.sizes = {}
+        if prewarmConfig:
+            self.prewarm(config.GetString(prewarmConfig, '').split())
+
+    def __getitem__(self, roomId):
+        module = self.modules.get(roomId)
+        if module is None:
+            module = self.load(roomId)
+        return module
+
+    def __contains__(self, roomId):
+        return roomId in self.roomId2RoomName
+
+    def __len__(self):
+        return len(self.roomId2RoomName)
+
+    def keys(self):
+        return list(self.roomId2RoomName.keys())
+
+    def isLoaded(self, roomId):
+        return roomId in self.modules
+
+    def load(self, roomId):
+        roomName = self.roomId2RoomName[roomId]
+        module = importlib.import_module('%s.%s' % (self.package, roomName))
+        self.modules[roomId] = module
+        self.sizes[roomId] = getObjectSize(module.levelSpec)
+        self.notify.info('loaded %s (%s bytes)' % (roomName, self.sizes[roomId]))
+        return module
+
+    def prewarm(self, roomNames):
+        roomName2RoomId = dict([(roomName, roomId) for roomId, roomName in self.roomId2RoomName.items()])
+        for roomName in roomNames:
+            if roomName == 'all':
+                for roomId in self.roomId2RoomName:
+                    self[roomId]
+
+            elif roomName in roomName2RoomId:
+                self[roomName2RoomId[roomName]]
+            else:
+                self.notify.warning('cannot prewarm unknown room %s' % roomName)
+
+    def getLoadedSizes(self):
+        return dict([(self.roomId2RoomName[roomId], size) for roomId, size in self.sizes.items()])
+
+    def getLoadedSize(self):
+        return sum(self.sizes.values())
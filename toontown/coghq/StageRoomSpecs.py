@@ -1,5 +1,6 @@
 from direct.showbase.PythonUtil import invertDict
 from toontown.toonbase import ToontownGlobals
+from toontown.coghq.SpecModuleRegistry import SpecModuleRegistry
 from toontown.coghq import NullCogs
 from toontown.coghq import LawbotOfficeOilRoom_Battle00_Cogs
 from toontown.coghq import LawbotOfficeOilRoom_Battle01_Cogs
@@ -47,13 +48,7 @@ CashbotStageEntranceIDs = (0,)
 CashbotStageMiddleRoomIDs = (1,)
 CashbotStageFinalRoomIDs = (2,)
 CashbotStageConnectorRooms = ('phase_11/models/lawbotHQ/LB_connector_7cubeL2', 'phase_11/models/lawbotHQ/LB_connector_7cubeLR')
-CashbotStageSpecModules = {}
-if not __debug__ or __execWarnings__:
-    print('EXECWARNING StageRoomSpecs: %s' % CashbotStageRoomName2RoomId)
-    printStack()
-for roomName, roomId in list(CashbotStageRoomName2RoomId.items()):
-    exec('from toontown.coghq import %s' % roomName)
-    CashbotStageSpecModules[roomId] = eval(roomName)
+CashbotStageSpecModules = SpecModuleRegistry(CashbotStageRoomId2RoomName, prewarmConfig='prewarm-stage-rooms')
 
 CogSpecModules = {'LawbotOfficeOilRoom_Battle00': LawbotOfficeOilRoom_Battle00_Cogs,
  'LawbotOfficeOilRoom_Battle01': LawbotOfficeOilRoom_Battle01_Cogs,
@@ -19,6 +19,7 @@ from toontown.golf import GolfGlobals
 from direct.interval.IntervalGlobal import Sequence, Parallel, LerpScaleInterval, LerpFunctionInterval, Func, Wait, SoundInterval, ParallelEndTogether, LerpPosInterval, ActorInterval, LerpPosHprInterval, LerpColorScaleInterval, WaitInterval
 from direct.actor import Actor
 from toontown.golf import GolfHoleBase
+from toontown.golf.GolfRecording import GolfRecording
 from toontown.distributed import DelayDelete
 
 class DistributedGolfHole(DistributedPhysicsWorld.DistributedPhysicsWorld, FSM, GolfHoleBase.GolfHoleBase):
@@ -532,15 +533,17 @@ class DistributedGolfHole(DistributedPhysicsWorld.DistributedPhysicsWorld, FSM,
         self.useCommonObjectData(commonObjectData)
         self.trackRecordBodyFlight(ball, cycleTime, power, Vec3(x, y, z), dirX, dirY)
         ball.setPosition(holdBallPos)
+        movie = self.recording.toBytes()
+        spinMovie = self.aVRecording.toBytes()
         self.sendUpdate('ballMovie2AI', [cycleTime,
          avId,
-         self.recording,
-         self.aVRecording,
+         movie,
+         spinMovie,
          self.ballInHoleFrame,
          self.ballTouchedHoleFrame,
          self.ballFirstTouchedHoleFrame,
          commonObjectData])
-        self.ballMovie2Client(cycleTime, avId, self.recording, self.aVRecording, self.ballInHoleFrame, self.ballTouchedHoleFrame, self.ballFirstTouchedHoleFrame, commonObjectData)
+        self.ballMovie2Client(cycleTime, avId, movie, spinMovie, self.ballInHoleFrame, self.ballTouchedHoleFrame, self.ballFirstTouchedHoleFrame, commonObjectData)
 
     def __watchAimTask(self, task):
         self.setCamera2Ball()
@@ -1241,6 +1244,8 @@ class DistributedGolfHole(DistributedPhysicsWorld.DistributedPhysicsWorld, FSM,
         self.performSwing(self, ball, power, x, y)
 
     def ballMovie2Client(self, cycleTime, avId, movie, spinMovie, ballInFrame, ballTouchedHoleFrame, ballFirstTouchedHoleFrame, commonObjectData):
+        movie = GolfRecording.fromBytes(movie)
+        spinMovie = GolfRecording.fromBytes(spinMovie)
         self.notify.debug('received Movie, number of frames %s %s ballInFrame=%d ballTouchedHoleFrame=%d ballFirstTouchedHoleFrame=%d' % (len(movie),
          len(spinMovie),
          ballInFrame,
@@ -1626,7 +1631,7 @@ class DistributedGolfHole(DistributedPhysicsWorld.DistributedPhysicsWorld, FSM,
          diffTime,
          fpsTime,
          self.frame))
-        self.ballMovie2Client(cycleTime, avId, self.recording, self.aVRecording, self.ballInHoleFrame, self.ballTouchedHoleFrame, self.ballFirstTouchedHoleFrame)
+        self.ballMovie2Client(cycleTime, avId, self.recording.toBytes(), self.aVRecording.toBytes(), self.ballInHoleFrame, self.ballTouchedHoleFrame, self.ballFirstTouchedHoleFrame)
         return
 
     def handleBallHitNonGrass(self, c0, c1):
@@ -8,6 +8,7 @@ from toontown.ai.ToonBarrier import *
 from toontown.golf import GolfGlobals
 import random
 from toontown.golf import GolfHoleBase
+from toontown.golf.GolfRecording import GolfRecording
 
 class DistributedGolfHoleAI(DistributedPhysicsWorldAI.DistributedPhysicsWorldAI, FSM, GolfHoleBase.GolfHoleBase):
     defaultTransitions = {'Off': ['Cleanup', 'WaitTee'], 'WaitTee': ['WaitSwing', 'Cleanup', 'WaitTee', 'WaitPlayback'], 'WaitSwing': ['WaitPlayback', 'Cleanup', 'WaitSwing', 'WaitTee'], 'WaitPlayback': ['WaitSwing', 'Cleanup', 'WaitTee', 'WaitPlayback'], 'Cleanup': ['Off']}
@@ -37,6 +38,7 @@ class DistributedGolfHoleAI(DistributedPhysicsWorldAI.DistributedPhysicsWorldAI,
             self.ballPos[avId] = Vec3(0, 0, 0)
 
         self.playStarted = False
+        self.pendingShotId = None
         return
 
     def curGolfBall(self):
@@ -55,6 +57,9 @@ class DistributedGolfHoleAI(DistributedPhysicsWorldAI.DistributedPhysicsWorldAI,
 
     def delete(self):
         self.notify.debug('__delete__')
+        if self.pendingShotId:
+            self.air.golfShotSimulator.cancelShot(self.pendingShotId)
+            self.pendingShotId = None
         DistributedPhysicsWorldAI.DistributedPhysicsWorldAI.delete(self)
         self.notify.debug('calling self.terrainModel.removeNode')
         self.terrainModel.removeNode()
@@ -250,10 +255,21 @@ class DistributedGolfHoleAI(DistributedPhysicsWorldAI.DistributedPhysicsWorldAI,
     def ballMovie2AI(self, cycleTime, avId, movie, spinMovie, ballInFrame, ballTouchedHoleFrame, ballFirstTouchedHoleFrame, commonObjectData):
         sentFromId = self.air.getAvatarIdFromSender()
         if sentFromId == self.trustedPlayerId:
-            lastFrameNum = len(movie) - 2
+            try:
+                recording = GolfRecording.fromBytes(movie)
+                GolfRecording.fromBytes(spinMovie)
+            except ValueError:
+                recording = None
+
+            if not recording:
+                self.air.writeServerEvent('suspicious', sentFromId, 'ballMovie2AI sent a malformed ball movie')
+                self.trustedPlayerId = None
+                self.doAction()
+                return
+            lastFrameNum = len(recording) - 2
             if lastFrameNum < 0:
                 lastFrameNum = 0
-            lastFrame = movie[lastFrameNum]
+            lastFrame = recording[lastFrameNum]
             lastPos = Vec3(lastFrame[1], lastFrame[2], lastFrame[3])
             self.ballPos[avId] = lastPos
             self.golfCourse.incrementScore(avId)
@@ -273,7 +289,12 @@ class DistributedGolfHoleAI(DistributedPhysicsWorldAI.DistributedPhysicsWorldAI,
         return
 
     def performReadyAction(self):
+        if self.storeAction is None:
+            return
         avId = self.storeAction[0]
+        if self.pendingShotId:
+            self.notify.debug('ignoring the postSwing for avId=%d since a shot is already being simulated' % avId)
+            return
         if self.state == 'WaitPlayback':
             self.notify.debugStateCall(self)
             self.notify.debug('ignoring the postSwing for avId=%d since we are in WaitPlayback' % avId)
@@ -286,12 +307,35 @@ class DistributedGolfHoleAI(DistributedPhysicsWorldAI.DistributedPhysicsWorldAI,
             position = self.ballPos[avId]
         else:
             position = Vec3(self.storeAction[3], self.storeAction[4], self.storeAction[5])
-        self.useCommonObjectData(self.commonHoldData)
-        newPos = self.trackRecordBodyFlight(self.ball, self.storeAction[1], self.storeAction[2], position, self.storeAction[6], self.storeAction[7])
+        action = self.storeAction[:]
+        commonObjectData = self.commonHoldData
+        if self.air.golfShotSimulator and self.air.golfShotSimulator.isRunning():
+            # The shot is ours to simulate now, so a movie the trusted
+            # player sends while the pool works on it is ignored.
+            self.trustedPlayerId = None
+            self.pendingShotId = self.air.golfShotSimulator.simulateShot(self.holeId, commonObjectData, action[1], action[2], position, action[6], action[7], lambda result: self.__handleShotSimulated(action, commonObjectData, position, result))
+        else:
+            self.__simulateShot(action, commonObjectData, position)
+
+    def __simulateShot(self, action, commonObjectData, position):
+        self.useCommonObjectData(commonObjectData)
+        newPos = self.trackRecordBodyFlight(self.ball, action[1], action[2], position, action[6], action[7])
+        self.__finishShot(action, commonObjectData, newPos, self.recording.toBytes(), self.aVRecording.toBytes(), self.ballInHoleFrame, self.ballTouchedHoleFrame, self.ballFirstTouchedHoleFrame)
+
+    def __handleShotSimulated(self, action, commonObjectData, position, result):
+        self.pendingShotId = None
+        if result is None:
+            self.__simulateShot(action, commonObjectData, position)
+            return
+        movie, spinMovie, ballInHoleFrame, ballTouchedHoleFrame, ballFirstTouchedHoleFrame, endPos = result
+        self.__finishShot(action, commonObjectData, Vec3(*endPos), movie, spinMovie, ballInHoleFrame, ballTouchedHoleFrame, ballFirstTouchedHoleFrame)
+
+    def __finishShot(self, action, commonObjectData, newPos, movie, spinMovie, ballInHoleFrame, ballTouchedHoleFrame, ballFirstTouchedHoleFrame):
+        avId = action[0]
         if self.state == 'WaitPlayback' or self.state == 'WaitTee':
             self.notify.warning('performReadyAction requesting from %s to WaitPlayback' % self.state)
         self.request('WaitPlayback')
-        self.sendUpdate('ballMovie2Client', [self.storeAction[1], avId, self.recording, self.aVRecording, self.ballInHoleFrame, self.ballTouchedHoleFrame, self.ballFirstTouchedHoleFrame, self.commonHoldData])
+        self.sendUpdate('ballMovie2Client', [action[1], avId, movie, spinMovie, ballInHoleFrame, ballTouchedHoleFrame, ballFirstTouchedHoleFrame, commonObjectData])
         self.ballPos[avId] = newPos
         self.trustedPlayerId = None
         return
@@ -6,15 +6,20 @@ from . import DistributedPhysicsWorldAI
 from direct.fsm.FSM import FSM
 from toontown.ai.ToonBarrier import *
 from toontown.golf import GolfGlobals
+from toontown.golf.GolfRecording import GolfRecording
 import random
 import math
+# When set, shots are simulated against the swing's cycle time advanced
+# one step per frame rather than against the wall clock, so the same
+# swing records the same flight on every machine that simulates it.
+DeterministicShots = ConfigVariableBool('golf-deterministic-shots', True).value
 
 class GolfHoleBase:
 
     def __init__(self, canRender = 0):
         self.canRender = canRender
-        self.recording = []
-        self.aVRecording = []
+        self.recording = GolfRecording()
+        self.aVRecording = GolfRecording()
         self.holePositions = []
         self.grayCount = 0
         self.skyContact = None
@@ -149,10 +154,8 @@ class GolfHoleBase:
         return
 
     def initRecord(self):
-        del self.recording
-        self.recording = []
-        del self.aVRecording
-        self.aVRecording = []
+        self.recording = GolfRecording()
+        self.aVRecording = GolfRecording()
         self.skipFrame = 0.0
         self.frame = 0
         self.tXYMax = 1.0
@@ -206,6 +209,8 @@ class GolfHoleBase:
         startTime = globalClock.getRealTime()
         self.notify.debug('start position %s' % startPos)
         self.swingTime = cycleTime
+        if DeterministicShots:
+            self.simCycleTime = cycleTime
         frameCount = 0
         lift = 0
         startTime = GolfGlobals.BALL_CONTACT_FRAME / 24
@@ -276,13 +281,17 @@ class GolfHoleBase:
                 lastFrameEnabled = self.frame
 
         self.notify.debug('lastFrameEnabled %s' % lastFrameEnabled)
+        if self.simCycleTime is not None:
+            cycleTime = self.simCycleTime
+            self.simCycleTime = None
+            self.setTimeIntoCycle(cycleTime)
         if lastFrameEnabled < 3:
             lastFrameEnabled = 3
         self.record(ball)
         self.notify.debug('Frames %s' % self.frame)
         midTime = globalClock.getRealTime()
-        self.recording = self.recording[:lastFrameEnabled]
-        self.aVRecording = self.aVRecording[:lastFrameEnabled]
+        self.recording.truncate(lastFrameEnabled)
+        self.aVRecording.truncate(lastFrameEnabled)
         self.frame = lastFrameEnabled
         self.processRecording()
         self.processAVRecording()
@@ -307,14 +316,10 @@ class GolfHoleBase:
         return Vec3(x, y, z)
 
     def record(self, ball):
-        self.recording.append((self.frame,
-         ball.getPosition()[0],
-         ball.getPosition()[1],
-         ball.getPosition()[2]))
-        self.aVRecording.append((self.frame,
-         ball.getAngularVel()[0],
-         ball.getAngularVel()[1],
-         ball.getAngularVel()[2]))
+        pos = ball.getPosition()
+        aV = ball.getAngularVel()
+        self.recording.append(self.frame, pos[0], pos[1], pos[2])
+        self.aVRecording.append(self.frame, aV[0], aV[1], aV[2])
         if self.frame > 50 and not self.frame % 13:
             curFrame = self.recording[self.frame]
             pastFrame5 = self.recording[self.frame - 11]
@@ -457,8 +462,8 @@ class GolfHoleBase:
                     self.curGolfBall().setPosition(self.lastSkyContactPoint[0], self.lastSkyContactPoint[1], self.lastSkyContactPoint[2] + 0.27)
                 self.curGolfBall().setLinearVel(0, 0, 0)
                 self.curGolfBall().disable()
-            self.recording = self.recording[:self.greenIn]
-            self.aVRecording = self.aVRecording[:self.greenIn]
+            self.recording.truncate(self.greenIn)
+            self.aVRecording.truncate(self.greenIn)
             self.frame = self.greenIn
             self.resetAt = self.greenIn
             self.grayCount = 0
@@ -471,87 +476,11 @@ class GolfHoleBase:
 
     def processRecording(self, errorMult = 1.0):
         self.notify.debug('processRecording')
-        lastFrame = self.recording[len(self.recording) - 1][0]
-        countRemovals = 0
-        for frame in self.recording:
-            if frame[0] == 0 or frame[0] == lastFrame:
-                pass
-            else:
-                index = self.recording.index(frame)
-                prevFrame = self.recording[index - 1]
-                nextFrame = self.recording[index + 1]
-                if self.predict(frame, prevFrame, nextFrame, errorMult):
-                    self.recording.remove(frame)
-                    countRemovals += 1
-
-        if countRemovals > 5:
-            self.processRecording()
-        elif len(self.recording) > 120:
-            self.processRecording(errorMult * 1.25)
-        else:
-            for frame in self.recording:
-                pass
+        self.recording.simplify((0.05, 0.05, 0.05), 120, errorMult)
 
-    def processAVRecording(self, errorMult = 1.0, trials = 0):
+    def processAVRecording(self, errorMult = 1.0):
         self.notify.debug('processAVRecording')
-        lastFrame = self.recording[len(self.recording) - 1][0]
-        countRemovals = 0
-        countTrials = trials
-        for frame in self.aVRecording:
-            if frame[0] == 0 or frame[0] == lastFrame:
-                pass
-            else:
-                index = self.aVRecording.index(frame)
-                prevFrame = self.aVRecording[index - 1]
-                nextFrame = self.aVRecording[index + 1]
-                if self.predictAV(frame, prevFrame, nextFrame, errorMult):
-                    self.aVRecording.remove(frame)
-                    countRemovals += 1
-                else:
-                    countTrials += 1
-
-        if countRemovals > 5:
-            self.processAVRecording(errorMult, countTrials)
-        elif len(self.aVRecording) > 80:
-            self.processAVRecording(errorMult * 1.25, countTrials)
-        else:
-            for frame in self.aVRecording:
-                pass
-
-    def predict(self, frame, sourceFrame, destFrame, errorMult = 1.0):
-        tXY = 0.05 * errorMult
-        tZ = 0.05 * errorMult
-        projLength = destFrame[0] - sourceFrame[0]
-        projPen = destFrame[0] - frame[0]
-        propSource = float(projPen) / float(projLength)
-        propDest = 1.0 - propSource
-        projX = sourceFrame[1] * propSource + destFrame[1] * propDest
-        projY = sourceFrame[2] * propSource + destFrame[2] * propDest
-        projZ = sourceFrame[3] * propSource + destFrame[3] * propDest
-        varX = abs(projX - frame[1])
-        varY = abs(projY - frame[2])
-        varZ = abs(projZ - frame[3])
-        if varX > tXY or varY > tXY or varZ > tZ:
-            return 0
-        else:
-            return 1
-
-    def predictAV(self, frame, sourceFrame, destFrame, errorMult = 1.0):
-        tXYZ = 1.5 * errorMult
-        projLength = destFrame[0] - sourceFrame[0]
-        projPen = destFrame[0] - frame[0]
-        propSource = float(projPen) / float(projLength)
-        propDest = 1.0 - propSource
-        projX = sourceFrame[1] * propSource + destFrame[1] * propDest
-        projY = sourceFrame[2] * propSource + destFrame[2] * propDest
-        projZ = sourceFrame[3] * propSource + destFrame[3] * propDest
-        varX = abs(projX - frame[1])
-        varY = abs(projY - frame[2])
-        varZ = abs(projZ - frame[3])
-        if varX > tXYZ or varY > tXYZ or varZ > tXYZ:
-            return 0
-        else:
-            return 1
+        self.aVRecording.simplify((1.5, 1.5, 1.5), 80, errorMult)
 
     def handleBallHitNonGrass(self, c0, c1):
         pass
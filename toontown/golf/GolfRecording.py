@@ -0,0 +1,203 @@
+from array import array
+
+# Positions and spins are kept as fixed point, at the precision the ball
+# movies have always been sent at (int32/100000).
+ValueScale = 100000.0
+
+# The most frames one keyframe segment may span.  This bounds the cost
+# of checking a segment against the samples it replaces.
+MaxKeyframeSpan = 128
+
+
+def _encodeVarint(value, out):
+    while value > 127:
+        out.append(value & 127 | 128)
+        value >>= 7
+
+    out.append(value)
+
+
+def _decodeVarint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 127) << shift
+        if not byte & 128:
+            return (value, offset)
+        shift += 7
+
+
+def _encodeSigned(value, out):
+    if value < 0:
+        _encodeVarint((-value << 1) - 1, out)
+    else:
+        _encodeVarint(value << 1, out)
+
+
+def _decodeSigned(data, offset):
+    value, offset = _decodeVarint(data, offset)
+    if value & 1:
+        return (-((value + 1) >> 1), offset)
+    return (value >> 1, offset)
+
+
+class GolfRecording:
+    """
+    A ball flight (or spin) recording: one (frame, x, y, z) sample per
+    physics frame, stored in flat fixed-point arrays rather than as a
+    tuple per frame.  Indexing returns the familiar tuple, so playback
+    code reads it the same way it read the old lists.
+
+    simplify thins the recording down to the keyframes playback needs
+    to stay within a tolerance of the simulated path, and toBytes packs
+    what is left as varint deltas from one keyframe to the next; that
+    blob is what goes over the wire in ballMovie2AI/ballMovie2Client.
+    """
+
+    def __init__(self):
+        self.frames = array('i')
+        self.values = array('i')
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.frames)
+        if index < 0 or index >= len(self.frames):
+            raise IndexError('recording index out of range')
+        values = self.values
+        base = index * 3
+        return (self.frames[index],
+         values[base] / ValueScale,
+         values[base + 1] / ValueScale,
+         values[base + 2] / ValueScale)
+
+    def append(self, frame, x, y, z):
+        self.frames.append(frame)
+        self.values.append(int(round(x * ValueScale)))
+        self.values.append(int(round(y * ValueScale)))
+        self.values.append(int(round(z * ValueScale)))
+
+    def truncate(self, length):
+        del self.frames[length:]
+        del self.values[length * 3:]
+
+    def simplify(self, tolerance, maxFrames, errorMult = 1.0):
+        """
+        Keeps only the keyframes needed for linear interpolation between
+        them to reproduce every recorded sample to within tolerance (per
+        axis).  The tolerance grows by a quarter at a time until no more
+        than maxFrames keyframes are left.  The first and last samples
+        always stay.  Returns the multiple of tolerance it ended at.
+        """
+        if len(self.frames) < 3:
+            return errorMult
+        while True:
+            keep = self.__findKeyframes([t * errorMult * ValueScale for t in tolerance])
+            if len(keep) <= maxFrames:
+                break
+            errorMult *= 1.25
+
+        frames = self.frames
+        values = self.values
+        self.frames = array('i', [frames[index] for index in keep])
+        self.values = array('i')
+        for index in keep:
+            self.values.extend(values[index * 3:index * 3 + 3])
+
+        return errorMult
+
+    def __findKeyframes(self, tolerance):
+        # Stretch each segment from its start keyframe as far as it will
+        # go with every sample in between still within tolerance: double
+        # the span until it stops fitting, then bisect back to the edge.
+        last = len(self.frames) - 1
+        keep = [0]
+        start = 0
+        while start < last:
+            good = start + 1
+            bad = None
+            span = 2
+            while bad is None:
+                end = min(start + span, last, start + MaxKeyframeSpan)
+                if end == good:
+                    break
+                if self.__fits(start, end, tolerance):
+                    good = end
+                    span *= 2
+                else:
+                    bad = end
+
+            while bad is not None and bad - good > 1:
+                end = (good + bad) // 2
+                if self.__fits(start, end, tolerance):
+                    good = end
+                else:
+                    bad = end
+
+            keep.append(good)
+            start = good
+
+        return keep
+
+    def __fits(self, start, end, tolerance):
+        frames = self.frames
+        values = self.values
+        span = frames[end] - frames[start]
+        if span <= 0:
+            return False
+        s = start * 3
+        e = end * 3
+        for index in range(start + 1, end):
+            t = float(frames[index] - frames[start]) / span
+            c = index * 3
+            for axis in range(3):
+                if abs(values[s + axis] + (values[e + axis] - values[s + axis]) * t - values[c + axis]) > tolerance[axis]:
+                    return False
+
+        return True
+
+    def toBytes(self):
+        out = bytearray()
+        _encodeVarint(len(self.frames), out)
+        lastFrame = 0
+        last = [0, 0, 0]
+        values = self.values
+        for index, frame in enumerate(self.frames):
+            _encodeSigned(frame - lastFrame, out)
+            lastFrame = frame
+            for axis in range(3):
+                value = values[index * 3 + axis]
+                _encodeSigned(value - last[axis], out)
+                last[axis] = value
+
+        return bytes(out)
+
+    @classmethod
+    def fromBytes(cls, data):
+        """
+        Unpacks a toBytes blob, raising ValueError if it is malformed.
+        """
+        recording = cls()
+        try:
+            count, offset = _decodeVarint(data, 0)
+            frame = 0
+            last = [0, 0, 0]
+            for i in range(count):
+                delta, offset = _decodeSigned(data, offset)
+                frame += delta
+                recording.frames.append(frame)
+                for axis in range(3):
+                    delta, offset = _decodeSigned(data, offset)
+                    last[axis] += delta
+                    recording.values.append(last[axis])
+
+        except (IndexError, OverflowError):
+            raise ValueError('malformed golf recording')
+
+        if offset != len(data):
+            raise ValueError('malformed golf recording')
+        return recording
@@ -0,0 +1,191 @@
+from direct.directnotify import DirectNotifyGlobal
+from direct.showbase.DirectObject import DirectObject
+from direct.task import Task
+from pandac.PandaModules import *
+from toontown.golf import GolfGlobals
+from toontown.golf import GolfHoleBase
+from toontown.golf import PhysicsWorldBase
+from toontown.golf.DistributedGolfHoleAI import DistributedGolfHoleAI
+import multiprocessing
+import queue
+
+# Holes loaded by this worker process, by holeId.  Each worker builds a
+# hole's geometry once and reuses it for every shot it is handed.
+workerHoles = {}
+
+
+class GolfShotWorkerHole(DirectObject, PhysicsWorldBase.PhysicsWorldBase, GolfHoleBase.GolfHoleBase):
+    """
+    A headless copy of a DistributedGolfHoleAI's physics world, built
+    in a worker process from the same terrain model, blockers and
+    movers, with none of the distributed object around it.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('GolfShotWorkerHole')
+
+    def __init__(self, holeId):
+        PhysicsWorldBase.PhysicsWorldBase.__init__(self, 0)
+        GolfHoleBase.GolfHoleBase.__init__(self)
+        self.holeId = holeId
+        self.holeInfo = GolfGlobals.HoleInfo[holeId]
+        self.loadLevel()
+        self.setupSimulation()
+        self.ball = self.createBall()
+        self.createRays()
+
+    loadLevel = DistributedGolfHoleAI.loadLevel
+    createLocatorDict = DistributedGolfHoleAI.createLocatorDict
+    loadBlockers = DistributedGolfHoleAI.loadBlockers
+    parseLocators = DistributedGolfHoleAI.parseLocators
+    fillLocator = DistributedGolfHoleAI.fillLocator
+    createBall = DistributedGolfHoleAI.createBall
+
+    def curGolfBall(self):
+        return self.ball
+
+    def createCommonObject(self, type, pos, hpr, sizeX = 0, sizeY = 0, moveDistance = 0):
+        PhysicsWorldBase.PhysicsWorldBase.createCommonObject(self, type, None, pos, hpr, sizeX, sizeY, moveDistance)
+
+    def simulateShot(self, commonObjectData, cycleTime, power, startPos, dirX, dirY):
+        self.useCommonObjectData(commonObjectData)
+        endPos = self.trackRecordBodyFlight(self.ball, cycleTime, power, Vec3(*startPos), dirX, dirY)
+        return (self.recording.toBytes(),
+         self.aVRecording.toBytes(),
+         self.ballInHoleFrame,
+         self.ballTouchedHoleFrame,
+         self.ballFirstTouchedHoleFrame,
+         (endPos[0], endPos[1], endPos[2]))
+
+
+def simulateShotInWorker(holeId, commonObjectData, cycleTime, power, startPos, dirX, dirY):
+    hole = workerHoles.get(holeId)
+    if hole is None:
+        hole = GolfShotWorkerHole(holeId)
+        workerHoles[holeId] = hole
+    return hole.simulateShot(commonObjectData, cycleTime, power, startPos, dirX, dirY)
+
+
+def runWorker(shotQueue, resultQueue):
+    while True:
+        job = shotQueue.get()
+        if job is None:
+            return
+        shotId, shotArgs = job
+        try:
+            resultQueue.put((shotId, simulateShotInWorker(*shotArgs), None))
+        except Exception as e:
+            resultQueue.put((shotId, None, str(e)))
+
+
+class GolfShotSimulatorAI:
+    """
+    Runs the AI's authoritative golf shot simulations in a set of
+    worker processes, so the couple of thousand physics steps of a
+    shot don't hold up the rest of the district's task loop.
+
+    The workers are forked from the AI, so they start with its config
+    and loader already set up.  All of them are forked in start, which
+    the AI calls before it starts any threads of its own (the data
+    store journal writers), and none is ever forked again: a process
+    forked while another thread holds a lock would find that lock held
+    forever.  So if a worker dies the simulator stops altogether, hands
+    every outstanding shot back as None and isRunning turns false, and
+    the holes go back to simulating shots themselves.
+
+    Results come back through a task that polls once a frame and hands
+    each one to its callback; a shot that fails in the worker, or takes
+    longer than golf-sim-timeout, is handed back as None and the hole
+    simulates it itself.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('GolfShotSimulatorAI')
+
+    def __init__(self, air, numWorkers):
+        self.air = air
+        self.numWorkers = numWorkers
+        self.workers = []
+        self.shotQueue = None
+        self.resultQueue = None
+        self.pending = {}
+        self.nextShotId = 1
+        self.timeout = config.GetFloat('golf-sim-timeout', 10.0)
+        self.taskName = 'golfShotSimulator-%s' % id(self)
+
+    def start(self):
+        context = multiprocessing.get_context('fork')
+        self.shotQueue = context.Queue()
+        self.resultQueue = context.Queue()
+        for i in range(self.numWorkers):
+            worker = context.Process(target=runWorker, args=(self.shotQueue, self.resultQueue), name='GolfShotWorker-%s' % i)
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+
+        taskMgr.add(self.__pollTask, self.taskName)
+
+    def stop(self):
+        taskMgr.remove(self.taskName)
+        self.pending = {}
+        for worker in self.workers:
+            worker.terminate()
+
+        for worker in self.workers:
+            worker.join(1.0)
+
+        self.workers = []
+        for q in (self.shotQueue, self.resultQueue):
+            if q:
+                q.cancel_join_thread()
+                q.close()
+
+        self.shotQueue = None
+        self.resultQueue = None
+
+    def isRunning(self):
+        return len(self.workers) > 0
+
+    def simulateShot(self, holeId, commonObjectData, cycleTime, power, startPos, dirX, dirY, callback):
+        """
+        Queues a shot and returns an id that cancelShot accepts.
+        callback is called on the AI's task loop with the packed ball
+        and spin movies, hole frames and end position, or with None.
+        """
+        shotId = self.nextShotId
+        self.nextShotId += 1
+        self.shotQueue.put((shotId, (holeId, commonObjectData, cycleTime, power, (startPos[0], startPos[1], startPos[2]), dirX, dirY)))
+        self.pending[shotId] = (callback, globalClock.getRealTime() + self.timeout)
+        return shotId
+
+    def cancelShot(self, shotId):
+        # A queued or running shot can't be pulled back from the
+        # workers; its result is dropped when it arrives.
+        self.pending.pop(shotId, None)
+
+    def __pollTask(self, task):
+        while True:
+            try:
+                shotId, result, error = self.resultQueue.get_nowait()
+            except queue.Empty:
+                break
+            if error:
+                self.notify.warning('Shot simulation failed: %s' % error)
+            entry = self.pending.pop(shotId, None)
+            if entry:
+                entry[0](result)
+
+        for worker in self.workers:
+            if not worker.is_alive():
+                self.notify.warning('%s died (exit code %s); simulating shots in process from now on.' % (worker.name, worker.exitcode))
+                pending = list(self.pending.values())
+                self.stop()
+                for callback, deadline in pending:
+                    callback(None)
+
+                return Task.done
+
+        now = globalClock.getRealTime()
+        for shotId, (callback, deadline) in list(self.pending.items()):
+            if now > deadline:
+                self.notify.warning('Shot simulation timed out.')
+                del self.pending[shotId]
+                callback(None)
+
+        return Task.cont
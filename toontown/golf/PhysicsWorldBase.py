@@ -56,6 +56,7 @@ class PhysicsWorldBase:
         self.timingCycleLength = 10.0
         self.timingCycleOffset = 0.0
         self.timingSimTime = 0.0
+        self.simCycleTime = None
         self.FPS = 90.0
         self.refFPS = 60.0
         self.DTAStep = 1.0 / self.FPS
@@ -157,12 +158,18 @@ class PhysicsWorldBase:
         return self.timingCycleLength
 
     def getCycleTime(self, doprint = 0):
-        cycleTime = (globalClock.getRealTime() + self.timingCycleOffset) % self.timingCycleLength
+        if self.simCycleTime is not None:
+            cycleTime = self.simCycleTime % self.timingCycleLength
+        else:
+            cycleTime = (globalClock.getRealTime() + self.timingCycleOffset) % self.timingCycleLength
         if doprint:
             print('Get Cycle Time %s' % cycleTime)
         return cycleTime
 
     def setTimeIntoCycle(self, time, doprint = 0):
+        if self.simCycleTime is not None:
+            self.simCycleTime = time
+            return
         trueCycleTime = globalClock.getRealTime() % self.timingCycleLength
         self.timingCycleOffset = time - trueCycleTime
         if doprint:
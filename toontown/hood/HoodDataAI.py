@@ -48,6 +48,9 @@ class HoodDataAI:
 
         self.buildingManagers = []
         ButterflyGlobals.clearIndexes(self.zoneId)
+        for distObj in self.fishingPonds:
+            self.air.npcZoneManager.removeZone(distObj.zoneId)
+
         del self.fishingPonds
         for distObj in list(self.doId2do.values()):
             distObj.requestDelete()
@@ -90,7 +93,7 @@ class HoodDataAI:
 
         for distObj in self.fishingPonds:
             self.addDistObj(distObj)
-            npcs = NPCToons.createNpcsInZone(self.air, distObj.zoneId)
+            npcs = self.air.npcZoneManager.createNpcsInZone(distObj.zoneId)
             for npc in npcs:
                 self.addDistObj(npc)
 
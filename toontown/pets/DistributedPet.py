@@ -163,7 +163,7 @@ class DistributedPet(DistributedSmoothNode.DistributedSmoothNode, Pet.Pet, PetBa
         return max(0.0, t)
 
     def updateOfflineMood(self):
-        self.mood.driftMood(dt=self.getTimeSinceLastSeen(), curMood=self.lastKnownMood)
+        self.mood.driftMoodOffline(self.getTimeSinceLastSeen(), curMood=self.lastKnownMood)
 
     def __handleMoodSet(self, component, value):
         if self.isGenerated():
@@ -72,8 +72,6 @@ class DistributedPetAI(DistributedSmoothNodeAI.DistributedSmoothNodeAI, PetLooke
         self.gaitFSM.enterInitialState()
         self.unstickFSM = ClassicFSM.ClassicFSM('unstickFSM', [State.State('off', self.unstickEnterOff, self.unstickExitOff), State.State('on', self.unstickEnterOn, self.unstickExitOn)], 'off', 'off')
         self.unstickFSM.enterInitialState()
-        if __dev__:
-            self.pscMoveResc = PStatCollector('App:Show code:petMove:Reschedule')
         return
 
     def setInactive(self):
@@ -122,6 +120,9 @@ class DistributedPetAI(DistributedSmoothNodeAI.DistributedSmoothNodeAI, PetLooke
         DistributedSmoothNodeAI.DistributedSmoothNodeAI.handleZoneChange(self, newZoneId, oldZoneId)
         self.ignore(PetObserve.getEventName(oldZoneId))
         self.accept(PetObserve.getEventName(newZoneId), self.brain.observe)
+        if self.activated:
+            self.air.petMgr.removePetFromZone(self, oldZoneId)
+            self.air.petMgr.addPetToZone(self, newZoneId)
 
     def handleLogicalZoneChange(self, newZoneId, oldZoneId):
         DistributedSmoothNodeAI.DistributedSmoothNodeAI.handleLogicalZoneChange(self, newZoneId, oldZoneId)
@@ -394,6 +395,11 @@ class DistributedPetAI(DistributedSmoothNodeAI.DistributedSmoothNodeAI, PetLooke
         t = time.time() - self.lastSeenTimestamp
         return max(0.0, t)
 
+    def updateOfflineMood(self):
+        self.mood.driftMoodOffline(self.getTimeSinceLastSeen())
+        self.b_setLastSeenTimestamp(self.getCurEpochTimestamp())
+        self.sendUpdate('setMood', [self.mood.getComponent(comp) for comp in PetMood.PetMood.Components])
+
     def __handleMoodSet(self, component, value):
         if self.isGenerated():
             self.mood.setComponent(component, value)
@@ -516,6 +522,7 @@ class DistributedPetAI(DistributedSmoothNodeAI.DistributedSmoothNodeAI, PetLooke
             self.mood.setComponent(mood, value, announce=0)
 
         self.requiredMoodComponents = {}
+        self.updateOfflineMood()
         self.brain = PetBrain.PetBrain(self)
         self.mover = Mover.Mover(self)
         self.lockMover = Mover.Mover(self)
@@ -524,12 +531,11 @@ class DistributedPetAI(DistributedSmoothNodeAI.DistributedSmoothNodeAI, PetLooke
         self.actionFSM = PetActionFSM.PetActionFSM(self)
         self.teleportIn()
         self.handleMoodChange(distribute=0)
-        taskMgr.doMethodLater(simbase.petMovePeriod * random.random(), self.move, self.getMoveTaskName())
         self.startPosHprBroadcast()
         self.accept(PetObserve.getEventName(self.zoneId), self.brain.observe)
         self.accept(self.mood.getMoodChangeEvent(), self.handleMoodChange)
-        self.mood.start()
         self.brain.start()
+        self.air.petMgr.addPetToZone(self, self.zoneId)
         return
 
     def _isPet(self):
@@ -564,7 +570,6 @@ class DistributedPetAI(DistributedSmoothNodeAI.DistributedSmoothNodeAI, PetLooke
         taskMgr.remove(self.uniqueName('PetMovieClear'))
         taskMgr.remove(self.uniqueName('PetMovieComplete'))
         taskMgr.remove(self.getLockMoveTaskName())
-        taskMgr.remove(self.getMoveTaskName())
         if hasattr(self, 'zoneId'):
             self.announceZoneChange(ToontownGlobals.QuietZone, self.zoneId)
         else:
@@ -586,6 +591,7 @@ class DistributedPetAI(DistributedSmoothNodeAI.DistributedSmoothNodeAI, PetLooke
         if hasattr(self, 'activated'):
             if self.activated:
                 self.activated = 0
+                self.air.petMgr.removePetFromZone(self, self.zoneId)
                 self.brain.destroy()
                 del self.brain
                 self.actionFSM.destroy()
@@ -617,8 +623,6 @@ class DistributedPetAI(DistributedSmoothNodeAI.DistributedSmoothNodeAI, PetLooke
             if self.unstickFSM:
                 self.unstickFSM.requestFinalState()
             del self.unstickFSM
-        if __dev__:
-            del self.pscMoveResc
         PetLookerAI.PetLookerAI.destroy(self)
         self.ignoreAll()
         self._hasCleanedUp = True
@@ -636,8 +640,6 @@ class DistributedPetAI(DistributedSmoothNodeAI.DistributedSmoothNodeAI, PetLooke
 
         del self.gaitFSM
         del self.unstickFSM
-        if __dev__:
-            del self.pscMoveResc
         PetLookerAI.PetLookerAI.destroy(self)
         self.doNotDeallocateChannel = True
         self.zoneId = None
@@ -676,21 +678,18 @@ class DistributedPetAI(DistributedSmoothNodeAI.DistributedSmoothNodeAI, PetLooke
             self.sphereImpulse.destroy()
             del self.sphereImpulse
 
-    def getMoveTaskName(self):
-        return 'petMove-%s' % self.doId
-
     def getLockMoveTaskName(self):
         return 'petLockMove-%s' % self.doId
 
-    def move(self, task = None):
+    def move(self):
         if self.isEmpty():
             try:
                 self.air.writeServerEvent('Late Pet Move Call', self.doId, ' ')
             except:
                 pass
 
-            taskMgr.remove(task.name)
-            return Task.done
+            self.air.petMgr.removePetFromZone(self, self.zoneId)
+            return
         if not self.isLockMoverEnabled():
             self.mover.move()
         numNearby = len(self.brain.nearbyAvs) - 1
@@ -704,13 +703,6 @@ class DistributedPetAI(DistributedSmoothNodeAI.DistributedSmoothNodeAI, PetLooke
             self._outOfBounds = True
             self.stopPosHprBroadcast()
             self.requestDelete()
-            return Task.done
-        if __dev__:
-            self.pscMoveResc.start()
-        taskMgr.doMethodLater(simbase.petMovePeriod, self.move, self.getMoveTaskName())
-        if __dev__:
-            self.pscMoveResc.stop()
-        return Task.done
 
     def startPosHprBroadcast(self):
         if self._outOfBounds:
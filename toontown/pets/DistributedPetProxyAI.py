@@ -273,6 +273,11 @@ class DistributedPetProxyAI(DistributedObjectAI.DistributedObjectAI):
         t = time.time() - self.lastSeenTimestamp
         return max(0.0, t)
 
+    def updateOfflineMood(self):
+        self.mood.driftMoodOffline(self.getTimeSinceLastSeen())
+        self.b_setLastSeenTimestamp(self.getCurEpochTimestamp())
+        self.sendUpdate('setMood', [self.mood.getComponent(comp) for comp in PetMood.PetMood.Components])
+
     def __handleMoodSet(self, component, value):
         if self.isGenerated():
             self.mood.setComponent(component, value)
@@ -375,6 +380,7 @@ class DistributedPetProxyAI(DistributedObjectAI.DistributedObjectAI):
             self.mood.setComponent(mood, value, announce=0)
 
         self.requiredMoodComponents = {}
+        self.updateOfflineMood()
         self.accept(self.mood.getMoodChangeEvent(), self.handleMoodChange)
         self.mood.start()
 
@@ -31,7 +31,6 @@ class PetBrain(DirectObject.DirectObject, CPetBrain):
         if __dev__:
             self.pscPrior = PStatCollector('App:Show code:petThink:UpdatePriorities')
             self.pscAware = PStatCollector('App:Show code:petThink:ShuffleAwareness')
-            self.pscResc = PStatCollector('App:Show code:petThink:Reschedule')
         return
 
     def destroy(self):
@@ -39,7 +38,6 @@ class PetBrain(DirectObject.DirectObject, CPetBrain):
         if __dev__:
             del self.pscPrior
             del self.pscAware
-            del self.pscResc
         self.stop()
         self.goalMgr.destroy()
         self.chaseNode.removeNode()
@@ -55,9 +53,6 @@ class PetBrain(DirectObject.DirectObject, CPetBrain):
         del self.doId2goals
         del self.avAwareness
 
-    def getThinkTaskName(self):
-        return 'petThink-%s' % self.pet.doId
-
     def getTeleportTaskName(self):
         return 'petTeleport-%s' % self.pet.doId
 
@@ -89,7 +84,6 @@ class PetBrain(DirectObject.DirectObject, CPetBrain):
             self._handleAvatarArrive(doId)
 
         self.tLastLonelinessUpdate = globalClock.getFrameTime()
-        taskMgr.doMethodLater(simbase.petThinkPeriod * random.random(), self._think, self.getThinkTaskName())
         self.started = 1
 
     def stop(self):
@@ -108,7 +102,6 @@ class PetBrain(DirectObject.DirectObject, CPetBrain):
 
         del self.globalGoals
         self.clearFocus()
-        taskMgr.remove(self.getThinkTaskName())
         self.ignore(PetLookerAI.getStartLookedAtByOtherEvent(self.pet.doId))
         self.ignore(PetLookerAI.getStopLookedAtByOtherEvent(self.pet.doId))
         self.ignore(PetLookerAI.getStartLookingAtOtherEvent(self.pet.doId))
@@ -124,7 +117,7 @@ class PetBrain(DirectObject.DirectObject, CPetBrain):
         if avId in self.lastInteractTime:
             self.lastInteractTime[avId] = globalClock.getFrameTime()
 
-    def _think(self, task = None):
+    def think(self):
         if not self.inMovie:
             if __dev__:
                 self.pscPrior.start()
@@ -149,12 +142,6 @@ class PetBrain(DirectObject.DirectObject, CPetBrain):
                     self.pet.lerpMood('loneliness', max(-1.0, dt * -.003 * numLookers))
                     if numLookers > 5:
                         self.pet.lerpMood('excitement', min(1.0, dt * 0.001 * numLookers))
-        if __dev__:
-            self.pscResc.start()
-        taskMgr.doMethodLater(simbase.petThinkPeriod, self._think, self.getThinkTaskName())
-        if __dev__:
-            self.pscResc.stop()
-        return Task.done
 
     def _updatePriorities(self):
         self.goalMgr.updatePriorities()
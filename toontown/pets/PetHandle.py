@@ -46,7 +46,7 @@ class PetHandle:
         return max(0.0, t)
 
     def updateOfflineMood(self):
-        self.mood.driftMood(dt=self.getTimeSinceLastSeen(), curMood=self.lastKnownMood)
+        self.mood.driftMoodOffline(self.getTimeSinceLastSeen(), curMood=self.lastKnownMood)
 
     def getDominantMood(self):
         if not hasattr(self, 'mood'):
@@ -1,10 +1,28 @@
 from direct.directnotify import DirectNotifyGlobal
+from toontown.pets.PetZoneSimAI import PetZoneSimAI
 
 class PetManagerAI:
     notify = DirectNotifyGlobal.directNotify.newCategory('PetManagerAI')
 
     def __init__(self, air):
         self.air = air
+        self.zoneSims = {}
+
+    def addPetToZone(self, pet, zoneId):
+        zoneSim = self.zoneSims.get(zoneId)
+        if zoneSim is None:
+            zoneSim = PetZoneSimAI(self.air, zoneId)
+            self.zoneSims[zoneId] = zoneSim
+        zoneSim.addPet(pet)
+
+    def removePetFromZone(self, pet, zoneId):
+        zoneSim = self.zoneSims.get(zoneId)
+        if zoneSim is None:
+            return
+        zoneSim.removePet(pet)
+        if not zoneSim.hasPets():
+            zoneSim.destroy()
+            del self.zoneSims[zoneId]
 
     def getAvailablePets(self, *args, **kwargs):
         return []
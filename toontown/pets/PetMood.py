@@ -2,7 +2,7 @@ from direct.directnotify import DirectNotifyGlobal
 from direct.task import Task
 from direct.showbase.PythonUtil import lerp, average, clampScalar
 from toontown.toonbase import TTLocalizer
-import random, time, weakref
+import math, random, time, weakref
 
 class PetMood:
     notify = DirectNotifyGlobal.directNotify.newCategory('PetMood')
@@ -32,6 +32,7 @@ class PetMood:
     TAffection = -10 * MINUTE
     TAngerDec = -20 * MINUTE
     TAngerInc = 2 * WEEK
+    AbuseTipPoint = 0.6
 
     def __init__(self, pet = None):
         self.setPet(pet)
@@ -182,25 +183,98 @@ class PetMood:
             newValue = curValue + dt / (timeToMedian * 7200)
             return clampScalar(newValue, 0.0, 1.0)
 
-        self.boredom = doDrift(curMood.boredom, self.tBoredom)
-        self.loneliness = doDrift(curMood.loneliness, self.tLoneliness)
-        self.sadness = doDrift(curMood.sadness, self.tSadness)
-        self.fatigue = doDrift(curMood.fatigue, self.tFatigue)
-        self.hunger = doDrift(curMood.hunger, self.tHunger)
-        self.confusion = doDrift(curMood.confusion, self.tConfusion)
-        self.excitement = doDrift(curMood.excitement, self.tExcitement)
-        self.surprise = doDrift(curMood.surprise, self.tSurprise)
-        self.affection = doDrift(curMood.affection, self.tAffection)
+        for comp, timeToMedian in self._getDriftTimes():
+            self.__dict__[comp] = doDrift(curMood.__dict__[comp], timeToMedian)
+
         abuse = average(curMood.hunger, curMood.hunger, curMood.hunger, curMood.boredom, curMood.loneliness)
-        tipPoint = 0.6
-        if abuse < tipPoint:
-            tAnger = lerp(self.tAngerDec, -PetMood.LONGTIME, abuse / tipPoint)
-        else:
-            tAnger = lerp(PetMood.LONGTIME, self.tAngerInc, (abuse - tipPoint) / (1.0 - tipPoint))
-        self.anger = doDrift(curMood.anger, tAnger)
+        self.anger = doDrift(curMood.anger, self._getAngerTime(abuse, abuse < PetMood.AbuseTipPoint))
         self.announceChange()
         return
 
+    def _getDriftTimes(self):
+        return (('boredom', self.tBoredom),
+         ('loneliness', self.tLoneliness),
+         ('sadness', self.tSadness),
+         ('fatigue', self.tFatigue),
+         ('hunger', self.tHunger),
+         ('confusion', self.tConfusion),
+         ('excitement', self.tExcitement),
+         ('surprise', self.tSurprise),
+         ('affection', self.tAffection))
+
+    def _getAngerTime(self, abuse, belowTipPoint):
+        tipPoint = PetMood.AbuseTipPoint
+        if belowTipPoint:
+            return lerp(self.tAngerDec, -PetMood.LONGTIME, abuse / tipPoint)
+        return lerp(PetMood.LONGTIME, self.tAngerInc, (abuse - tipPoint) / (1.0 - tipPoint))
+
+    def driftMoodOffline(self, dt, curMood = None):
+        """
+        Brings the mood forward dt seconds in one step, to where
+        driftMood would take it ticking in ever smaller steps over the
+        same time.  Each component but anger drifts in a straight line
+        until it clamps.  Anger drifts at a rate set by abuse, a mix of
+        hunger, boredom and loneliness, which is itself a straight line
+        between the times one of those clamps; so anger is integrated
+        exactly over each of those stretches, split where abuse crosses
+        the tip point, and clamped at the end of each.
+        """
+        dt = float(dt)
+        if dt <= 0.0:
+            return
+        if curMood is None:
+            curMood = self
+        start = {}
+        rates = {}
+        for comp, timeToMedian in self._getDriftTimes():
+            start[comp] = curMood.__dict__[comp]
+            rates[comp] = 1.0 / (timeToMedian * 7200)
+
+        def valueAt(comp, t):
+            return clampScalar(start[comp] + rates[comp] * t, 0.0, 1.0)
+
+        def abuseAt(t):
+            hunger = valueAt('hunger', t)
+            return average(hunger, hunger, hunger, valueAt('boredom', t), valueAt('loneliness', t))
+
+        times = [0.0, dt]
+        for comp in ('hunger', 'boredom', 'loneliness'):
+            if rates[comp] > 0.0:
+                clampTime = (1.0 - start[comp]) / rates[comp]
+            else:
+                clampTime = -start[comp] / rates[comp]
+            if 0.0 < clampTime < dt:
+                times.append(clampTime)
+
+        times.sort()
+        tipPoint = PetMood.AbuseTipPoint
+        anger = curMood.anger
+        for t0, t1 in zip(times, times[1:]):
+            if t1 <= t0:
+                continue
+            abuse0 = abuseAt(t0)
+            abuse1 = abuseAt(t1)
+            pieces = [(t0, abuse0, t1, abuse1)]
+            if (abuse0 - tipPoint) * (abuse1 - tipPoint) < 0.0:
+                tipTime = t0 + (t1 - t0) * (tipPoint - abuse0) / (abuse1 - abuse0)
+                pieces = [(t0, abuse0, tipTime, tipPoint), (tipTime, tipPoint, t1, abuse1)]
+            for p0, a0, p1, a1 in pieces:
+                below = (a0 + a1) * 0.5 < tipPoint
+                tAnger0 = self._getAngerTime(a0, below)
+                tAnger1 = self._getAngerTime(a1, below)
+                span = p1 - p0
+                if abs(tAnger1 - tAnger0) <= 1e-09 * abs(tAnger0):
+                    change = span / (tAnger0 * 7200)
+                else:
+                    change = span * math.log(tAnger1 / tAnger0) / ((tAnger1 - tAnger0) * 7200)
+                anger = clampScalar(anger + change, 0.0, 1.0)
+
+        for comp in start:
+            self.__dict__[comp] = valueAt(comp, dt)
+
+        self.anger = anger
+        self.announceChange()
+
     def _driftMoodTask(self, task = None):
         self.driftMood()
         taskMgr.doMethodLater(simbase.petMoodDriftPeriod / simbase.petMoodTimescale, self._driftMoodTask, self.getMoodDriftTaskName())
@@ -0,0 +1,93 @@
+from direct.directnotify import DirectNotifyGlobal
+from direct.task import Task
+import collections
+
+
+class PetZoneSimAI:
+    """
+    Runs every active pet in one zone from a single task, in place of
+    each pet's own move, think and mood drift tasks.
+
+    Every tick (pet-move-period) moves every pet.  Thinking and mood
+    drift are handed out round-robin: each tick earns the zone enough
+    turns for every pet to think once per pet-think-period and drift
+    once per pet-mood-drift-period, so the work is staggered across
+    ticks the way the old per-pet random start delays staggered it.
+    No more than pet-think-budget pets think in one tick; the rest wait
+    their turn in the next.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('PetZoneSimAI')
+
+    def __init__(self, air, zoneId):
+        self.air = air
+        self.zoneId = zoneId
+        self.pets = []
+        self.thinkQueue = collections.deque()
+        self.driftQueue = collections.deque()
+        self.thinkCredit = 0.0
+        self.driftCredit = 0.0
+        self.thinkBudget = config.GetInt('pet-think-budget', 8)
+        self.taskName = 'petZoneSim-%s' % zoneId
+        self.lastTickTime = None
+
+    def destroy(self):
+        taskMgr.remove(self.taskName)
+        self.pets = []
+        self.thinkQueue.clear()
+        self.driftQueue.clear()
+
+    def addPet(self, pet):
+        if pet in self.pets:
+            return
+        self.pets.append(pet)
+        self.thinkQueue.append(pet)
+        self.driftQueue.append(pet)
+        if len(self.pets) == 1:
+            self.lastTickTime = globalClock.getFrameTime()
+            taskMgr.doMethodLater(simbase.petMovePeriod, self.__tick, self.taskName)
+
+    def removePet(self, pet):
+        if pet not in self.pets:
+            return
+        self.pets.remove(pet)
+        self.thinkQueue.remove(pet)
+        self.driftQueue.remove(pet)
+        if not self.pets:
+            taskMgr.remove(self.taskName)
+
+    def hasPets(self):
+        return len(self.pets) > 0
+
+    def __tick(self, task):
+        now = globalClock.getFrameTime()
+        dt = now - self.lastTickTime
+        self.lastTickTime = now
+        for pet in list(self.pets):
+            if pet in self.pets:
+                pet.move()
+
+        numPets = len(self.pets)
+        if not numPets:
+            return Task.done
+        self.thinkCredit = min(self.thinkCredit + numPets * dt / simbase.petThinkPeriod, numPets)
+        numThinks = min(int(self.thinkCredit), self.thinkBudget)
+        self.thinkCredit -= numThinks
+        for i in range(numThinks):
+            if not self.thinkQueue:
+                break
+            pet = self.thinkQueue.popleft()
+            self.thinkQueue.append(pet)
+            pet.brain.think()
+
+        driftPeriod = simbase.petMoodDriftPeriod / simbase.petMoodTimescale
+        self.driftCredit = min(self.driftCredit + numPets * dt / driftPeriod, numPets)
+        numDrifts = int(self.driftCredit)
+        self.driftCredit -= numDrifts
+        for i in range(numDrifts):
+            if not self.driftQueue:
+                break
+            pet = self.driftQueue.popleft()
+            self.driftQueue.append(pet)
+            pet.mood.driftMood()
+
+        return Task.again
@@ -0,0 +1,127 @@
+from direct.directnotify import DirectNotifyGlobal
+import bisect
+
+# The ways a cog quest can pick cogs out of a kill list.
+MATCH_ALL = 0
+MATCH_TYPE = 1
+MATCH_TRACK = 2
+MATCH_LEVEL = 3
+MATCH_VP = 4
+MATCH_CFO = 5
+
+# Boolean fields of a kill record that a quest may additionally require.
+KillFlags = ('isSkelecog', 'isForeman', 'isSupervisor', 'hasRevives')
+
+
+class CogKillIndex:
+    """
+    Indexes the kill list of one battle (the cog dicts collected in
+    DistributedBattleBaseAI.suitsKilled, or the boss record appended by
+    the boss battles) by type, track, level and flags, so each cog
+    quest can be answered with a lookup instead of walking every kill.
+
+    A match key is a (match, value, flag) tuple, e.g.
+    (MATCH_TRACK, 'm', 'isSkelecog') for "Cashbot skelecogs".  The
+    kills matching each key are worked out the first time any toon in
+    the battle asks for it and reused for everyone else, and location
+    checks are cached per quest location since the whole battle is in
+    one zone.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('CogKillIndex')
+
+    def __init__(self, suitsKilled, zoneId):
+        self.suitsKilled = suitsKilled
+        self.numKills = len(suitsKilled)
+        self.zoneId = zoneId
+        self.regularKills = []
+        self.vpKills = []
+        self.cfoKills = []
+        self.type2Kills = {}
+        self.track2Kills = {}
+        self.levelKills = []
+        self.flag2Kills = {}
+        self.avId2Kills = {}
+        self.matchCache = {}
+        self.locationCache = {}
+        for flag in KillFlags:
+            self.flag2Kills[flag] = set()
+
+        for index, cogDict in enumerate(suitsKilled):
+            for avId in cogDict['activeToons']:
+                self.avId2Kills.setdefault(avId, set()).add(index)
+
+            if cogDict.get('isVP'):
+                self.vpKills.append(index)
+                continue
+            if cogDict.get('isCFO'):
+                self.cfoKills.append(index)
+                continue
+            self.regularKills.append(index)
+            self.type2Kills.setdefault(cogDict['type'], []).append(index)
+            self.track2Kills.setdefault(cogDict['track'], []).append(index)
+            if cogDict['level'] is not None:
+                self.levelKills.append((cogDict['level'], index))
+            for flag in KillFlags:
+                if cogDict.get(flag):
+                    self.flag2Kills[flag].add(index)
+
+        self.levelKills.sort()
+
+    def isFor(self, suitsKilled, zoneId):
+        return self.suitsKilled is suitsKilled and self.numKills == len(suitsKilled) and self.zoneId == zoneId
+
+    def getMatches(self, matchKey):
+        """
+        Returns the indexes (in kill order) of the kills matching
+        matchKey, regardless of which toons were present for them.
+        """
+        matches = self.matchCache.get(matchKey)
+        if matches is not None:
+            return matches
+        match, value, flag = matchKey
+        if match == MATCH_VP:
+            candidates = self.vpKills
+        elif match == MATCH_CFO:
+            candidates = self.cfoKills
+        elif match == MATCH_TYPE:
+            candidates = self.type2Kills.get(value, [])
+        elif match == MATCH_TRACK:
+            candidates = self.track2Kills.get(value, [])
+        elif match == MATCH_LEVEL:
+            start = bisect.bisect_left(self.levelKills, (value, -1))
+            candidates = sorted([index for level, index in self.levelKills[start:]])
+        else:
+            candidates = self.regularKills
+        if flag:
+            flagged = self.flag2Kills[flag]
+            candidates = [index for index in candidates if index in flagged]
+        matches = tuple(candidates)
+        self.matchCache[matchKey] = matches
+        return matches
+
+    def countKills(self, avId, matchKey):
+        """
+        Returns how many kills matching matchKey count for avId.  Boss
+        kills count for everyone in the zone; all other kills only
+        count for toons that were active when the cog went down.
+        """
+        matches = self.getMatches(matchKey)
+        if not matches:
+            return 0
+        if matchKey[0] in (MATCH_VP, MATCH_CFO):
+            return len(matches)
+        avKills = self.avId2Kills.get(avId)
+        if not avKills:
+            return 0
+        return len([index for index in matches if index in avKills])
+
+    def getCogDict(self, index):
+        return self.suitsKilled[index]
+
+    def isLocationMatch(self, quest):
+        location = quest.getLocation()
+        result = self.locationCache.get(location)
+        if result is None:
+            result = quest.isLocationMatch(self.zoneId)
+            self.locationCache[location] = result
+        return result
@@ -0,0 +1,184 @@
+from panda3d.core import ConfigVariableString
+from direct.directnotify import DirectNotifyGlobal
+import hashlib
+import json
+import os
+
+# Bump this whenever the layout of a saved quest index changes, so
+# stale files on disk are ignored rather than misread.
+QUEST_INDEX_VERSION = 1
+
+
+class QuestIndex:
+    """
+    The lookups Quests.py needs on top of QuestDict: the starting
+    quests of every tier, the quests leading to every reward in a tier,
+    the final reward and remaining steps of every quest, and the
+    starting quests handed out by every NPC.
+
+    Building these means walking every quest chain, so it is done the
+    first time one of them is asked for rather than when Quests is
+    imported, and the result can be saved to disk and read back on the
+    next start as long as Quests.py hasn't changed.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('QuestIndex')
+
+    def __init__(self, sourceHash=None):
+        self.sourceHash = sourceHash
+        self.tier2Quests = {}
+        self.tier2Reward2Quests = {}
+        self.quest2Reward = {}
+        self.quest2RemainingSteps = {}
+        self.npc2Quests = {}
+
+    def compile(self, questDict):
+        """
+        Fills in this index from QuestDict.  The quest chains are walked
+        in exactly the order the old import-time pass walked them, so
+        every list comes out in the same order as before and seeded
+        quest choices are unchanged.
+        """
+        from toontown.quest import Quests
+        for questId, questDesc in questDict.items():
+            if questDesc[Quests.QuestDictStartIndex] == Quests.Start:
+                self.tier2Quests.setdefault(questDesc[Quests.QuestDictTierIndex], []).append(questId)
+                fromNpcId = questDesc[Quests.QuestDictFromNpcIndex]
+                if isinstance(fromNpcId, int):
+                    self.npc2Quests.setdefault(fromNpcId, []).append(questId)
+
+        def findFinalRewardId(questId):
+            finalRewardId = self.quest2Reward.get(questId)
+            if finalRewardId:
+                return (finalRewardId, self.quest2RemainingSteps.get(questId))
+            try:
+                questDesc = questDict[questId]
+            except KeyError:
+                self.notify.warning('findFinalRewardId: Quest ID: %d not found' % questId)
+                return -1
+
+            nextQuestId = questDesc[Quests.QuestDictNextQuestIndex]
+            if nextQuestId == Quests.NA:
+                finalRewardId = questDesc[Quests.QuestDictRewardIndex]
+                remainingSteps = 1
+            else:
+                if isinstance(nextQuestId, tuple):
+                    finalRewardId, remainingSteps = findFinalRewardId(nextQuestId[0])
+                    for id in nextQuestId[1:]:
+                        findFinalRewardId(id)
+
+                else:
+                    finalRewardId, remainingSteps = findFinalRewardId(nextQuestId)
+                remainingSteps += 1
+            if finalRewardId != Quests.OBSOLETE:
+                if questDesc[Quests.QuestDictStartIndex] == Quests.Start:
+                    tier2RewardDict = self.tier2Reward2Quests.setdefault(questDesc[Quests.QuestDictTierIndex], {})
+                    for rewardId in Quests.getAllRewardIdsForReward(finalRewardId):
+                        tier2RewardDict.setdefault(rewardId, []).append(questId)
+
+            else:
+                finalRewardId = None
+            self.quest2Reward[questId] = finalRewardId
+            self.quest2RemainingSteps[questId] = remainingSteps
+            return (finalRewardId, remainingSteps)
+
+        for questId in questDict:
+            findFinalRewardId(questId)
+
+    def getStartingQuests(self, tier=None):
+        if tier is None:
+            startingQuests = []
+            for questIds in self.tier2Quests.values():
+                startingQuests.extend(questIds)
+
+        else:
+            startingQuests = list(self.tier2Quests[tier])
+        startingQuests.sort()
+        return startingQuests
+
+    def getQuestsForReward(self, tier, rewardId):
+        return self.tier2Reward2Quests[tier].get(rewardId, [])
+
+    def getFinalReward(self, questId):
+        return (self.quest2Reward.get(questId), self.quest2RemainingSteps.get(questId))
+
+    def getNpcQuests(self, npcId):
+        return self.npc2Quests.get(npcId, [])
+
+    def getData(self):
+        rewards = []
+        for tier, reward2Quests in self.tier2Reward2Quests.items():
+            for rewardId, questIds in reward2Quests.items():
+                rewards.append([tier, rewardId, questIds])
+
+        return {'version': QUEST_INDEX_VERSION,
+         'sourceHash': self.sourceHash,
+         'tiers': [[tier, questIds] for tier, questIds in self.tier2Quests.items()],
+         'rewards': rewards,
+         'quests': [[questId, self.quest2Reward[questId], self.quest2RemainingSteps[questId]] for questId in self.quest2Reward],
+         'npcs': [[npcId, questIds] for npcId, questIds in self.npc2Quests.items()]}
+
+    def setData(self, data):
+        self.sourceHash = data['sourceHash']
+        for tier, questIds in data['tiers']:
+            self.tier2Quests[tier] = questIds
+
+        for tier, rewardId, questIds in data['rewards']:
+            self.tier2Reward2Quests.setdefault(tier, {})[rewardId] = questIds
+
+        for questId, rewardId, remainingSteps in data['quests']:
+            self.quest2Reward[questId] = rewardId
+            self.quest2RemainingSteps[questId] = remainingSteps
+
+        for npcId, questIds in data['npcs']:
+            self.npc2Quests[npcId] = questIds
+
+
+def hashQuestSource(sourceFileName):
+    """
+    Returns a hex digest of the Quests module source, or None if it
+    can't be read (e.g. when running from frozen bytecode).
+    """
+    if not sourceFileName or not sourceFileName.endswith('.py'):
+        return None
+    try:
+        with open(sourceFileName, 'rb') as file:
+            return hashlib.sha1(file.read()).hexdigest()
+    except EnvironmentError:
+        return None
+
+
+def loadQuestIndex(questDict, sourceFileName):
+    """
+    Returns the QuestIndex for questDict.  If quest-index-cache-file is
+    configured and the Quests source can be hashed, the index is read
+    from (or written to) that file; otherwise it is compiled in memory.
+    """
+    cacheFileName = ConfigVariableString('quest-index-cache-file', '').value
+    sourceHash = None
+    if cacheFileName:
+        sourceHash = hashQuestSource(sourceFileName)
+
+    if sourceHash:
+        try:
+            with open(cacheFileName, 'r') as file:
+                data = json.load(file)
+            if data.get('version') == QUEST_INDEX_VERSION and data.get('sourceHash') == sourceHash:
+                questIndex = QuestIndex()
+                questIndex.setData(data)
+                return questIndex
+        except (IOError, ValueError, KeyError, TypeError):
+            pass
+
+    questIndex = QuestIndex(sourceHash)
+    questIndex.compile(questDict)
+    if sourceHash:
+        try:
+            cacheFolder = os.path.dirname(cacheFileName)
+            if cacheFolder and not os.path.exists(cacheFolder):
+                os.makedirs(cacheFolder)
+            with open(cacheFileName, 'w') as file:
+                json.dump(questIndex.getData(), file)
+        except EnvironmentError as e:
+            QuestIndex.notify.warning('Could not write quest index %s: %s' % (cacheFileName, e))
+
+    return questIndex
@@ -1,4 +1,6 @@
 from direct.directnotify import DirectNotifyGlobal
+from toontown.quest import Quests
+from toontown.quest import CogKillIndex
 
 
 class QuestManagerAI:
@@ -6,36 +8,367 @@ class QuestManagerAI:
 
     def __init__(self, air):
         self.air = air
+        self.questId2Quest = {}
+        self.questId2MatchKey = {}
+        self.lastKillIndex = None
 
-    def recoverItems(self, toon, suitsKilled, zoneId):
-        return [], []  # TODO
+    def __getQuest(self, questId):
+        # Quests.getQuest builds (and validates) a new quest object on
+        # every call; they never change, so keep one per quest id.
+        quest = self.questId2Quest.get(questId)
+        if quest is None:
+            quest = Quests.getQuest(questId)
+            self.questId2Quest[questId] = quest
+        return quest
 
-    def toonKilledCogs(self, toon, suitsKilled, zoneId, activeToonList):
-        pass  # TODO
+    def __getMatchKey(self, questId, quest):
+        if questId in self.questId2MatchKey:
+            return self.questId2MatchKey[questId]
+        matchKey = self.__makeMatchKey(quest)
+        self.questId2MatchKey[questId] = matchKey
+        return matchKey
+
+    def __makeMatchKey(self, quest):
+        """
+        Works out which kills a quest's doesCogCount/doesVPCount/
+        doesCFOCount would accept, as a CogKillIndex match key, or None
+        if the quest isn't advanced by killing cogs.  Subclasses are
+        tested before the classes they derive from.
+        """
+        if not isinstance(quest, Quests.CogQuest):
+            return None
+        if isinstance(quest, Quests.VPQuest):
+            return (CogKillIndex.MATCH_VP, None, None)
+        if isinstance(quest, Quests.CFOQuest):
+            return (CogKillIndex.MATCH_CFO, None, None)
+        if isinstance(quest, Quests.BuildingQuest):
+            return None
+        if isinstance(quest, Quests.SkeleReviveQuest):
+            return (CogKillIndex.MATCH_ALL, None, 'hasRevives')
+        if isinstance(quest, Quests.SkelecogTrackQuest):
+            return (CogKillIndex.MATCH_TRACK, quest.getCogTrack(), 'isSkelecog')
+        if isinstance(quest, Quests.SkelecogLevelQuest):
+            return (CogKillIndex.MATCH_LEVEL, quest.getCogLevel(), 'isSkelecog')
+        if isinstance(quest, Quests.SkelecogQuest):
+            return (CogKillIndex.MATCH_ALL, None, 'isSkelecog')
+        if isinstance(quest, Quests.CogLevelQuest):
+            return (CogKillIndex.MATCH_LEVEL, quest.getCogLevel(), None)
+        if isinstance(quest, Quests.CogTrackQuest):
+            return (CogKillIndex.MATCH_TRACK, quest.getCogTrack(), None)
+        flag = None
+        if isinstance(quest, Quests.ForemanQuest):
+            flag = 'isForeman'
+        elif isinstance(quest, Quests.SupervisorQuest):
+            flag = 'isSupervisor'
+        cogType = quest.getCogType()
+        if cogType is Quests.Any:
+            return (CogKillIndex.MATCH_ALL, None, flag)
+        return (CogKillIndex.MATCH_TYPE, cogType, flag)
+
+    def __getKillIndex(self, suitsKilled, zoneId):
+        # recoverItems is called once per toon with the same kill list,
+        # so the index of the most recent list is kept around.
+        if self.lastKillIndex is None or not self.lastKillIndex.isFor(suitsKilled, zoneId):
+            self.lastKillIndex = CogKillIndex.CogKillIndex(suitsKilled, zoneId)
+        return self.lastKillIndex
+
+    def __addProgress(self, questDesc, quest, num):
+        progress = questDesc[4] + num
+        numItems = quest.getNumQuestItems()
+        if numItems > 0:
+            progress = min(progress, numItems)
+        if progress == questDesc[4]:
+            return 0
+        questDesc[4] = progress
+        return 1
 
     def requestInteract(self, avId, npc):
-        npc.rejectAvatar(avId)  # TODO
+        av = self.air.doId2do.get(avId)
+        if not av:
+            return
 
-    def hasTailorClothingTicket(self, toon, npc):
-        return 0  # TODO
+        for questDesc in av.quests:
+            questId, fromNpcId, toNpcId, rewardId, toonProgress = questDesc
+            quest = self.__getQuest(questId)
+            if not quest:
+                continue
+            completeStatus = quest.getCompletionStatus(av, questDesc, npc)
+            if completeStatus == Quests.COMPLETE:
+                av.toonUp(av.getMaxHp())
+                if isinstance(quest, Quests.TrackChoiceQuest):
+                    npc.presentTrackChoice(avId, questId, quest.getChoices())
+                    return
+                self.__completeQuest(av, npc, questDesc, quest)
+                return
+            if completeStatus == Quests.INCOMPLETE_PROGRESS:
+                npc.incompleteQuest(avId, questId, completeStatus, toNpcId)
+                return
 
-    def toonKilledBuilding(self, toon, track, difficulty, numFloors, zoneId, activeToons):
-        pass  # TODO
+        if len(av.quests) >= av.getQuestCarryLimit() or not npc.getGivesQuests():
+            npc.rejectAvatar(avId)
+            return
 
-    def toonKilledCogdo(self, toon, difficulty, numFloors, zoneId, activeToons):
-        pass  # TODO
+        tier = av.getRewardTier()
+        if Quests.avatarHasAllRequiredRewards(av, tier) and not Quests.isLoopingFinalTier(tier):
+            if Quests.avatarWorkingOnRequiredRewards(av):
+                npc.rejectAvatarTierNotDone(avId)
+                return
+            tier += 1
+            # The quests still in hand came from the old tier; keep them
+            # on the books so they aren't offered again.
+            av.b_setQuestHistory([questDesc[0] for questDesc in av.quests])
+            av.b_setRewardHistory(tier, [questDesc[3] for questDesc in av.quests])
+
+        quests = Quests.chooseBestQuests(tier, npc, av)
+        if not quests:
+            npc.rejectAvatar(avId)
+        elif Quests.getNumChoices(tier) == 0:
+            self.avatarChoseQuest(avId, npc, *quests[0])
+        else:
+            npc.presentQuestChoice(avId, quests)
+
+    def __completeQuest(self, av, npc, questDesc, quest):
+        avId = av.getDoId()
+        questId, fromNpcId, toNpcId, rewardId, toonProgress = questDesc
+        nextQuestId, nextToNpcId = Quests.getNextQuest(questId, npc, av)
+        if nextQuestId == Quests.NA:
+            if isinstance(quest, Quests.DeliverGagQuest):
+                track, level = quest.getGagType()
+                for i in range(quest.getNumGags()):
+                    av.inventory.useItem(track, level)
+
+                av.b_setInventory(av.inventory.makeNetString())
+            av.removeQuest(questId)
+            reward = Quests.getReward(rewardId)
+            if reward:
+                reward.sendRewardAI(av)
+            npc.completeQuest(avId, questId, rewardId)
+            return
+
+        # Multi-part quest: swap in the next step in place, keeping the
+        # final reward.  The reward was recorded when the first step was
+        # handed out.
+        questDesc[:] = [nextQuestId,
+         npc.getNpcId(),
+         nextToNpcId,
+         rewardId,
+         0]
+        av.b_setQuests(av.quests)
+        npc.assignQuest(avId, nextQuestId, rewardId, nextToNpcId)
+
+    def avatarChoseQuest(self, avId, npc, questId, rewardId, toNpcId):
+        av = self.air.doId2do.get(avId)
+        if not av:
+            return
+        av.addQuest([questId,
+         npc.getNpcId(),
+         toNpcId,
+         rewardId,
+         0], rewardId)
+        npc.assignQuest(avId, questId, rewardId, toNpcId)
+
+    def avatarCancelled(self, avId):
+        pass
+
+    def avatarChoseTrack(self, avId, npc, questId, trackId):
+        av = self.air.doId2do.get(avId)
+        if not av:
+            return
+        rewardId = Quests.getRewardIdFromTrackId(trackId)
+        av.removeQuest(questId)
+        reward = Quests.getReward(rewardId)
+        if reward:
+            reward.sendRewardAI(av)
+        npc.completeQuest(avId, questId, rewardId)
+
+    def __getClothingTicket(self, av, npc):
+        for questDesc in av.quests:
+            rewardId = questDesc[3]
+            rewardClass = Quests.getRewardClass(rewardId)
+            if rewardClass not in (Quests.ClothingTicketReward, Quests.TIPClothingTicketReward):
+                continue
+            quest = self.__getQuest(questDesc[0])
+            if quest and quest.getCompletionStatus(av, questDesc, npc) == Quests.COMPLETE:
+                return (questDesc, rewardClass)
+
+        return (None, None)
+
+    def hasTailorClothingTicket(self, av, npc):
+        questDesc, rewardClass = self.__getClothingTicket(av, npc)
+        if questDesc is None:
+            return 0
+        elif rewardClass == Quests.TIPClothingTicketReward:
+            return 2
+        else:
+            return 1
+
+    def removeClothingTicket(self, av, npc):
+        questDesc, rewardClass = self.__getClothingTicket(av, npc)
+        if questDesc is None:
+            return 0
+        av.removeQuest(questDesc[0])
+        return 1
+
+    def toonRodeTrolleyFirstTime(self, toon):
+        changed = 0
+        for questDesc in toon.quests:
+            if isinstance(self.__getQuest(questDesc[0]), Quests.TrolleyQuest) and not questDesc[4]:
+                questDesc[4] = 1
+                changed = 1
+
+        if changed:
+            toon.b_setQuests(toon.quests)
+
+    def toonMadeFriend(self, av, otherAv):
+        changed = 0
+        for questDesc in av.quests:
+            quest = self.__getQuest(questDesc[0])
+            if isinstance(quest, Quests.FriendQuest):
+                changed |= self.__addProgress(questDesc, quest, quest.doesFriendCount(av, otherAv))
+
+        if changed:
+            av.b_setQuests(av.quests)
 
     def toonPlayedMinigame(self, toon, toons):
-        pass  # TODO
+        changed = 0
+        for questDesc in toon.quests:
+            quest = self.__getQuest(questDesc[0])
+            if isinstance(quest, Quests.MinigameNewbieQuest):
+                changed |= self.__addProgress(questDesc, quest, quest.doesMinigameCount(toon, toons))
+
+        if changed:
+            toon.b_setQuests(toon.quests)
 
     def toonRecoveredCogSuitPart(self, av, zoneId, avList):
-        pass  # TODO
+        changed = 0
+        for questDesc in av.quests:
+            quest = self.__getQuest(questDesc[0])
+            if isinstance(quest, Quests.CogPartQuest):
+                changed |= self.__addProgress(questDesc, quest, quest.doesCogPartCount(av.getDoId(), zoneId, avList))
+
+        if changed:
+            av.b_setQuests(av.quests)
 
     def toonDefeatedFactory(self, toon, factoryId, activeVictors):
-        pass  # TODO
+        changed = 0
+        for questDesc in toon.quests:
+            quest = self.__getQuest(questDesc[0])
+            if isinstance(quest, Quests.FactoryQuest):
+                changed |= self.__addProgress(questDesc, quest, quest.doesFactoryCount(toon.getDoId(), factoryId, activeVictors))
+
+        if changed:
+            toon.b_setQuests(toon.quests)
 
     def toonDefeatedMint(self, toon, mintId, activeVictors):
-        pass  # TODO
+        changed = 0
+        for questDesc in toon.quests:
+            quest = self.__getQuest(questDesc[0])
+            if isinstance(quest, Quests.MintQuest):
+                changed |= self.__addProgress(questDesc, quest, quest.doesMintCount(toon.getDoId(), mintId, activeVictors))
+
+        if changed:
+            toon.b_setQuests(toon.quests)
 
     def toonDefeatedStage(self, toon, stageId, activeVictors):
-        pass  # TODO
+        # There are no stage quests.
+        pass
+
+    def toonKilledCogdo(self, toon, difficulty, numFloors, zoneId, activeToons):
+        # There are no field office quests.
+        pass
+
+    def toonKilledBuilding(self, toon, track, difficulty, numFloors, zoneId, activeToons):
+        avId = toon.getDoId()
+        changed = 0
+        for questDesc in toon.quests:
+            quest = self.__getQuest(questDesc[0])
+            if not isinstance(quest, Quests.BuildingQuest):
+                continue
+            if not quest.isLocationMatch(zoneId):
+                continue
+            questTrack = quest.getBuildingTrack()
+            if questTrack != Quests.Any and questTrack != track:
+                continue
+            if numFloors < quest.getNumFloors():
+                continue
+            changed |= self.__addProgress(questDesc, quest, quest.doesBuildingCount(avId, activeToons))
+
+        if changed:
+            toon.b_setQuests(toon.quests)
+
+    def recoverItems(self, toon, suitsKilled, zoneId):
+        recovered = []
+        notRecovered = []
+        killIndex = None
+        changed = 0
+        for questDesc in toon.quests:
+            quest = self.__getQuest(questDesc[0])
+            if not isinstance(quest, Quests.RecoverItemQuest):
+                continue
+            if quest.getCompletionStatus(toon, questDesc) == Quests.COMPLETE:
+                continue
+            if killIndex is None:
+                killIndex = self.__getKillIndex(suitsKilled, zoneId)
+            if not killIndex.isLocationMatch(quest):
+                continue
+            holder = quest.getHolder()
+            holderType = quest.getHolderType()
+            if holderType == 'track':
+                matchKey = (CogKillIndex.MATCH_TRACK, holder, None)
+            elif holderType == 'level':
+                matchKey = (CogKillIndex.MATCH_LEVEL, holder, None)
+            elif holder == Quests.Any:
+                matchKey = (CogKillIndex.MATCH_ALL, None, None)
+            elif holder == Quests.AnyFish:
+                continue
+            else:
+                matchKey = (CogKillIndex.MATCH_TYPE, holder, None)
+            for index in killIndex.getMatches(matchKey):
+                if quest.getCompletionStatus(toon, questDesc) == Quests.COMPLETE:
+                    break
+                hit, questDesc[4] = quest.testRecover(questDesc[4])
+                changed = 1
+                if hit:
+                    recovered.append(quest.getItem())
+                else:
+                    notRecovered.append(quest.getItem())
+
+        if changed:
+            toon.b_setQuests(toon.quests)
+        return (recovered, notRecovered)
+
+    def toonKilledCogs(self, toon, suitsKilled, zoneId, activeToonList):
+        self.toonsKilledCogs([toon], suitsKilled, zoneId, activeToonList)
+
+    def toonsKilledCogs(self, toons, suitsKilled, zoneId, activeToonList):
+        """
+        Credits every toon in toons with the cogs killed in one battle.
+        The kill list is indexed once for the whole battle, each quest
+        is answered from that index, and each toon gets at most one
+        setQuests however many kills and quests were involved.
+        """
+        if not suitsKilled:
+            return
+        killIndex = self.__getKillIndex(suitsKilled, zoneId)
+        for toon in toons:
+            avId = toon.getDoId()
+            changed = 0
+            for questDesc in toon.quests:
+                quest = self.__getQuest(questDesc[0])
+                if quest is None:
+                    continue
+                matchKey = self.__getMatchKey(questDesc[0], quest)
+                if matchKey is None:
+                    continue
+                if questDesc[4] >= quest.getNumQuestItems():
+                    continue
+                if not killIndex.isLocationMatch(quest):
+                    continue
+                num = killIndex.countKills(avId, matchKey)
+                if num and isinstance(quest, Quests.NewbieQuest):
+                    num *= quest.getNumNewbies(avId, activeToonList)
+                if num:
+                    changed |= self.__addProgress(questDesc, quest, num)
+
+            if changed:
+                toon.b_setQuests(toon.quests)
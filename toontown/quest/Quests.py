@@ -1216,7 +1216,7 @@ class FactoryNewbieQuest(FactoryQuest, NewbieQuest):
         if FactoryQuest.doesFactoryCount(self, avId, location, avList):
             return self.getNumNewbies(avId, avList)
         else:
-            return num
+            return 0
 
 
 class MintQuest(LocationBasedQuest):
@@ -1292,7 +1292,7 @@ class MintNewbieQuest(MintQuest, NewbieQuest):
         if MintQuest.doesMintCount(self, avId, location, avList):
             return self.getNumNewbies(avId, avList)
         else:
-            return num
+            return 0
 
 
 class CogPartQuest(LocationBasedQuest):
@@ -1369,7 +1369,7 @@ class CogPartNewbieQuest(CogPartQuest, NewbieQuest):
         if CogPartQuest.doesCogPartCount(self, avId, location, avList):
             return self.getNumNewbies(avId, avList)
         else:
-            return num
+            return 0
 
 
 class DeliverGagQuest(Quest):
@@ -17669,18 +17669,15 @@ QuestDict = {
          NA,
          TTLocalizer.QuestDialogDict[12032])}
 
-Tier2QuestsDict = {}
-for questId, questDesc in list(QuestDict.items()):
-    if questDesc[QuestDictStartIndex] == Start:
-        tier = questDesc[QuestDictTierIndex]
-        if tier in Tier2QuestsDict:
-            Tier2QuestsDict[tier].append(questId)
-        else:
-            Tier2QuestsDict[tier] = [questId]
+questIndex = None
+
+def getQuestIndex():
+    global questIndex
+    if questIndex is None:
+        from toontown.quest import QuestIndex
+        questIndex = QuestIndex.loadQuestIndex(QuestDict, __file__)
+    return questIndex
 
-Quest2RewardDict = {}
-Tier2Reward2QuestsDict = {}
-Quest2RemainingStepsDict = {}
 
 def getAllRewardIdsForReward(rewardId):
     if rewardId is AnyCashbotSuitPart:
@@ -17693,64 +17690,27 @@ def getAllRewardIdsForReward(rewardId):
 
 
 def findFinalRewardId(questId):
-    finalRewardId = Quest2RewardDict.get(questId)
-    if finalRewardId:
-        remainingSteps = Quest2RemainingStepsDict.get(questId)
-    else:
-        try:
-            questDesc = QuestDict[questId]
-        except KeyError:
-            print('findFinalRewardId: Quest ID: %d not found' % questId)
-            return -1
-
-        nextQuestId = questDesc[QuestDictNextQuestIndex]
-        if nextQuestId == NA:
-            finalRewardId = questDesc[QuestDictRewardIndex]
-            remainingSteps = 1
-        else:
-            if type(nextQuestId) == type(()):
-                finalRewardId, remainingSteps = findFinalRewardId(nextQuestId[0])
-                for id in nextQuestId[1:]:
-                    findFinalRewardId(id)
+    if questId not in QuestDict:
+        print('findFinalRewardId: Quest ID: %d not found' % questId)
+        return -1
+    return getQuestIndex().getFinalReward(questId)
 
-            else:
-                finalRewardId, remainingSteps = findFinalRewardId(nextQuestId)
-            remainingSteps += 1
-        if finalRewardId != OBSOLETE:
-            if questDesc[QuestDictStartIndex] == Start:
-                tier = questDesc[QuestDictTierIndex]
-                tier2RewardDict = Tier2Reward2QuestsDict.setdefault(tier, {})
-                rewardIds = getAllRewardIdsForReward(finalRewardId)
-                for rewardId in rewardIds:
-                    questList = tier2RewardDict.setdefault(rewardId, [])
-                    questList.append(questId)
 
-        else:
-            finalRewardId = None
-        Quest2RewardDict[questId] = finalRewardId
-        Quest2RemainingStepsDict[questId] = remainingSteps
-    return (finalRewardId, remainingSteps)
+def getStartingQuests(tier = None):
+    return getQuestIndex().getStartingQuests(tier)
 
 
-for questId in list(QuestDict.keys()):
-    findFinalRewardId(questId)
+def getQuestsForReward(tier, rewardId):
+    return getQuestIndex().getQuestsForReward(tier, rewardId)
 
-def getStartingQuests(tier = None):
-    startingQuests = []
-    for questId in list(QuestDict.keys()):
-        if isStartingQuest(questId):
-            if tier is None:
-                startingQuests.append(questId)
-            elif questId in Tier2QuestsDict[tier]:
-                startingQuests.append(questId)
 
-    startingQuests.sort()
-    return startingQuests
+def getNpcStartingQuests(npcId):
+    return getQuestIndex().getNpcQuests(npcId)
 
 
 def getFinalRewardId(questId, fAll = 0):
     if fAll or isStartingQuest(questId):
-        return Quest2RewardDict.get(questId)
+        return getQuestIndex().quest2Reward.get(questId)
     else:
         return None
     return None
@@ -17812,47 +17772,50 @@ def getNextQuest(id, currentNpc, av):
 def filterQuests(entireQuestPool, currentNpc, av):
     if notify.getDebug():
         notify.debug('filterQuests: entireQuestPool: %s' % entireQuestPool)
-    validQuestPool = dict([ (questId, 1) for questId in entireQuestPool ])
     if isLoopingFinalTier(av.getRewardTier()):
-        history = [questDesc[0] for questDesc in av.quests]
+        history = set([questDesc[0] for questDesc in av.quests])
     else:
-        history = av.getQuestHistory()
+        history = set(av.getQuestHistory())
     if notify.getDebug():
         notify.debug('filterQuests: av quest history: %s' % history)
-    currentQuests = av.quests
+    currentNpcId = currentNpc.getNpcId()
+    busyToNpcIds = set([questDesc[2] for questDesc in av.quests if questDesc[2] != ToonHQ])
+    questClass2Filter = {}
+    finalQuestPool = []
+    seen = set()
     for questId in entireQuestPool:
+        if questId in seen:
+            continue
+        seen.add(questId)
         if questId in history:
             if notify.getDebug():
                 notify.debug('filterQuests: Removed %s because in history' % questId)
-            validQuestPool[questId] = 0
             continue
         potentialFromNpc = getQuestFromNpcId(questId)
         if not npcMatches(potentialFromNpc, currentNpc):
             if notify.getDebug():
                 notify.debug('filterQuests: Removed %s: potentialFromNpc does not match currentNpc' % questId)
-            validQuestPool[questId] = 0
             continue
         potentialToNpc = getQuestToNpcId(questId)
-        if currentNpc.getNpcId() == potentialToNpc:
+        if currentNpcId == potentialToNpc:
             if notify.getDebug():
                 notify.debug('filterQuests: Removed %s because potentialToNpc is currentNpc' % questId)
-            validQuestPool[questId] = 0
             continue
-        if not getQuestClass(questId).filterFunc(av):
+        questClass = getQuestClass(questId)
+        passesFilter = questClass2Filter.get(questClass)
+        if passesFilter is None:
+            passesFilter = questClass.filterFunc(av)
+            questClass2Filter[questClass] = passesFilter
+        if not passesFilter:
             if notify.getDebug():
                 notify.debug('filterQuests: Removed %s because of filterFunc' % questId)
-            validQuestPool[questId] = 0
             continue
-        for quest in currentQuests:
-            fromNpcId = quest[1]
-            toNpcId = quest[2]
-            if potentialToNpc == toNpcId and toNpcId != ToonHQ:
-                validQuestPool[questId] = 0
-                if notify.getDebug():
-                    notify.debug('filterQuests: Removed %s because npc involved' % questId)
-                break
+        if potentialToNpc in busyToNpcIds:
+            if notify.getDebug():
+                notify.debug('filterQuests: Removed %s because npc involved' % questId)
+            continue
+        finalQuestPool.append(questId)
 
-    finalQuestPool = [key for key in list(validQuestPool.keys()) if validQuestPool[key]]
     if notify.getDebug():
         notify.debug('filterQuests: finalQuestPool: %s' % finalQuestPool)
     return finalQuestPool
@@ -17910,7 +17873,7 @@ def chooseTrackChoiceQuest(tier, av, fixed = 0):
     else:
         if notify.getDebug():
             notify.debug('questPool for reward 400 had no dynamic choice, tier: %s' % tier)
-        bestQuest = seededRandomChoice(Tier2Reward2QuestsDict[tier][400])
+        bestQuest = seededRandomChoice(getQuestIndex().tier2Reward2Quests[tier][400])
     if notify.getDebug():
         notify.debug('chooseTrackChoiceQuest: avId: %s trackAccess: %s tier: %s bestQuest: %s' % (av.getDoId(),
          trackAccess,
@@ -17920,7 +17883,7 @@ def chooseTrackChoiceQuest(tier, av, fixed = 0):
 
 
 def chooseMatchingQuest(tier, validQuestPool, rewardId, npc, av):
-    questsMatchingReward = Tier2Reward2QuestsDict[tier].get(rewardId, [])
+    questsMatchingReward = getQuestsForReward(tier, rewardId)
     if notify.getDebug():
         notify.debug('questsMatchingReward: %s tier: %s = %s' % (rewardId, tier, questsMatchingReward))
     if rewardId == 400 and QuestDict[questsMatchingReward[0]][QuestDictNextQuestIndex] == NA:
@@ -17938,7 +17901,7 @@ def chooseMatchingQuest(tier, validQuestPool, rewardId, npc, av):
         if validQuestsMatchingReward:
             bestQuest = seededRandomChoice(validQuestsMatchingReward)
         else:
-            questsMatchingReward = Tier2Reward2QuestsDict[tier].get(AnyCashbotSuitPart, [])
+            questsMatchingReward = getQuestsForReward(tier, AnyCashbotSuitPart)
             if notify.getDebug():
                 notify.debug('questsMatchingReward: AnyCashbotSuitPart tier: %s = %s' % (tier, questsMatchingReward))
             validQuestsMatchingReward = PythonUtil.intersection(questsMatchingReward, validQuestPool)
@@ -17947,7 +17910,7 @@ def chooseMatchingQuest(tier, validQuestPool, rewardId, npc, av):
                     notify.debug('validQuestsMatchingReward: AnyCashbotSuitPart tier: %s = %s' % (tier, validQuestsMatchingReward))
                 bestQuest = seededRandomChoice(validQuestsMatchingReward)
             else:
-                questsMatchingReward = Tier2Reward2QuestsDict[tier].get(AnyLawbotSuitPart, [])
+                questsMatchingReward = getQuestsForReward(tier, AnyLawbotSuitPart)
                 if notify.getDebug():
                     notify.debug('questsMatchingReward: AnyLawbotSuitPart tier: %s = %s' % (tier, questsMatchingReward))
                 validQuestsMatchingReward = PythonUtil.intersection(questsMatchingReward, validQuestPool)
@@ -17956,7 +17919,7 @@ def chooseMatchingQuest(tier, validQuestPool, rewardId, npc, av):
                         notify.debug('validQuestsMatchingReward: AnyLawbotSuitPart tier: %s = %s' % (tier, validQuestsMatchingReward))
                     bestQuest = seededRandomChoice(validQuestsMatchingReward)
                 else:
-                    questsMatchingReward = Tier2Reward2QuestsDict[tier].get(Any, [])
+                    questsMatchingReward = getQuestsForReward(tier, Any)
                     if notify.getDebug():
                         notify.debug('questsMatchingReward: Any tier: %s = %s' % (tier, questsMatchingReward))
                     if not questsMatchingReward:
@@ -17993,7 +17956,7 @@ def transformReward(baseRewardId, av):
         return baseRewardId
 
 
-def chooseBestQuests(tier, currentNpc, av):
+def computeBestQuests(tier, currentNpc, av):
     if isLoopingFinalTier(tier):
         rewardHistory = [questDesc[3] for questDesc in av.quests]
     else:
@@ -18008,7 +17971,7 @@ def chooseBestQuests(tier, currentNpc, av):
     if Any not in possibleRewards:
         possibleRewards.append(Any)
     for rewardId in possibleRewards:
-        possibleQuests.extend(Tier2Reward2QuestsDict[tier].get(rewardId, []))
+        possibleQuests.extend(getQuestsForReward(tier, rewardId))
 
     validQuestPool = filterQuests(possibleQuests, currentNpc, av)
     if not validQuestPool:
@@ -18044,6 +18007,66 @@ def chooseBestQuests(tier, currentNpc, av):
     return bestQuests
 
 
+# The quests offered to an avatar depend only on the NPC and on the
+# avatar state gathered in getQuestChoiceState, and the random choices
+# among them are seeded from that same state, so the offer is memoized
+# per avatar.  DistributedToonAI drops an avatar's entries whenever its
+# quest fields are set and when it leaves; the whole state is also part
+# of the key, so a field changed in place can't produce a stale offer.
+MaxQuestChoicesPerAvatar = 16
+avId2QuestChoices = {}
+QuestChoiceCacheStats = {'hits': 0,
+ 'misses': 0,
+ 'invalidations': 0}
+
+def getQuestChoiceState(tier, av):
+    return (tier,
+     av.getRewardTier(),
+     av.getGameAccess(),
+     tuple(av.getQuestHistory()),
+     tuple(av.getRewardHistory()[1]),
+     tuple([tuple(questDesc) for questDesc in av.quests]),
+     tuple(av.getTrackProgress()),
+     tuple(av.getTrackAccess()),
+     tuple(av.getCogParts()),
+     len(av.getFriendsList()) == 0)
+
+
+def chooseBestQuests(tier, currentNpc, av):
+    npcKey = (currentNpc.getNpcId(), currentNpc.getHq(), currentNpc.getTailor())
+    state = getQuestChoiceState(tier, av)
+    questChoices = avId2QuestChoices.setdefault(av.getDoId(), {})
+    cached = questChoices.get(npcKey)
+    if cached and cached[0] == state:
+        QuestChoiceCacheStats['hits'] += 1
+        # Leave the generator exactly where computing the offer would
+        # have, since getNextQuest may draw from it next.
+        QuestRandGen.setstate(cached[2])
+        return [list(quest) for quest in cached[1]]
+    QuestChoiceCacheStats['misses'] += 1
+    bestQuests = computeBestQuests(tier, currentNpc, av)
+    if len(questChoices) >= MaxQuestChoicesPerAvatar:
+        questChoices.clear()
+    questChoices[npcKey] = (state, [list(quest) for quest in bestQuests], QuestRandGen.getstate())
+    return bestQuests
+
+
+def invalidateQuestChoices(avId):
+    if avId2QuestChoices.pop(avId, None) is not None:
+        QuestChoiceCacheStats['invalidations'] += 1
+
+
+def getQuestChoiceCacheStats():
+    stats = dict(QuestChoiceCacheStats)
+    lookups = stats['hits'] + stats['misses']
+    if lookups:
+        stats['hitRate'] = float(stats['hits']) / lookups
+    else:
+        stats['hitRate'] = 0.0
+    stats['avatars'] = len(avId2QuestChoices)
+    return stats
+
+
 def questExists(id):
     return id in QuestDict
 
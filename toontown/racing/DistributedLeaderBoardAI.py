@@ -3,6 +3,8 @@ import pickle
 from direct.directnotify import DirectNotifyGlobal
 from direct.distributed.DistributedObjectAI import DistributedObjectAI
 
+from toontown.racing import RaceGlobals
+from toontown.racing import RaceRecordStoreAI
 from toontown.toonbase import TTLocalizer
 
 
@@ -16,10 +18,12 @@ class DistributedLeaderBoardAI(DistributedObjectAI):
         self.records = {}
         self.subscriptions = []
         self.currentIndex = -1
+        self.displays = {}
 
     def announceGenerate(self):
         DistributedObjectAI.announceGenerate(self)
         self.accept('UpdateRaceRecord', self.handleUpdateRaceRecord)
+        self.accept('NewRaceRecord', self.handleNewRaceRecord)
         self.accept('GS_LeaderBoardSwap' + str(self.zoneId), self.updateDisplay)
 
     def getName(self):
@@ -40,13 +44,33 @@ class DistributedLeaderBoardAI(DistributedObjectAI):
             return
 
         self.records[trackId][period] = [(x[0], x[3]) for x in self.air.raceMgr.getRecords(trackId, period)]
+        self.displays.pop((trackId, period), None)
+
+    def handleNewRaceRecord(self, change):
+        trackId, period, numRacers, rank, record = change
+        if numRacers != RaceRecordStoreAI.AllRacers:
+            return
+
+        leaderList = self.records.get(trackId, {}).get(period)
+        if leaderList is None:
+            return
+
+        leaderList.insert(rank, (record[0], record[3]))
+        del leaderList[RaceGlobals.NumRecordsPerPeriod:]
+        self.displays.pop((trackId, period), None)
 
     def updateDisplay(self):
         self.currentIndex += 1
         if self.currentIndex >= len(self.subscriptions):
             self.currentIndex = 0
 
-        trackName = TTLocalizer.KartRace_TrackNames[self.subscriptions[self.currentIndex][0]]
-        periodName = TTLocalizer.RecordPeriodStrings[self.subscriptions[self.currentIndex][1]]
-        leaderList = self.records[self.subscriptions[self.currentIndex][0]][self.subscriptions[self.currentIndex][1]]
-        self.sendUpdate('setDisplay', [pickle.dumps((trackName, periodName, leaderList))])
+        subscription = tuple(self.subscriptions[self.currentIndex])
+        display = self.displays.get(subscription)
+        if display is None:
+            trackName = TTLocalizer.KartRace_TrackNames[subscription[0]]
+            periodName = TTLocalizer.RecordPeriodStrings[subscription[1]]
+            leaderList = self.records[subscription[0]][subscription[1]]
+            display = pickle.dumps((trackName, periodName, leaderList))
+            self.displays[subscription] = display
+
+        self.sendUpdate('setDisplay', [display])
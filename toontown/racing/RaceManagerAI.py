@@ -5,7 +5,7 @@ from toontown.coghq import MintLayout
 from toontown.ai import HolidayBaseAI
 from direct.showbase import DirectObject
 from toontown.racing import RaceGlobals
-import os, pickle
+from toontown.racing import RaceRecordStoreAI
 
 class RaceManagerAI(DirectObject.DirectObject):
     notify = DirectNotifyGlobal.directNotify.newCategory('RaceManagerAI')
@@ -14,9 +14,8 @@ class RaceManagerAI(DirectObject.DirectObject):
         DirectObject.DirectObject.__init__(self)
         self.air = air
         self.races = []
-        self.shard = str(air.districtId)
-        self.filename = self.getFilename()
-        self.trackRecords = self.loadRecords()
+        self.recordStore = RaceRecordStoreAI.RaceRecordStoreAI(air)
+        self.recordStore.open()
 
     def getDoId(self):
         return 0
@@ -581,114 +580,35 @@ class RaceManagerAI(DirectObject.DirectObject):
 
     def checkTimeRecord(self, trackId, time, raceType, numRacers, avId):
         bonus = 0
-        newRecord = 0
-        for period in RaceGlobals.PeriodIds:
-            for record in range(0, RaceGlobals.NumRecordsPerPeriod):
-                recordTime = self.trackRecords[trackId][period][record][0]
-                if time < recordTime:
-                    newRecord = 1
-                    self.notify.debug('new %s record!' % TTLocalizer.RecordPeriodStrings[period])
-                    av = simbase.air.doId2do.get(avId)
-                    if av:
-                        name = av.name
-                        self.trackRecords[trackId][period].insert(record, (time, raceType, numRacers, name))
-                        self.trackRecords[trackId][period] = self.trackRecords[trackId][period][:RaceGlobals.NumRecordsPerPeriod]
-                        self.updateLeaderboards(trackId, period)
-                        bonus = RaceGlobals.PeriodDict[period]
-                        self.air.writeServerEvent('kartingRecord', avId, '%s|%s|%s' % (period, trackId, time))
-                    else:
-                        self.notify.warning('warning: av not logged in!')
+        av = simbase.air.doId2do.get(avId)
+        if not av:
+            for period in RaceGlobals.PeriodIds:
+                if self.recordStore.isRecord(trackId, period, time):
+                    self.notify.warning('warning: av not logged in!')
                     break
 
-        if newRecord:
-            self.updateRecordFile()
-        return bonus
-
-    def updateRecordFile(self):
-        try:
-            backup = self.filename + '.bu'
-            if os.path.exists(self.filename):
-                os.rename(self.filename, backup)
-            file = open(self.filename, 'wb')
-            file.seek(0)
-            pickle.dump(self.trackRecords, file)
-            file.close()
-            if os.path.exists(backup):
-                os.remove(backup)
-        except EnvironmentError:
-            self.notify.warning(str(sys.exc_info()[1]))
-
-    def getFilename(self):
-        return '%s%s.trackRecords' % (self.air.dataFolder, self.shard)
-
-    def loadRecords(self):
-        try:
-            file = open(self.filename + '.bu', 'rb')
-            if os.path.exists(self.filename):
-                os.remove(self.filename)
-        except IOError:
-            try:
-                file = open(self.filename, 'rb')
-            except IOError:
-                return self.getRecordTimes()
-
-        file.seek(0)
-        records = self.loadFrom(file)
-        file.close()
-        for trackId in RaceGlobals.TrackIds:
-            if trackId not in records:
-                records[trackId] = {}
-                for i in RaceGlobals.PeriodIds:
-                    records[trackId][i] = []
-                    for j in range(0, RaceGlobals.NumRecordsPerPeriod):
-                        records[trackId][i].append(RaceGlobals.getDefaultRecord(trackId))
-
-        self.resetLeaderboards()
-        return records
-
-    def loadFrom(self, file):
-        records = {}
-        try:
-            while 1:
-                records = pickle.load(file)
-
-        except EOFError:
-            pass
+            return bonus
+        for period, racers, rank, record in self.recordStore.addRecord(trackId, time, raceType, numRacers, av.name):
+            messenger.send('NewRaceRecord', [(trackId, period, racers, rank, record)])
+            if racers != RaceRecordStoreAI.AllRacers:
+                continue
+            self.notify.debug('new %s record!' % TTLocalizer.RecordPeriodStrings[period])
+            bonus = RaceGlobals.PeriodDict[period]
+            self.air.writeServerEvent('kartingRecord', avId, '%s|%s|%s' % (period, trackId, time))
 
-        return records
-
-    def getRecordTimes(self):
-        records = {}
-        for trackId in RaceGlobals.TrackIds:
-            records[trackId] = {}
-            for i in RaceGlobals.PeriodIds:
-                records[trackId][i] = []
-                for j in range(0, RaceGlobals.NumRecordsPerPeriod):
-                    records[trackId][i].append(RaceGlobals.getDefaultRecord(trackId))
-
-        return records
+        return bonus
 
     def resetRecordPeriod(self, period):
+        self.recordStore.resetPeriod(period)
         for trackId in RaceGlobals.TrackIds:
-            for i in range(0, RaceGlobals.NumRecordsPerPeriod):
-                self.trackRecords[trackId][period][i] = RaceGlobals.getDefaultRecord(trackId)
-
             self.updateLeaderboards(trackId, period)
 
-        self.updateRecordFile()
-
-    def getRecords(self, trackId, period):
-        return self.trackRecords[trackId][period]
+    def getRecords(self, trackId, period, numRacers=RaceRecordStoreAI.AllRacers):
+        return self.recordStore.getRecords(trackId, period, numRacers)
 
     def updateLeaderboards(self, trackId, period):
         messenger.send('UpdateRaceRecord', [(trackId, period)])
 
-    def resetLeaderboards(self):
-        for track in RaceGlobals.TrackIds:
-            for period in RaceGlobals.PeriodIds:
-                self.updateLeaderboards(track, period)
-
-
 class KartRecordDailyResetter(HolidayBaseAI.HolidayBaseAI):
     notify = DirectNotifyGlobal.directNotify.newCategory('ResistanceEventMgrAI')
     PostName = 'kertRecordDailyReset'
@@ -0,0 +1,97 @@
+from otp.ai.AIBaseGlobal import *
+from direct.directnotify import DirectNotifyGlobal
+from toontown.racing import RaceGlobals
+from toontown.uberdog.DataStoreJournal import DataStoreJournal
+import bisect
+import re
+
+# The racer count of the boards that take records from races of every
+# size; these are the boards the Speedway leader boards show.
+AllRacers = 0
+
+
+class RaceRecordStoreAI:
+    """
+    Keeps the district's kart race records: for every (trackId, period,
+    numRacers) a board of the NumRecordsPerPeriod best times, padded
+    with the track's default record, where a numRacers of AllRacers
+    takes every race.  A new time is placed with a bisect on the board
+    and the board is changed in place, and only that board is written,
+    as one record in a DataStoreJournal under the district's name,
+    rather than the whole table being pickled again.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('RaceRecordStoreAI')
+
+    def __init__(self, air):
+        self.air = air
+        districtName = re.sub('[^A-Za-z0-9_-]', '_', air.districtName)
+        self.filepath = '%s%s_raceRecords' % (air.dataFolder, districtName)
+        self.journal = DataStoreJournal(self.filepath, config.GetFloat('race-record-write-period', 2.0), config.GetInt('race-record-flush-count', 16), config.GetInt('race-record-compact-size', 262144))
+        self.boards = {}
+        self.boardTimes = {}
+
+    def open(self):
+        self.journal.open()
+        self.boards = {}
+        self.boardTimes = {}
+        for key in self.journal.keys():
+            trackId, period, numRacers = key
+            if trackId not in RaceGlobals.TrackIds or period not in RaceGlobals.PeriodIds:
+                continue
+            self.__setBoard(key, [tuple(record) for record in self.journal[key]])
+
+        self.notify.info('Loaded %s race record boards.' % len(self.boards))
+
+    def close(self):
+        self.journal.close()
+
+    def __setBoard(self, key, board):
+        board = board[:RaceGlobals.NumRecordsPerPeriod]
+        while len(board) < RaceGlobals.NumRecordsPerPeriod:
+            board.append(RaceGlobals.getDefaultRecord(key[0]))
+
+        self.boards[key] = board
+        self.boardTimes[key] = [record[0] for record in board]
+
+    def __getBoard(self, key):
+        if key not in self.boards:
+            self.__setBoard(key, [])
+        return self.boards[key]
+
+    def getRecords(self, trackId, period, numRacers=AllRacers):
+        return self.__getBoard((trackId, period, numRacers))
+
+    def isRecord(self, trackId, period, time, numRacers=AllRacers):
+        return time < self.__getBoard((trackId, period, numRacers))[-1][0]
+
+    def addRecord(self, trackId, time, raceType, numRacers, name):
+        """
+        Places a race's time on every board it qualifies for.  Returns
+        (period, numRacers, rank, record) for each board that changed.
+        """
+        record = (time, raceType, numRacers, name)
+        changes = []
+        for period in RaceGlobals.PeriodIds:
+            for racers in (AllRacers, numRacers):
+                key = (trackId, period, racers)
+                board = self.__getBoard(key)
+                times = self.boardTimes[key]
+                rank = bisect.bisect_right(times, time)
+                if rank >= len(board):
+                    continue
+                board.insert(rank, record)
+                times.insert(rank, time)
+                del board[RaceGlobals.NumRecordsPerPeriod:]
+                del times[RaceGlobals.NumRecordsPerPeriod:]
+                self.journal[key] = board
+                changes.append((period, racers, rank, record))
+
+        return changes
+
+    def resetPeriod(self, period):
+        for key in list(self.boards.keys()):
+            if key[1] == period:
+                del self.boards[key]
+                del self.boardTimes[key]
+                if key in self.journal:
+                    del self.journal[key]
@@ -305,7 +305,7 @@ class SkipCFO(MagicWord):
 
         from toontown.suit.DistributedCashbotBossAI import DistributedCashbotBossAI
         boss = None
-        for do in simbase.air.doId2do.values():
+        for do in simbase.air.objectRegistry.getObjectsByClass('DistributedCashbotBoss'):
             if isinstance(do, DistributedCashbotBossAI):
                 if invoker.doId in do.involvedToons:
                     boss = do
@@ -344,7 +344,7 @@ class HitCFO(MagicWord):
         dmg = args[0]
         from toontown.suit.DistributedCashbotBossAI import DistributedCashbotBossAI
         boss = None
-        for do in simbase.air.doId2do.values():
+        for do in simbase.air.objectRegistry.getObjectsByClass('DistributedCashbotBoss'):
             if isinstance(do, DistributedCashbotBossAI):
                 if invoker.doId in do.involvedToons:
                     boss = do
@@ -376,7 +376,7 @@ class SkipCJ(MagicWord):
         battle = args[0]
         from toontown.suit.DistributedChiefJusticeAI import DistributedChiefJusticeAI
         boss = None
-        for do in simbase.air.doId2do.values():
+        for do in simbase.air.objectRegistry.getObjectsByClass('DistributedChiefJustice'):
             if isinstance(do, DistributedChiefJusticeAI):
                 if invoker.doId in do.involvedToons:
                     boss = do
@@ -426,7 +426,7 @@ class FillJury(MagicWord):
     def handleWord(self, invoker, avId, toon, *args):
         boss = None
         from toontown.suit.DistributedChiefJusticeAI import DistributedChiefJusticeAI
-        for do in simbase.air.doId2do.values():
+        for do in simbase.air.objectRegistry.getObjectsByClass('DistributedChiefJustice'):
             if isinstance(do, DistributedChiefJusticeAI):
                 if invoker.doId in do.involvedToons:
                     boss = do
@@ -451,7 +451,7 @@ class SkipVP(MagicWord):
         battle = args[0]
         from toontown.suit.DistributedSellbotBossAI import DistributedSellbotBossAI
         boss = None
-        for do in simbase.air.doId2do.values():
+        for do in simbase.air.objectRegistry.getObjectsByClass('DistributedSellbotBoss'):
             if isinstance(do, DistributedSellbotBossAI):
                 if invoker.doId in do.involvedToons:
                     boss = do
@@ -487,7 +487,7 @@ class playAnimation1(MagicWord):
     def handleWord(self, invoker, avId, toon, *args):
         from toontown.animations.DistributedSellOffAI import DistributedSellOffAI
         animation = None
-        for do in simbase.air.doId2do.values():
+        for do in simbase.air.objectRegistry.getObjectsByClass('DistributedSellOff'):
             if isinstance(do, DistributedSellOffAI):        
                 animation = do
                 break
@@ -506,7 +506,7 @@ class StunVP(MagicWord):
     def handleWord(self, invoker, avId, toon, *args):
         from toontown.suit.DistributedSellbotBossAI import DistributedSellbotBossAI
         boss = None
-        for do in simbase.air.doId2do.values():
+        for do in simbase.air.objectRegistry.getObjectsByClass('DistributedSellbotBoss'):
             if isinstance(do, DistributedSellbotBossAI):
                 if invoker.doId in do.involvedToons:
                     boss = do
@@ -530,7 +530,7 @@ class SkipCEO(MagicWord):
         battle = args[0]
         from toontown.suit.DistributedBossbotBossAI import DistributedBossbotBossAI
         boss = None
-        for do in simbase.air.doId2do.values():
+        for do in simbase.air.objectRegistry.getObjectsByClass('DistributedBossbotBoss'):
             if isinstance(do, DistributedBossbotBossAI):
                 if invoker.doId in do.involvedToons:
                     boss = do
@@ -590,7 +590,7 @@ class FeedDiners(MagicWord):
     def handleWord(self, invoker, avId, toon, *args):
         boss = None
         from toontown.suit.DistributedBossbotBossAI import DistributedBossbotBossAI
-        for do in simbase.air.doId2do.values():
+        for do in simbase.air.objectRegistry.getObjectsByClass('DistributedBossbotBoss'):
             if isinstance(do, DistributedBossbotBossAI):
                 if invoker.doId in do.involvedToons:
                     boss = do
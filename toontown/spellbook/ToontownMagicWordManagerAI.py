@@ -12,8 +12,6 @@
 from direct.directnotify import DirectNotifyGlobal
 from direct.distributed import DistributedObjectAI
 
-from otp.avatar.DistributedPlayerAI import DistributedPlayerAI
-
 from toontown.spellbook.MagicWordConfig import *
 from toontown.spellbook.MagicWordIndex import *
 
@@ -105,21 +103,20 @@ class ToontownMagicWordManagerAI(DistributedObjectAI.DistributedObjectAI):
         # The affectType is ZONE (zone the invoker is in), SERVER (the entire server), or RANK (specified access level)
         # Gather all of the Toons using whichever method this Magic Word requests
         if affectType in (AFFECT_ZONE, AFFECT_SERVER, AFFECT_RANK):
-            toonIds = []
-            # Iterate over a copy of every single doId on the server
-            for doId in list(self.air.doId2do.keys())[:]:
-                do = self.air.doId2do.get(doId)
-                # We only care if our DistributedObject is a player that is NOT our invoker (we dealt with that earlier)
-                if isinstance(do, DistributedPlayerAI) and do.isPlayerControlled() and do != toon:
-                    # Only add the Toons that are in the same zone as the invoker
-                    if affectType == AFFECT_ZONE and do.zoneId == toon.zoneId:
-                        toonIds.append(doId)
-                    # Add every Toon regardless of zone
-                    elif affectType == AFFECT_SERVER:
-                        toonIds.append(doId)
-                    # Only add the Toons that have the Access Level specified when the Magic Word was used
-                    elif affectType == AFFECT_RANK and do.getAccessLevel() == affectExtra:
-                        toonIds.append(doId)
+            # Ask the object registry for the players we want, rather than going through every object on the server
+            registry = self.air.objectRegistry
+            if affectType == AFFECT_ZONE:
+                # Only the Toons that are in the same zone as the invoker
+                players = registry.getPlayersInZone(toon.zoneId)
+            elif affectType == AFFECT_SERVER:
+                # Every Toon regardless of zone
+                players = registry.getPlayers()
+            else:
+                # Only the Toons that have the Access Level specified when the Magic Word was used
+                players = registry.getPlayersByAccessLevel(affectExtra)
+
+            # We only care about players that are NOT our invoker (we dealt with that earlier)
+            toonIds = [do.doId for do in players if do != toon]
 
             # There were no Toons we could perform this Magic Word on, so let the invoker know that
             if not toonIds and not targetIds:
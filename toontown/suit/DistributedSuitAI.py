@@ -168,6 +168,11 @@ class DistributedSuitAI(DistributedSuitBaseAI.DistributedSuitBaseAI):
     def setPathState(self, state):
         if self.pathState != state:
             self.pathState = state
+            if self.sp:
+                if state == 1:
+                    self.sp.suitOccupancy.addSuit(self)
+                else:
+                    self.sp.suitOccupancy.removeSuit(self)
             if state == 0:
                 self.stopPathNow()
             elif state == 1:
@@ -201,6 +206,8 @@ class DistributedSuitAI(DistributedSuitBaseAI.DistributedSuitBaseAI):
         self.setPathEndpoints(idx1, idx2, self.minPathLen, self.maxPathLen)
         self.setPathPosition(0, self.pathStartTime)
         self.pathState = 1
+        if self.sp:
+            self.sp.suitOccupancy.addSuit(self)
         self.currentLeg = 0
         self.zoneId = ZoneUtil.getTrueZoneId(self.legList.getZoneId(0), self.branchId)
         self.legType = self.legList.getType(0)
@@ -217,6 +224,8 @@ class DistributedSuitAI(DistributedSuitBaseAI.DistributedSuitBaseAI):
         numLegs = self.legList.getNumLegs()
         if self.currentLeg != nextLeg:
             self.currentLeg = nextLeg
+            if self.sp:
+                self.sp.suitOccupancy.retireIntervals(self, now - self.sp.PATH_COLLISION_BUFFER)
             self.__beginLegType(self.legList.getType(nextLeg))
             zoneId = self.legList.getZoneId(nextLeg)
             zoneId = ZoneUtil.getTrueZoneId(zoneId, self.branchId)
@@ -2,6 +2,7 @@ from panda3d.toontown import *
 from otp.ai.AIBaseGlobal import *
 from direct.distributed import DistributedObjectAI
 from . import SuitPlannerBase, DistributedSuitAI
+from .SuitOccupancyIndex import SuitOccupancyIndex
 from toontown.battle import BattleManagerAI
 from direct.task import Task
 from direct.directnotify import DirectNotifyGlobal
@@ -121,6 +122,7 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
         self.pendingBuildingHeights = []
         self.pendingCogdoHeights = []
         self.suitList = []
+        self.suitOccupancy = SuitOccupancyIndex()
         self.numFlyInSuits = 0
         self.numBuildingSuits = 0
         self.numAttemptingTakeover = 0
@@ -130,6 +132,7 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
         self.cogHQDoors = []
         self.battleList = []
         self.battleMgr = BattleManagerAI.BattleManagerAI(self.air)
+        self.sharedDNAStore = False
         self.setupDNA()
         if self.notify.getDebug():
             self.notify.debug('Creating a building manager AI in zone' + str(self.zoneId))
@@ -144,7 +147,8 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
                 bldg = self.buildingMgr.getBuilding(currBlock)
                 bldg.setSuitPlannerExt(self)
 
-        self.dnaStore.resetBlockNumbers()
+        if not self.sharedDNAStore:
+            self.dnaStore.resetBlockNumbers()
         self.initBuildingsAndPoints()
         numSuits = simbase.config.GetInt('suit-count', -1)
         if numSuits >= 0:
@@ -154,11 +158,29 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
             if self.SuitHoodInfo[self.hoodInfoIdx][self.SUIT_HOOD_INFO_ZONE] != suitHood:
                 self.currDesired = 0
         self.suitCountAdjust = 0
+        self.flyInDeficit = 0
+        self.buildingDeficit = 0
         return
 
+    def setupDNA(self):
+        if self.dnaStore:
+            return
+        suitGraph = self.air.getSuitGraph(self.zoneId)
+        if not suitGraph:
+            SuitPlannerBase.SuitPlannerBase.setupDNA(self)
+            return
+        # Share the street's DNAStorage (and its compiled suit graph)
+        # with the hood rather than parsing the DNA file again.  The
+        # store still belongs to the hood, so we must not reset it.
+        self.sharedDNAStore = True
+        self.dnaStore = self.air.dnaStoreMap[self.canonicalZoneId]
+        self.setSuitGraph(suitGraph)
+
     def cleanup(self):
         taskMgr.remove(self.taskName('sptUpkeepPopulation'))
         taskMgr.remove(self.taskName('sptAdjustPopulation'))
+        if self.air.suitPopulationScheduler:
+            self.air.suitPopulationScheduler.removePlanner(self)
         for suit in self.suitList:
             suit.stopTasks()
             if suit.isGenerated():
@@ -166,6 +188,7 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
                 suit.requestDelete()
 
         self.suitList = []
+        self.suitOccupancy.clear()
         self.numFlyInSuits = 0
         self.numBuildingSuits = 0
         self.numAttemptingTakeover = 0
@@ -261,14 +284,8 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
             return self.zoneIdToPointMap
         self.zoneIdToPointMap = {}
         for point in self.streetPointList:
-            points = self.dnaStore.getAdjacentPoints(point)
-            i = points.getNumPoints() - 1
-            while i >= 0:
-                pi = points.getPointIndex(i)
-                p = self.pointIndexes[pi]
-                i -= 1
-                zoneName = self.dnaStore.getSuitEdgeZone(point.getIndex(), p.getIndex())
-                zoneId = int(self.extractGroupName(zoneName))
+            for pi in reversed(self.suitGraph.getAdjacentIndexes(point.getIndex())):
+                zoneId = self.suitGraph.getEdgeZone(point.getIndex(), pi)
                 if zoneId in self.zoneIdToPointMap:
                     self.zoneIdToPointMap[zoneId].append(point)
                 else:
@@ -281,23 +298,14 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
         pointList = []
         if blockNumber in self.buildingSideDoors:
             for doorPoint in self.buildingSideDoors[blockNumber]:
-                points = self.dnaStore.getAdjacentPoints(doorPoint)
-                i = points.getNumPoints() - 1
-                while i >= 0:
-                    pi = points.getPointIndex(i)
-                    point = self.pointIndexes[pi]
-                    if point.getPointType() == DNASuitPoint.STREETPOINT:
-                        pointList.append(point)
-                    i -= 1
+                for pi in reversed(self.suitGraph.getAdjacentIndexes(doorPoint.getIndex())):
+                    if self.suitGraph.getPointType(pi) == DNASuitPoint.STREETPOINT:
+                        pointList.append(self.pointIndexes[pi])
 
         if blockNumber in self.buildingFrontDoors:
             doorPoint = self.buildingFrontDoors[blockNumber]
-            points = self.dnaStore.getAdjacentPoints(doorPoint)
-            i = points.getNumPoints() - 1
-            while i >= 0:
-                pi = points.getPointIndex(i)
+            for pi in reversed(self.suitGraph.getAdjacentIndexes(doorPoint.getIndex())):
                 pointList.append(self.pointIndexes[pi])
-                i -= 1
 
         return pointList
 
@@ -311,14 +319,12 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
             blockNumbers.remove(bn)
             if bn in self.buildingSideDoors:
                 for doorPoint in self.buildingSideDoors[bn]:
-                    points = self.dnaStore.getAdjacentPoints(doorPoint)
-                    i = points.getNumPoints() - 1
-                    while blockNumber == None and i >= 0:
-                        pi = points.getPointIndex(i)
+                    for pi in reversed(self.suitGraph.getAdjacentIndexes(doorPoint.getIndex())):
+                        if blockNumber != None:
+                            break
                         p = self.pointIndexes[pi]
-                        i -= 1
                         startTime = SuitTimings.fromSuitBuilding
-                        startTime += self.dnaStore.getSuitEdgeTravelTime(doorPoint.getIndex(), pi, self.suitWalkSpeed)
+                        startTime += self.suitGraph.getEdgeTravelTime(doorPoint.getIndex(), pi)
                         if not self.pointCollision(p, doorPoint, startTime):
                             startTime = SuitTimings.fromSuitBuilding
                             startPoint = doorPoint
@@ -418,14 +424,14 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
     def countNumNeededBuildings(self):
         if not self.buildingMgr:
             return 0
-        numSuitBuildings = len(self.buildingMgr.getSuitBlocks()) - len(self.buildingMgr.getCogdoBlocks())
+        numSuitBuildings = self.buildingMgr.getNumSuitBlocks() - self.buildingMgr.getNumCogdoBlocks()
         numNeeded = self.targetNumSuitBuildings - numSuitBuildings
         return numNeeded
 
     def countNumNeededCogdos(self):
         if not self.buildingMgr:
             return 0
-        numCogdos = len(self.buildingMgr.getCogdoBlocks())
+        numCogdos = self.buildingMgr.getNumCogdoBlocks()
         numNeeded = self.targetNumCogdos - numCogdos
         return numNeeded
 
@@ -461,9 +467,8 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
 
         else:
             if self.buildingMgr:
-                for blockNumber in self.buildingMgr.getSuitBlocks():
-                    track = self.buildingMgr.getBuildingTrack(blockNumber)
-                    if track == suit.track and blockNumber in self.buildingSideDoors:
+                for blockNumber in self.buildingMgr.getSuitBlocksByTrack(suit.track):
+                    if blockNumber in self.buildingSideDoors:
                         for doorPoint in self.buildingSideDoors[blockNumber]:
                             possibles.append((blockNumber, doorPoint))
 
@@ -509,43 +514,38 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
         pi = path.getPointIndex(i)
         point = self.pointIndexes[pi]
         adjacentPoint = self.pointIndexes[path.getPointIndex(i + 1)]
-        while point.getPointType() == DNASuitPoint.FRONTDOORPOINT or point.getPointType() == DNASuitPoint.SIDEDOORPOINT:
+        while self.suitGraph.getPointType(pi) in (DNASuitPoint.FRONTDOORPOINT, DNASuitPoint.SIDEDOORPOINT):
             i += 1
             lastPi = pi
             pi = path.getPointIndex(i)
             adjacentPoint = point
             point = self.pointIndexes[pi]
-            elapsedTime += self.dnaStore.getSuitEdgeTravelTime(lastPi, pi, self.suitWalkSpeed)
+            elapsedTime += self.suitGraph.getEdgeTravelTime(lastPi, pi)
 
         result = self.pointCollision(point, adjacentPoint, elapsedTime)
         return result
 
     def pointCollision(self, point, adjacentPoint, elapsedTime):
-        for suit in self.suitList:
-            if suit.pointInMyPath(point, elapsedTime):
-                return 1
+        then = globalClock.getFrameTime() + elapsedTime
+        if self.suitOccupancy.isPointOccupied(point.getIndex(), then - self.PATH_COLLISION_BUFFER, then + self.PATH_COLLISION_BUFFER):
+            return 1
 
         if adjacentPoint != None:
             return self.battleCollision(point, adjacentPoint)
         else:
-            points = self.dnaStore.getAdjacentPoints(point)
-            i = points.getNumPoints() - 1
-            while i >= 0:
-                pi = points.getPointIndex(i)
-                p = self.pointIndexes[pi]
-                i -= 1
-                if self.battleCollision(point, p):
+            for pi in reversed(self.suitGraph.getAdjacentIndexes(point.getIndex())):
+                if self.battleCollision(point, self.pointIndexes[pi]):
                     return 1
 
         return 0
 
     def battleCollision(self, point, adjacentPoint):
-        zoneName = self.dnaStore.getSuitEdgeZone(point.getIndex(), adjacentPoint.getIndex())
-        zoneId = int(self.extractGroupName(zoneName))
+        zoneId = self.suitGraph.getEdgeZone(point.getIndex(), adjacentPoint.getIndex())
         return self.battleMgr.cellHasBattle(zoneId)
 
     def removeSuit(self, suit):
         self.zoneChange(suit, suit.zoneId)
+        self.suitOccupancy.removeSuit(suit)
         if self.suitList.count(suit) > 0:
             self.suitList.remove(suit)
             if suit.flyInSuit:
@@ -576,11 +576,20 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
 
     def __waitForNextUpkeep(self):
         t = random.random() * 2.0 + self.POP_UPKEEP_DELAY
-        taskMgr.doMethodLater(t, self.upkeepSuitPopulation, self.taskName('sptUpkeepPopulation'))
+        if self.air.suitPopulationScheduler:
+            self.air.suitPopulationScheduler.scheduleUpkeep(self, t)
+        else:
+            taskMgr.doMethodLater(t, self.upkeepSuitPopulation, self.taskName('sptUpkeepPopulation'))
 
     def __waitForNextAdjust(self):
         t = random.random() * 10.0 + self.POP_ADJUST_DELAY
-        taskMgr.doMethodLater(t, self.adjustSuitPopulation, self.taskName('sptAdjustPopulation'))
+        if self.air.suitPopulationScheduler:
+            self.air.suitPopulationScheduler.scheduleAdjust(self, t)
+        else:
+            taskMgr.doMethodLater(t, self.adjustSuitPopulation, self.taskName('sptAdjustPopulation'))
+
+    def getSpawnDeficit(self):
+        return (self.flyInDeficit, self.buildingDeficit)
 
     def upkeepSuitPopulation(self, task):
         targetFlyInNum = self.calcDesiredNumFlyInSuits()
@@ -608,6 +617,8 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
                 break
             buildingDeficit -= 1
 
+        self.flyInDeficit = max(0, targetFlyInNum - self.numFlyInSuits)
+        self.buildingDeficit = max(0, targetBuildingNum - self.numBuildingSuits)
         if self.notify.getDebug() and self.currDesired == None:
             self.notify.debug('zone %d has %d of %d fly-in and %d of %d building suits.' % (self.zoneId, self.numFlyInSuits, targetFlyInNum, self.numBuildingSuits, targetBuildingNum))
             if buildingDeficit != 0:
@@ -672,7 +683,7 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
 
     def recycleBuilding(self, isCogdo):
         bmin = self.SuitHoodInfo[self.hoodInfoIdx][self.SUIT_HOOD_INFO_BMIN]
-        current = len(self.buildingMgr.getSuitBlocks())
+        current = self.buildingMgr.getNumSuitBlocks()
         target = self.targetNumSuitBuildings + self.targetNumCogdos
         if target > bmin and current <= target:
             if isCogdo:
@@ -694,8 +705,8 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
             targetSuitBuildings += sp.targetNumSuitBuildings
             targetCogdos += sp.targetNumCogdos
             if sp.buildingMgr:
-                numCogdoBlocks = len(sp.buildingMgr.getCogdoBlocks())
-                actualSuitBuildings += len(sp.buildingMgr.getSuitBlocks()) - numCogdoBlocks
+                numCogdoBlocks = sp.buildingMgr.getNumCogdoBlocks()
+                actualSuitBuildings += sp.buildingMgr.getNumSuitBlocks() - numCogdoBlocks
                 actualCogdos += numCogdoBlocks
 
         wantedSuitBuildings = int(totalBuildings * self.TOTAL_SUIT_BUILDING_PCT / 100)
@@ -709,7 +720,7 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
             numReassigned = 0
             for sp in list(self.air.suitPlanners.values()):
                 if sp.buildingMgr:
-                    numBuildings = len(sp.buildingMgr.getSuitBlocks()) - len(sp.buildingMgr.getCogdoBlocks())
+                    numBuildings = sp.buildingMgr.getNumSuitBlocks() - sp.buildingMgr.getNumCogdoBlocks()
                 else:
                     numBuildings = 0
                 if numBuildings > sp.targetNumSuitBuildings:
@@ -725,7 +736,7 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
                 numReassigned = 0
                 for sp in list(self.air.suitPlanners.values()):
                     if sp.buildingMgr:
-                        numCogdos = len(sp.buildingMgr.getCogdoBlocks())
+                        numCogdos = sp.buildingMgr.getNumCogdoBlocks()
                     else:
                         numCogdos = 0
                     if numCogdos > sp.targetNumCogdos:
@@ -1168,8 +1179,8 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
             targetBldgs = sp.targetNumSuitBuildings
             bm = simbase.air.buildingManagers.get(zoneId)
             if bm:
-                numCogdos = len(bm.getCogdoBlocks())
-                numBldgs = len(bm.getSuitBlocks()) - numCogdos
+                numCogdos = bm.getNumCogdoBlocks()
+                numBldgs = bm.getNumSuitBlocks() - numCogdos
                 s += '  %s: %2s/%2s buildings, %2s/%2s cogdos\n' % (zoneId, numBldgs, targetBldgs, numCogdos, targetCogdos)
                 totalBldgs += numBldgs
                 totalCogdos += numCogdos
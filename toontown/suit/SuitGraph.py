@@ -0,0 +1,204 @@
+from pandac.PandaModules import *
+from panda3d.toontown import *
+from direct.directnotify import DirectNotifyGlobal
+from toontown.hood import HoodUtil
+from toontown.toonbase import ToontownBattleGlobals
+from toontown.toonbase import ToontownGlobals
+import hashlib
+import json
+import os
+
+# Bump this whenever the layout of a compiled suit graph changes, so
+# stale cache files on disk are ignored rather than misread.
+SUIT_GRAPH_VERSION = 1
+
+
+class SuitGraph:
+    """
+    A compiled, read-only description of the suit path network of a
+    single street: every suit point, the adjacency between them, the
+    zone and travel time of every edge, the battle cell of every
+    visgroup and the gag bonus of every interactive prop.
+
+    A SuitGraph is built once per DNA file and shared by every suit
+    planner walking that street.  It holds only plain Python data, so
+    it can be written to disk and loaded again on the next boot
+    without walking the DNA tree.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('SuitGraph')
+
+    def __init__(self, fileHash=None, walkSpeed=ToontownGlobals.SuitWalkSpeed):
+        self.fileHash = fileHash
+        self.walkSpeed = walkSpeed
+        self.numGraphs = 0
+        self.pointTypes = {}
+        self.pointLandmarks = {}
+        self.adjacency = {}
+        self.edgeZones = {}
+        self.edgeTravelTimes = {}
+        self.battleCells = {}
+        self.cellToGagBonusDict = {}
+
+    def compile(self, dnaStore, zoneId):
+        """
+        Fills in this graph from a DNAStorage that already holds the
+        street's DNA.  The store itself is left untouched (apart from
+        the continuity pass), so it can be shared with the hood.
+        """
+        self.numGraphs = dnaStore.discoverContinuity()
+        if self.numGraphs != 1:
+            self.notify.info('zone %s has %s disconnected suit paths.' % (zoneId, self.numGraphs))
+
+        for i in range(dnaStore.getNumDNAVisGroupsAI()):
+            vg = dnaStore.getDNAVisGroupAI(i)
+            cellZoneId = int(extractGroupName(vg.getName()))
+            if vg.getNumBattleCells() == 1:
+                self.battleCells[cellZoneId] = tuple(vg.getBattleCell(0).getPos())
+            elif vg.getNumBattleCells() > 1:
+                self.notify.warning('multiple battle cells for zone: %d' % cellZoneId)
+                self.battleCells[cellZoneId] = tuple(vg.getBattleCell(0).getPos())
+
+            for j in range(vg.getNumChildren()):
+                childDnaGroup = vg.at(j)
+                if isinstance(childDnaGroup, DNAInteractiveProp):
+                    self.notify.debug('got interactive prop %s' % childDnaGroup)
+                    battleCellId = childDnaGroup.getCellId()
+                    if battleCellId == -1:
+                        self.notify.warning('interactive prop %s  at %s not associated with a a battle' % (childDnaGroup, cellZoneId))
+                    elif battleCellId == 0:
+                        if cellZoneId in self.cellToGagBonusDict:
+                            self.notify.error('FIXME battle cell at zone %s has two props %s %s linked to it' % (cellZoneId, self.cellToGagBonusDict[cellZoneId], childDnaGroup))
+                        else:
+                            propType = HoodUtil.calcPropType(childDnaGroup.getName())
+                            if propType in ToontownBattleGlobals.PropTypeToTrackBonus:
+                                self.cellToGagBonusDict[cellZoneId] = ToontownBattleGlobals.PropTypeToTrackBonus[propType]
+
+        for i in range(dnaStore.getNumSuitPoints()):
+            point = dnaStore.getSuitPointAtIndex(i)
+            index = point.getIndex()
+            self.pointTypes[index] = point.getPointType()
+            self.pointLandmarks[index] = point.getLandmarkBuildingIndex()
+            points = dnaStore.getAdjacentPoints(point)
+            adjacent = []
+            for k in range(points.getNumPoints()):
+                pi = points.getPointIndex(k)
+                adjacent.append(pi)
+                edgeZoneId = int(extractGroupName(dnaStore.getSuitEdgeZone(index, pi)))
+                self.edgeZones[(index, pi)] = edgeZoneId
+                self.edgeTravelTimes[(index, pi)] = dnaStore.getSuitEdgeTravelTime(index, pi, self.walkSpeed)
+
+            self.adjacency[index] = tuple(adjacent)
+
+    def getAdjacentIndexes(self, index):
+        return self.adjacency.get(index, ())
+
+    def getEdgeZone(self, index, adjacentIndex):
+        return self.edgeZones[(index, adjacentIndex)]
+
+    def getEdgeTravelTime(self, index, adjacentIndex):
+        return self.edgeTravelTimes[(index, adjacentIndex)]
+
+    def getPointType(self, index):
+        return self.pointTypes[index]
+
+    def getBattlePosDict(self):
+        battlePosDict = {}
+        for zoneId, pos in list(self.battleCells.items()):
+            battlePosDict[zoneId] = Point3(*pos)
+
+        return battlePosDict
+
+    def getCellToGagBonusDict(self):
+        return dict(self.cellToGagBonusDict)
+
+    def getData(self):
+        edges = []
+        for edge, edgeZoneId in list(self.edgeZones.items()):
+            edges.append([edge[0], edge[1], edgeZoneId, self.edgeTravelTimes[edge]])
+
+        return {'version': SUIT_GRAPH_VERSION,
+         'fileHash': self.fileHash,
+         'walkSpeed': self.walkSpeed,
+         'numGraphs': self.numGraphs,
+         'points': [[index, self.pointTypes[index], self.pointLandmarks[index], list(self.adjacency[index])] for index in self.pointTypes],
+         'edges': edges,
+         'battleCells': [[zoneId, list(pos)] for zoneId, pos in list(self.battleCells.items())],
+         'gagBonuses': [[zoneId, track] for zoneId, track in list(self.cellToGagBonusDict.items())]}
+
+    def setData(self, data):
+        self.fileHash = data['fileHash']
+        self.walkSpeed = data['walkSpeed']
+        self.numGraphs = data['numGraphs']
+        for index, pointType, landmark, adjacent in data['points']:
+            self.pointTypes[index] = pointType
+            self.pointLandmarks[index] = landmark
+            self.adjacency[index] = tuple(adjacent)
+
+        for index, adjacentIndex, edgeZoneId, travelTime in data['edges']:
+            self.edgeZones[(index, adjacentIndex)] = edgeZoneId
+            self.edgeTravelTimes[(index, adjacentIndex)] = travelTime
+
+        for zoneId, pos in data['battleCells']:
+            self.battleCells[zoneId] = tuple(pos)
+
+        for zoneId, track in data['gagBonuses']:
+            self.cellToGagBonusDict[zoneId] = track
+
+
+def extractGroupName(groupFullName):
+    return str(groupFullName).split(':', 1)[0]
+
+
+def hashDNAFile(dnaFileName):
+    """
+    Returns a hex digest of the contents of the given (already
+    resolved) DNA file, or None if it can't be read.
+    """
+    data = vfs.readFile(Filename(dnaFileName), True)
+    if not data:
+        return None
+    return hashlib.sha1(data).hexdigest()
+
+
+def getCacheFileName(cacheFolder, fileHash, walkSpeed):
+    return os.path.join(cacheFolder, 'suitgraph_%s_%s.json' % (fileHash, walkSpeed))
+
+
+def loadSuitGraph(dnaStore, zoneId, dnaFileName=None, cacheFolder=None, walkSpeed=ToontownGlobals.SuitWalkSpeed):
+    """
+    Returns the SuitGraph for the street held in dnaStore.  If a cache
+    folder is given and dnaFileName resolves, the compiled graph is
+    read from (or written to) a cache file keyed by the DNA file's
+    hash; otherwise it is compiled straight from the store.
+    """
+    fileHash = None
+    if cacheFolder and dnaFileName:
+        fileHash = hashDNAFile(dnaFileName)
+
+    if fileHash:
+        fileName = getCacheFileName(cacheFolder, fileHash, walkSpeed)
+        try:
+            with open(fileName, 'r') as file:
+                data = json.load(file)
+            if data.get('version') == SUIT_GRAPH_VERSION and data.get('fileHash') == fileHash:
+                suitGraph = SuitGraph()
+                suitGraph.setData(data)
+                # The path finder inside the store still needs its
+                # graph ids assigned, even when we skip the rest.
+                dnaStore.discoverContinuity()
+                return suitGraph
+        except (IOError, ValueError, KeyError, TypeError):
+            pass
+
+    suitGraph = SuitGraph(fileHash, walkSpeed)
+    suitGraph.compile(dnaStore, zoneId)
+    if fileHash:
+        try:
+            if not os.path.exists(cacheFolder):
+                os.makedirs(cacheFolder)
+            with open(fileName, 'w') as file:
+                json.dump(suitGraph.getData(), file)
+        except EnvironmentError as e:
+            SuitGraph.notify.warning('Could not write suit graph cache %s: %s' % (fileName, e))
+
+    return suitGraph
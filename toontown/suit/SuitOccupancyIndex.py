@@ -0,0 +1,121 @@
+from direct.directnotify import DirectNotifyGlobal
+import bisect
+
+INFINITY = float('inf')
+
+
+class SuitOccupancyIndex:
+    """
+    Keeps, for every suit point on a street, a sorted list of the time
+    intervals during which a walking suit occupies that point.  The
+    intervals come straight from each suit's SuitLegList, so a lookup
+    here answers exactly the question DistributedSuitAI.pointInMyPath
+    answers, without asking every suit on the street in turn.
+
+    Intervals are stored in absolute frame time as (start, end, key)
+    tuples sorted by start.  The key is id(suit), since a suit is
+    indexed before it has been given a doId.  A leg occupies both of
+    its end points from its own start time until the next leg begins;
+    the first leg reaches back and the last leg reaches forward
+    indefinitely, which mirrors how SuitLegList.getLegIndexAtTime
+    clamps out-of-range times.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('SuitOccupancyIndex')
+
+    def __init__(self):
+        self.point2Intervals = {}
+        self.suit2Entries = {}
+        self.numQueries = 0
+        self.numCollisions = 0
+
+    def clear(self):
+        self.point2Intervals = {}
+        self.suit2Entries = {}
+
+    def hasSuit(self, suit):
+        return id(suit) in self.suit2Entries
+
+    def addSuit(self, suit):
+        """
+        Indexes every leg of the suit's current path.  Call this when
+        the suit starts (or resumes) walking its path.
+        """
+        self.removeSuit(suit)
+        legList = suit.legList
+        numLegs = legList.getNumLegs()
+        entries = []
+        for i in range(numLegs):
+            leg = legList.getLeg(i)
+            if i == 0:
+                start = -INFINITY
+            else:
+                start = suit.pathStartTime + legList.getStartTime(i)
+            if i == numLegs - 1:
+                end = INFINITY
+            else:
+                end = suit.pathStartTime + legList.getStartTime(i + 1)
+            interval = (start, end, id(suit))
+            for pointIndex in set((leg.getPointA(), leg.getPointB())):
+                bisect.insort(self.point2Intervals.setdefault(pointIndex, []), interval)
+                entries.append((pointIndex, interval))
+
+        self.suit2Entries[id(suit)] = entries
+
+    def removeSuit(self, suit):
+        """
+        Drops every interval belonging to the suit, e.g. because it has
+        left its path to join a battle or fly away.
+        """
+        entries = self.suit2Entries.pop(id(suit), None)
+        if not entries:
+            return
+        for pointIndex, interval in entries:
+            self.__removeInterval(pointIndex, interval)
+
+    def retireIntervals(self, suit, cutoff):
+        """
+        Drops the suit's intervals that ended before cutoff.  Called as
+        a suit finishes legs so finished legs stop costing lookups.
+        """
+        entries = self.suit2Entries.get(id(suit))
+        if not entries:
+            return
+        remaining = []
+        for pointIndex, interval in entries:
+            if interval[1] < cutoff:
+                self.__removeInterval(pointIndex, interval)
+            else:
+                remaining.append((pointIndex, interval))
+
+        self.suit2Entries[id(suit)] = remaining
+
+    def __removeInterval(self, pointIndex, interval):
+        intervals = self.point2Intervals.get(pointIndex)
+        if not intervals:
+            return
+        i = bisect.bisect_left(intervals, interval)
+        if i < len(intervals) and intervals[i] == interval:
+            del intervals[i]
+        if not intervals:
+            del self.point2Intervals[pointIndex]
+
+    def isPointOccupied(self, pointIndex, lowTime, highTime):
+        """
+        Returns true if any indexed suit occupies the point at some time
+        in [lowTime, highTime].
+        """
+        self.numQueries += 1
+        intervals = self.point2Intervals.get(pointIndex)
+        if not intervals:
+            return 0
+        i = bisect.bisect_right(intervals, (highTime, INFINITY, INFINITY))
+        while i > 0:
+            i -= 1
+            if intervals[i][1] > lowTime:
+                self.numCollisions += 1
+                return 1
+
+        return 0
+
+    def getNumIntervals(self):
+        return sum([len(intervals) for intervals in self.point2Intervals.values()])
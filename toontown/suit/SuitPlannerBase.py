@@ -8,6 +8,7 @@ from toontown.toonbase import ToontownGlobals
 from toontown.toonbase import ToontownBattleGlobals
 from toontown.hood import HoodUtil
 from toontown.building import SuitBuildingGlobals
+from . import SuitGraph
 
 class SuitPlannerBase:
     notify = DirectNotifyGlobal.directNotify.newCategory('SuitPlannerBase')
@@ -484,6 +485,7 @@ class SuitPlannerBase:
     def __init__(self):
         self.suitWalkSpeed = ToontownGlobals.SuitWalkSpeed
         self.dnaStore = None
+        self.suitGraph = None
         self.pointIndexes = {}
         return
 
@@ -524,41 +526,18 @@ class SuitPlannerBase:
         return str(groupFullName).split(':', 1)[0]
 
     def initDNAInfo(self):
-        numGraphs = self.dnaStore.discoverContinuity()
-        if numGraphs != 1:
-            self.notify.info('zone %s has %s disconnected suit paths.' % (self.zoneId, numGraphs))
-        self.battlePosDict = {}
-        self.cellToGagBonusDict = {}
-        for i in range(self.dnaStore.getNumDNAVisGroupsAI()):
-            vg = self.dnaStore.getDNAVisGroupAI(i)
-            zoneId = int(self.extractGroupName(vg.getName()))
-            if vg.getNumBattleCells() == 1:
-                battleCell = vg.getBattleCell(0)
-                self.battlePosDict[zoneId] = vg.getBattleCell(0).getPos()
-            elif vg.getNumBattleCells() > 1:
-                self.notify.warning('multiple battle cells for zone: %d' % zoneId)
-                self.battlePosDict[zoneId] = vg.getBattleCell(0).getPos()
-            if True:
-                for i in range(vg.getNumChildren()):
-                    childDnaGroup = vg.at(i)
-                    if isinstance(childDnaGroup, DNAInteractiveProp):
-                        self.notify.debug('got interactive prop %s' % childDnaGroup)
-                        battleCellId = childDnaGroup.getCellId()
-                        if battleCellId == -1:
-                            self.notify.warning('interactive prop %s  at %s not associated with a a battle' % (childDnaGroup, zoneId))
-                        elif battleCellId == 0:
-                            if zoneId in self.cellToGagBonusDict:
-                                self.notify.error('FIXME battle cell at zone %s has two props %s %s linked to it' % (zoneId, self.cellToGagBonusDict[zoneId], childDnaGroup))
-                            else:
-                                name = childDnaGroup.getName()
-                                propType = HoodUtil.calcPropType(name)
-                                if propType in ToontownBattleGlobals.PropTypeToTrackBonus:
-                                    trackBonus = ToontownBattleGlobals.PropTypeToTrackBonus[propType]
-                                    self.cellToGagBonusDict[zoneId] = trackBonus
-
+        suitGraph = SuitGraph.SuitGraph(walkSpeed=self.suitWalkSpeed)
+        suitGraph.compile(self.dnaStore, self.zoneId)
         self.dnaStore.resetDNAGroups()
         self.dnaStore.resetDNAVisGroups()
         self.dnaStore.resetDNAVisGroupsAI()
+        self.setSuitGraph(suitGraph)
+        return None
+
+    def setSuitGraph(self, suitGraph):
+        self.suitGraph = suitGraph
+        self.battlePosDict = suitGraph.getBattlePosDict()
+        self.cellToGagBonusDict = suitGraph.getCellToGagBonusDict()
         self.streetPointList = []
         self.frontdoorPointList = []
         self.sidedoorPointList = []
@@ -566,18 +545,17 @@ class SuitPlannerBase:
         numPoints = self.dnaStore.getNumSuitPoints()
         for i in range(numPoints):
             point = self.dnaStore.getSuitPointAtIndex(i)
-            if point.getPointType() == DNASuitPoint.FRONTDOORPOINT:
+            pointType = suitGraph.getPointType(point.getIndex())
+            if pointType == DNASuitPoint.FRONTDOORPOINT:
                 self.frontdoorPointList.append(point)
-            elif point.getPointType() == DNASuitPoint.SIDEDOORPOINT:
+            elif pointType == DNASuitPoint.SIDEDOORPOINT:
                 self.sidedoorPointList.append(point)
-            elif point.getPointType() == DNASuitPoint.COGHQINPOINT or point.getPointType() == DNASuitPoint.COGHQOUTPOINT:
+            elif pointType == DNASuitPoint.COGHQINPOINT or pointType == DNASuitPoint.COGHQOUTPOINT:
                 self.cogHQDoorPointList.append(point)
             else:
                 self.streetPointList.append(point)
             self.pointIndexes[point.getIndex()] = point
 
-        return None
-
     def performPathTest(self):
         if not self.notify.getDebug():
             return None
@@ -589,8 +567,8 @@ class SuitPlannerBase:
         path = self.dnaStore.getSuitPath(startPoint, endPoint)
         numPathPoints = path.getNumPoints()
         for i in range(numPathPoints - 1):
-            zone = self.dnaStore.getSuitEdgeZone(path.getPointIndex(i), path.getPointIndex(i + 1))
-            travelTime = self.dnaStore.getSuitEdgeTravelTime(path.getPointIndex(i), path.getPointIndex(i + 1), self.suitWalkSpeed)
+            zone = self.suitGraph.getEdgeZone(path.getPointIndex(i), path.getPointIndex(i + 1))
+            travelTime = self.suitGraph.getEdgeTravelTime(path.getPointIndex(i), path.getPointIndex(i + 1))
             self.notify.debug('edge from point ' + repr(i) + ' to point ' + repr((i + 1)) + ' is in zone: ' + repr(zone) + ' and will take ' + repr(travelTime) + ' seconds to walk.')
 
         return None
@@ -0,0 +1,552 @@
+"""
+Headless benchmark for DistributedSuitPlannerAI.
+
+Loads the DNA of one or more streets into suit planners hosted by a
+stand-in repository, then runs simulated hours of suit population
+upkeep and adjustment against a simulated clock: suits spawn, walk
+their paths, take over buildings and retire, with no connection to a
+message director.  Each scenario (a suit count and an invasion setting)
+starts from fresh planners, and reports spawns per second of planner
+time, genPath retries, path and point collision rejections and the
+peak number of suits on each street.  It records a digest of every
+street's state at each simulated minute, so a later run (with the same
+seed, streets and scenarios) can tell whether a change to the planner
+altered its behavior.
+
+Run from the repository root:
+
+    python3 -m toontown.suit.SuitPlannerBenchmark --hours 4
+    python3 -m toontown.suit.SuitPlannerBenchmark --streets 2100 5200 --suit-count -1 10 40
+    python3 -m toontown.suit.SuitPlannerBenchmark --invasion none f cc --skelecog
+    python3 -m toontown.suit.SuitPlannerBenchmark --save-baseline suits.json
+    python3 -m toontown.suit.SuitPlannerBenchmark --baseline suits.json
+
+A suit count of -1 leaves the street's own population targets in
+charge, as a live district does; anything else pins the street to that
+many suits, as the suit-count config variable would.  Buildings are
+stand-ins that change hands the moment a suit reaches their door, and
+toons win a suit building back after --reclaim-minutes.
+"""
+
+from panda3d.core import *
+import builtins
+
+import argparse
+
+parser = argparse.ArgumentParser(description='Open Toontown - DistributedSuitPlannerAI benchmark')
+parser.add_argument('--streets', type=int, nargs='+', help='The street zones to simulate (default: every toon street).')
+parser.add_argument('--hours', type=float, default=2.0, help='The number of simulated hours per scenario.')
+parser.add_argument('--step', type=float, default=1.0, help='The simulated seconds per task manager frame.')
+parser.add_argument('--suit-count', type=int, nargs='+', default=[-1], help='The suit counts to run scenarios with; -1 uses the street targets.')
+parser.add_argument('--invasion', nargs='+', default=['none'], help='The invading suit names to run scenarios with; none for no invasion.')
+parser.add_argument('--skelecog', action='store_true', help='Make invading suits skelecogs.')
+parser.add_argument('--reclaim-minutes', type=float, default=30.0, help='How long a suit building stands before toons reclaim it; 0 never.')
+parser.add_argument('--no-cogdos', action='store_true', help='Run with want-cogdominiums off.')
+parser.add_argument('--seed', type=int, default=0, help='The random seed used for every scenario.')
+parser.add_argument('--baseline', help='A JSON file of state digests to compare this run against.')
+parser.add_argument('--save-baseline', help='Write the state digests of this run to this JSON file.')
+parser.add_argument('config', nargs='*', default=['etc/Configrc.prc'],
+                    help='PRC file(s) that will be loaded before running.')
+args = parser.parse_args()
+
+for prc in args.config:
+    loadPrcFile(prc)
+
+loadPrcFileData('Suit Planner Benchmark Config', 'notify-level-DistributedSuitPlannerAI warning\nnotify-level-DistributedSuitAI warning\n')
+
+
+class game:
+    name = 'toontown'
+    process = 'server'
+
+
+builtins.game = game
+
+from otp.ai.AIBaseGlobal import *
+from panda3d.toontown import *
+from toontown.building import FADoorCodes
+from toontown.hood import ZoneUtil
+from toontown.suit import SuitDNA
+from toontown.suit import SuitGraph
+from toontown.toon import NPCToons
+from toontown.toonbase import ToontownGlobals
+import hashlib
+import json
+import random
+import time
+
+
+class BenchDClasses(dict):
+    """
+    Stands in for dclassesByName; the benchmark never packs a field, so
+    every distributed class can be None.
+    """
+
+    def __missing__(self, className):
+        return None
+
+
+class BenchInvasionManager:
+
+    def __init__(self):
+        self.suitName = None
+        self.skelecog = 0
+
+    def getInvadingCog(self):
+        return (self.suitName, self.skelecog)
+
+    def getInvading(self):
+        return self.suitName is not None
+
+
+class BenchDoor:
+
+    def __init__(self, building):
+        self.building = building
+
+    def setDoorLock(self, lockCode):
+        self.building.doorLock = lockCode
+
+    def requestSuitEnter(self, suitId):
+        pass
+
+
+class BenchBuilding:
+    """
+    A street building reduced to its block, its owner and the calls
+    the planner and its suits make on it.  Takeovers happen at once.
+    """
+
+    def __init__(self, bench, block, zoneId, interiorZoneId):
+        self.bench = bench
+        self.block = block
+        self.zoneId = zoneId
+        self.interiorZoneId = interiorZoneId
+        self.state = 'toon'
+        self.track = 'c'
+        self.difficulty = 1
+        self.numFloors = 1
+        self.becameSuitTime = 0
+        self.doorLock = FADoorCodes.UNLOCKED
+        self.door = BenchDoor(self)
+        self.suitPlannerExt = None
+
+    def setSuitPlannerExt(self, planner):
+        self.suitPlannerExt = planner
+
+    def getBlock(self):
+        return [self.block, self.interiorZoneId]
+
+    def getExteriorAndInteriorZoneId(self):
+        return (self.zoneId, self.interiorZoneId)
+
+    def isSuitBuilding(self):
+        return self.state in ('suit', 'cogdo')
+
+    def isSuitBlock(self):
+        return self.isSuitBuilding()
+
+    def isToonBlock(self):
+        return self.state == 'toon'
+
+    def suitTakeOver(self, suitTrack, difficulty, buildingHeight):
+        self.__takeOver('suit', suitTrack, difficulty, (buildingHeight or 0) + 1)
+
+    def cogdoTakeOver(self, suitTrack, difficulty, buildingHeight):
+        self.__takeOver('cogdo', suitTrack, difficulty, (buildingHeight or 0) + 1)
+
+    def __takeOver(self, state, suitTrack, difficulty, numFloors):
+        if not self.isToonBlock():
+            return
+        self.state = state
+        self.track = suitTrack
+        self.difficulty = difficulty
+        self.numFloors = numFloors
+        self.becameSuitTime = globalClock.getFrameTime()
+        self.doorLock = FADoorCodes.UNLOCKED
+        self.bench.numTakeovers += 1
+
+    def toonTakeOver(self):
+        self.state = 'toon'
+        self.bench.numReclaims += 1
+
+
+class BenchBuildingMgr:
+    """
+    The building manager calls DistributedSuitPlannerAI makes, answered
+    from BenchBuildings for every ordinary block in the street's DNA.
+    """
+
+    def __init__(self, bench, branchId, dnaStore):
+        self.branchId = branchId
+        self.buildings = {}
+        self.blockLists = ([], [], [], [], [], [])
+        for i in range(dnaStore.getNumBlockNumbers()):
+            block = dnaStore.getBlockNumberAt(i)
+            buildingType = dnaStore.getBlockBuildingType(block)
+            if buildingType in ('hq', 'gagshop', 'petshop', 'kartshop'):
+                continue
+            zoneId = ZoneUtil.getTrueZoneId(dnaStore.getZoneFromBlockNumber(block), branchId)
+            interiorZoneId = zoneId - zoneId % 100 + 500 + block
+            self.buildings[block] = BenchBuilding(bench, block, zoneId, interiorZoneId)
+            if buildingType == 'animbldg':
+                self.blockLists[5].append(block)
+            else:
+                self.blockLists[0].append(block)
+
+    def getDNABlockLists(self):
+        return self.blockLists
+
+    def getBuilding(self, block):
+        return self.buildings.get(block)
+
+    def getBuildings(self):
+        return [self.buildings[block] for block in sorted(self.buildings)]
+
+    def isSuitBlock(self, block):
+        return self.buildings[block].isSuitBlock()
+
+    def getBuildingTrack(self, block):
+        return self.buildings[block].track
+
+    def getSuitBlocks(self):
+        return [block for block in sorted(self.buildings) if self.buildings[block].isSuitBlock()]
+
+    def getEstablishedSuitBlocks(self):
+        return self.getSuitBlocks()
+
+    def getToonBlocks(self):
+        return [block for block in sorted(self.buildings) if self.buildings[block].isToonBlock()]
+
+    def getSuitBlocksByTrack(self, track):
+        return [block for block in self.getSuitBlocks() if self.buildings[block].track == track]
+
+    def getNumSuitBlocks(self):
+        return len(self.getSuitBlocks())
+
+    def getNumCogdoBlocks(self):
+        return len([building for building in self.buildings.values() if building.state == 'cogdo'])
+
+
+class BenchAIRepository:
+    """
+    The handful of repository features DistributedSuitPlannerAI and
+    DistributedSuitAI reach for: doId allocation, generate and delete
+    with no network behind them, the street DNA and suit graphs, and
+    the building and invasion managers.
+    """
+
+    def __init__(self):
+        self.doId2do = {}
+        self.dclassesByName = BenchDClasses()
+        self.districtId = 200000000
+        self.nextDoId = 200000001
+        self.wantCogdominiums = not args.no_cogdos
+        self.suitPopulationScheduler = None
+        self.suitInvasionManager = BenchInvasionManager()
+        self.holidayManager = None
+        self.dnaStoreMap = {}
+        self.suitGraphMap = {}
+        self.buildingManagers = {}
+        self.suitPlanners = {}
+        self.numTakeovers = 0
+        self.numReclaims = 0
+
+    def genDNAFileName(self, zoneId):
+        canonicalZoneId = ZoneUtil.getCanonicalZoneId(zoneId)
+        hoodId = ZoneUtil.getCanonicalHoodId(canonicalZoneId)
+        return 'phase_%s/dna/%s_%s.dna' % (ToontownGlobals.streetPhaseMap[hoodId], ToontownGlobals.dnaMap[hoodId], canonicalZoneId)
+
+    def loadStreet(self, zoneId):
+        dnaStore = DNAStorage()
+        loadDNAFileAI(dnaStore, self.genDNAFileName(zoneId))
+        self.dnaStoreMap[zoneId] = dnaStore
+        self.suitGraphMap[zoneId] = SuitGraph.loadSuitGraph(dnaStore, zoneId)
+
+    def getSuitGraph(self, zoneId):
+        return self.suitGraphMap.get(ZoneUtil.getCanonicalZoneId(zoneId))
+
+    def allocateChannel(self):
+        self.nextDoId += 1
+        return self.nextDoId
+
+    def deallocateChannel(self, doId):
+        pass
+
+    def generateWithRequired(self, do, parentId, zoneId, optionalFields=[]):
+        do.doId = self.allocateChannel()
+        self.addDOToTables(do, location=(parentId, zoneId))
+
+    def addDOToTables(self, do, location=None):
+        do.parentId, do.zoneId = location
+        self.doId2do[do.doId] = do
+
+    def storeObjectLocation(self, do, parentId, zoneId):
+        do.parentId = parentId
+        do.zoneId = zoneId
+
+    def sendSetZone(self, do, zoneId):
+        do.setLocation(do.parentId, zoneId)
+
+    def requestDelete(self, do):
+        self.doId2do.pop(do.doId, None)
+        do.delete()
+
+    def sendSetLocation(self, do, parentId, zoneId):
+        pass
+
+    def sendUpdate(self, do, fieldName, args):
+        pass
+
+    def sendUpdateToChannel(self, do, channelId, fieldName, args):
+        pass
+
+    def getAvatarIdFromSender(self):
+        return 0
+
+    def writeServerEvent(self, *args):
+        pass
+
+
+simbase.air = BenchAIRepository()
+
+from toontown.suit.DistributedSuitPlannerAI import DistributedSuitPlannerAI
+
+
+class PlannerStats:
+    """
+    Counts and times the planner calls we care about.  The planner
+    reaches them through normal attribute lookup, so wrapping them on
+    each instance is enough.
+    """
+    Timed = ('upkeepSuitPopulation', 'adjustSuitPopulation', 'createNewSuit', 'chooseDestination', 'genPath')
+
+    def __init__(self):
+        self.calls = dict([(name, 0) for name in self.Timed])
+        self.times = dict([(name, 0.0) for name in self.Timed])
+        self.numSpawns = 0
+        self.numFailedSpawns = 0
+        self.numGenPathRetries = 0
+        self.numGenPathFailures = 0
+        self.numPathCollisions = 0
+        self.numPointCollisions = 0
+        self.numDestinationFailures = 0
+        self.peakSuits = {}
+        self.peakTotal = 0
+
+    def wrap(self, planner):
+        for name in self.Timed:
+            self.__time(planner, name)
+
+        genPath = planner.genPath
+        chooseDestination = planner.chooseDestination
+        createNewSuit = planner.createNewSuit
+        pathCollision = planner.pathCollision
+        pointCollision = planner.pointCollision
+        attempts = [0]
+
+        def countedGenPath(*args, **kwArgs):
+            attempts[0] += 1
+            path = genPath(*args, **kwArgs)
+            if not path:
+                self.numGenPathFailures += 1
+            return path
+
+        def countedChooseDestination(*args, **kwArgs):
+            attempts[0] = 0
+            result = chooseDestination(*args, **kwArgs)
+            self.numGenPathRetries += max(0, attempts[0] - 1) if result else attempts[0]
+            if not result:
+                self.numDestinationFailures += 1
+            return result
+
+        def countedCreateNewSuit(*args, **kwArgs):
+            suit = createNewSuit(*args, **kwArgs)
+            if suit:
+                self.numSpawns += 1
+            else:
+                self.numFailedSpawns += 1
+            return suit
+
+        def countedPathCollision(*args, **kwArgs):
+            result = pathCollision(*args, **kwArgs)
+            if result:
+                self.numPathCollisions += 1
+            return result
+
+        def countedPointCollision(*args, **kwArgs):
+            result = pointCollision(*args, **kwArgs)
+            if result:
+                self.numPointCollisions += 1
+            return result
+
+        planner.genPath = countedGenPath
+        planner.chooseDestination = countedChooseDestination
+        planner.createNewSuit = countedCreateNewSuit
+        planner.pathCollision = countedPathCollision
+        planner.pointCollision = countedPointCollision
+
+    def __time(self, planner, name):
+        method = getattr(planner, name)
+
+        def timed(*args, **kwArgs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwArgs)
+            finally:
+                self.times[name] += time.perf_counter() - start
+                self.calls[name] += 1
+
+        setattr(planner, name, timed)
+
+    def sample(self, planners):
+        total = 0
+        for planner in planners:
+            numSuits = len(planner.suitList)
+            total += numSuits
+            self.peakSuits[planner.zoneId] = max(self.peakSuits.get(planner.zoneId, 0), numSuits)
+
+        self.peakTotal = max(self.peakTotal, total)
+
+
+def getStreetState(planner):
+    buildingMgr = planner.buildingMgr
+    suits = [(suit.doId, suit.dna.name, suit.getActualLevel(), suit.pathState, suit.zoneId) for suit in planner.suitList]
+    buildings = [(block, buildingMgr.getBuilding(block).state, buildingMgr.getBuilding(block).track) for block in buildingMgr.getSuitBlocks()]
+    return repr((planner.zoneId, planner.numFlyInSuits, planner.numBuildingSuits, planner.numAttemptingTakeover, suits, buildings))
+
+
+def runScenario(streets, suitCount, invasion):
+    air = simbase.air
+    random.seed(args.seed)
+    globalClock.setFrameTime(0.0)
+    air.numTakeovers = 0
+    air.numReclaims = 0
+    if invasion == 'none':
+        air.suitInvasionManager.suitName = None
+        air.suitInvasionManager.skelecog = 0
+    else:
+        air.suitInvasionManager.suitName = invasion
+        air.suitInvasionManager.skelecog = int(args.skelecog)
+    stats = PlannerStats()
+    planners = []
+    for zoneId in streets:
+        air.buildingManagers[zoneId] = BenchBuildingMgr(air, zoneId, air.dnaStoreMap[zoneId])
+        planner = DistributedSuitPlannerAI(air, zoneId)
+        planner.generateWithRequired(zoneId)
+        if suitCount >= 0:
+            planner.currDesired = suitCount
+        stats.wrap(planner)
+        air.suitPlanners[zoneId] = planner
+        planners.append(planner)
+
+    planners[0].assignInitialSuitBuildings()
+    for planner in planners:
+        planner.initTasks()
+
+    digests = []
+    reclaimTime = args.reclaim_minutes * 60.0
+    numSteps = int(args.hours * 3600.0 / args.step)
+    stepsPerMinute = max(1, int(60.0 / args.step))
+    start = time.perf_counter()
+    for i in range(1, numSteps + 1):
+        now = i * args.step
+        globalClock.setFrameTime(now)
+        taskMgr.step()
+        stats.sample(planners)
+        if i % stepsPerMinute == 0:
+            for planner in planners:
+                if reclaimTime > 0:
+                    for building in planner.buildingMgr.getBuildings():
+                        if building.isSuitBuilding() and now - building.becameSuitTime > reclaimTime:
+                            building.toonTakeOver()
+
+                digests.append(hashlib.sha1(getStreetState(planner).encode()).hexdigest())
+
+    wallTime = time.perf_counter() - start
+    for planner in planners:
+        planner.requestDelete()
+        del air.suitPlanners[planner.zoneId]
+        del air.buildingManagers[planner.zoneId]
+
+    return (stats, wallTime, air.numTakeovers, air.numReclaims, digests)
+
+
+def report(name, stats, wallTime, numTakeovers, numReclaims):
+    plannerTime = stats.times['upkeepSuitPopulation'] + stats.times['adjustSuitPopulation']
+    print('%s: %d spawns (%d failed) over %0.1f simulated hours in %0.3f s wall, %0.3f s planner (%0.1f spawns/sec)' % (name, stats.numSpawns, stats.numFailedSpawns, args.hours, wallTime, plannerTime, stats.numSpawns / max(stats.times['createNewSuit'], 1e-09)))
+    print('  genPath: %d calls, %d retries, %d failures; %d destinations not found' % (stats.calls['genPath'], stats.numGenPathRetries, stats.numGenPathFailures, stats.numDestinationFailures))
+    print('  collisions: %d path rejections, %d point rejections' % (stats.numPathCollisions, stats.numPointCollisions))
+    print('  buildings: %d taken over, %d reclaimed' % (numTakeovers, numReclaims))
+    print('  peak suits: %d total; %s' % (stats.peakTotal, ', '.join(['%s:%d' % (zoneId, stats.peakSuits[zoneId]) for zoneId in sorted(stats.peakSuits)])))
+    for methodName in PlannerStats.Timed:
+        calls = stats.calls[methodName]
+        print('  %-21s %7d calls %9.3f ms total %8.3f ms/call' % (methodName, calls, stats.times[methodName] * 1000.0, stats.times[methodName] * 1000.0 / max(calls, 1)))
+
+
+def main():
+    air = simbase.air
+    globalClock.setMode(ClockObject.MSlave)
+    streets = args.streets
+    if not streets:
+        streets = []
+        for hoodStreets in ToontownGlobals.HoodHierarchy.values():
+            streets.extend(hoodStreets)
+
+    for invasion in args.invasion:
+        if invasion != 'none' and invasion not in SuitDNA.suitHeadTypes:
+            print('Unknown suit name %s.' % invasion)
+            return 1
+
+    NPCToons.generateZone2NpcDict()
+    start = time.perf_counter()
+    for zoneId in streets:
+        air.loadStreet(zoneId)
+
+    print('Loaded %d streets in %0.3f s' % (len(streets), time.perf_counter() - start))
+    results = {}
+    for suitCount in args.suit_count:
+        for invasion in args.invasion:
+            name = 'suit-count %s, invasion %s' % (suitCount, invasion)
+            stats, wallTime, numTakeovers, numReclaims, digests = runScenario(streets, suitCount, invasion)
+            report(name, stats, wallTime, numTakeovers, numReclaims)
+            results[name] = digests
+
+    settings = {'seed': args.seed,
+     'streets': streets,
+     'hours': args.hours,
+     'step': args.step,
+     'skelecog': args.skelecog,
+     'reclaimMinutes': args.reclaim_minutes,
+     'cogdos': not args.no_cogdos}
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as file:
+            json.dump({'settings': settings, 'scenarios': results}, file)
+        print('Saved digests of %d scenarios to %s' % (len(results), args.save_baseline))
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)
+        if baseline['settings'] != settings:
+            print('Baseline was recorded with settings %s, not %s; comparison is meaningless.' % (baseline['settings'], settings))
+            return 1
+        drifted = False
+        for name, digests in results.items():
+            if name not in baseline['scenarios']:
+                print('Scenario %s is not in the baseline.' % name)
+                continue
+            baseDigests = baseline['scenarios'][name]
+            changed = [i for i, (a, b) in enumerate(zip(digests, baseDigests)) if a != b]
+            if changed:
+                drifted = True
+                print('BEHAVIOR DRIFT in %s: %d of %d street samples differ from baseline, first at sample %d.' % (name, len(changed), min(len(digests), len(baseDigests)), changed[0]))
+
+        if drifted:
+            return 1
+        print('No behavior drift against %s.' % args.baseline)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
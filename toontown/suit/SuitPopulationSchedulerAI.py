@@ -0,0 +1,118 @@
+from otp.ai.AIBaseGlobal import *
+from direct.directnotify import DirectNotifyGlobal
+from direct.task import Task
+
+
+class SuitPopulationSchedulerAI:
+    """
+    Runs the population upkeep and adjustment of every suit planner in
+    the district from a single task, instead of each planner keeping
+    its own pair of doMethodLater timers.
+
+    Planners still decide when they next want to run (including their
+    random jitter); they just hand that time to us.  Every tick we walk
+    the planners round-robin, starting where the previous tick left
+    off, and run whatever is due until the tick's time budget is spent.
+    Anything left over simply stays due and is picked up first on the
+    next tick, so timers that happen to line up no longer stack into a
+    single spike.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('SuitPopulationSchedulerAI')
+
+    def __init__(self, air):
+        self.air = air
+        self.tickInterval = config.GetFloat('suit-population-tick', 0.5)
+        self.timeBudget = config.GetFloat('suit-population-budget', 0.005)
+        self.planners = []
+        self.nextUpkeep = {}
+        self.nextAdjust = {}
+        self.roundRobinIndex = 0
+        self.zoneId2Deficit = {}
+        self.numTicks = 0
+        self.numOverBudgetTicks = 0
+        self.numUpkeeps = 0
+        self.numAdjusts = 0
+        self.taskName = 'suitPopulationScheduler'
+
+    def start(self):
+        taskMgr.remove(self.taskName)
+        taskMgr.doMethodLater(self.tickInterval, self.__tick, self.taskName)
+
+    def stop(self):
+        taskMgr.remove(self.taskName)
+
+    def addPlanner(self, planner):
+        if planner not in self.planners:
+            self.planners.append(planner)
+
+    def removePlanner(self, planner):
+        if planner in self.planners:
+            index = self.planners.index(planner)
+            self.planners.remove(planner)
+            if index < self.roundRobinIndex:
+                self.roundRobinIndex -= 1
+        self.nextUpkeep.pop(planner, None)
+        self.nextAdjust.pop(planner, None)
+        self.zoneId2Deficit.pop(planner.zoneId, None)
+
+    def scheduleUpkeep(self, planner, delay):
+        self.addPlanner(planner)
+        self.nextUpkeep[planner] = globalClock.getFrameTime() + delay
+
+    def scheduleAdjust(self, planner, delay):
+        self.addPlanner(planner)
+        self.nextAdjust[planner] = globalClock.getFrameTime() + delay
+
+    def __tick(self, task):
+        self.numTicks += 1
+        numPlanners = len(self.planners)
+        if numPlanners == 0:
+            return Task.again
+        now = globalClock.getFrameTime()
+        startTime = globalClock.getRealTime()
+        start = self.roundRobinIndex % numPlanners
+        for i in range(numPlanners):
+            index = (start + i) % numPlanners
+            planner = self.planners[index]
+            if self.__isDue(self.nextUpkeep, planner, now):
+                del self.nextUpkeep[planner]
+                planner.upkeepSuitPopulation(None)
+                self.numUpkeeps += 1
+                self.zoneId2Deficit[planner.zoneId] = planner.getSpawnDeficit()
+            if self.__isDue(self.nextAdjust, planner, now):
+                del self.nextAdjust[planner]
+                planner.adjustSuitPopulation(None)
+                self.numAdjusts += 1
+            if globalClock.getRealTime() - startTime > self.timeBudget:
+                self.numOverBudgetTicks += 1
+                break
+
+        # Whether or not we ran out of budget, the next tick starts with
+        # the planner after the last one we visited.
+        if self.planners:
+            self.roundRobinIndex = (index + 1) % len(self.planners)
+        return Task.again
+
+    def __isDue(self, schedule, planner, now):
+        dueTime = schedule.get(planner)
+        return dueTime is not None and dueTime <= now
+
+    def getDeficit(self, zoneId):
+        return self.zoneId2Deficit.get(zoneId, (0, 0))
+
+    def getTotalDeficit(self):
+        flyInDeficit = 0
+        buildingDeficit = 0
+        for flyIn, building in self.zoneId2Deficit.values():
+            flyInDeficit += flyIn
+            buildingDeficit += building
+
+        return (flyInDeficit, buildingDeficit)
+
+    def getStats(self):
+        return {'planners': len(self.planners),
+         'ticks': self.numTicks,
+         'overBudgetTicks': self.numOverBudgetTicks,
+         'upkeeps': self.numUpkeeps,
+         'adjusts': self.numAdjusts,
+         'deficit': self.getTotalDeficit()}
@@ -273,6 +273,8 @@ class DistributedToonAI(DistributedPlayerAI.DistributedPlayerAI, DistributedSmoo
         self.notify.debug('----Deleting DistributedToonAI %d ' % self.doId)
         if self.isPlayerControlled():
             messenger.send('avatarExited', [self])
+            self.air.npcZoneManager.toonLeft(self.doId)
+            self.air.populationPublisher.toonLeft(self.doId)
         if simbase.wantPets:
             if self.isInEstate():
                 print('ToonAI - Exit estate toonId:%s' % self.doId)
@@ -290,6 +292,7 @@ class DistributedToonAI(DistributedPlayerAI.DistributedPlayerAI, DistributedSmoo
         taskName = 'next-bothDelivery-%s' % self.doId
         taskMgr.remove(taskName)
         self.stopToonUp()
+        Quests.invalidateQuestChoices(self.doId)
         del self.dna
         if self.inventory:
             self.inventory.unload()
@@ -335,6 +338,9 @@ class DistributedToonAI(DistributedPlayerAI.DistributedPlayerAI, DistributedSmoo
 
     def handleLogicalZoneChange(self, newZoneId, oldZoneId):
         DistributedAvatarAI.DistributedAvatarAI.handleLogicalZoneChange(self, newZoneId, oldZoneId)
+        if self.isPlayerControlled():
+            self.air.npcZoneManager.toonChangedZone(self.doId, newZoneId)
+            self.air.populationPublisher.toonChangedZone(self.doId, newZoneId)
         if self.isPlayerControlled() and self.WantTpTrack:
             messenger.send(self.staticGetLogicalZoneChangeAllEvent(), [newZoneId, oldZoneId, self])
         if self.cogIndex != -1 and not ToontownAccessAI.canWearSuit(self.doId, newZoneId):
@@ -1584,6 +1590,7 @@ class DistributedToonAI(DistributedPlayerAI.DistributedPlayerAI, DistributedSmoo
             questList.append(flattenedQuests[i:i + questLen])
 
         self.quests = questList
+        Quests.invalidateQuestChoices(self.doId)
 
     def getQuests(self):
         flattenedQuests = []
@@ -1938,6 +1945,7 @@ class DistributedToonAI(DistributedPlayerAI.DistributedPlayerAI, DistributedSmoo
     def setQuestHistory(self, questList):
         self.notify.debug('setting quest history to %s' % questList)
         self.questHistory = questList
+        Quests.invalidateQuestChoices(self.doId)
 
     def getQuestHistory(self):
         return self.questHistory
@@ -1971,6 +1979,7 @@ class DistributedToonAI(DistributedPlayerAI.DistributedPlayerAI, DistributedSmoo
         self.notify.debug('setting reward history to tier %s, %s' % (tier, rewardList))
         self.rewardTier = tier
         self.rewardHistory = rewardList
+        Quests.invalidateQuestChoices(self.doId)
 
     def getRewardHistory(self):
         return (self.rewardTier, self.rewardHistory)
@@ -6,23 +6,36 @@ from direct.directnotify import DirectNotifyGlobal
 from direct.distributed.PyDatagram import PyDatagram
 from direct.distributed.PyDatagramIterator import PyDatagramIterator
 
+# Every gag count fits in a byte, and the counts are stored track by
+# track in exactly the layout makeNetString sends, so an inventory is
+# one flat buffer that can be copied to and from the wire directly.
+# TrackOffsets[track] is where that track's levels start.
+TrackOffsets = []
+InventoryNetSize = 0
+for trackLevels in Levels:
+    TrackOffsets.append(InventoryNetSize)
+    InventoryNetSize += len(trackLevels)
+
+# Recording where every inventory was created is only useful when
+# hunting leaks, and inventories are made for every toon generate,
+# purchase and battle, so it is opt-in.
+TrackInventoryAllocations = ConfigVariableBool('inventory-track-allocations', False).value
+
 class InventoryBase(DirectObject.DirectObject):
     notify = DirectNotifyGlobal.directNotify.newCategory('InventoryBase')
 
     def __init__(self, toon, invStr = None):
-        self._createStack = str(StackTrace().compact())
+        if TrackInventoryAllocations:
+            self._createStack = str(StackTrace().compact())
         self.toon = toon
-        if invStr == None:
-            self.inventory = []
-            for track in range(0, len(Tracks)):
-                level = []
-                for thisLevel in range(0, len(Levels[track])):
-                    level.append(0)
-
-                self.inventory.append(level)
+        self.buffer = bytearray(InventoryNetSize)
+        view = memoryview(self.buffer)
+        self.inventory = []
+        for track in range(0, len(Tracks)):
+            self.inventory.append(view[TrackOffsets[track]:TrackOffsets[track] + len(Levels[track])])
 
-        else:
-            self.inventory = self.makeFromNetString(invStr)
+        if invStr != None:
+            self.readNetString(invStr)
         self.calcTotalProps()
         return
 
@@ -32,43 +45,37 @@ class InventoryBase(DirectObject.DirectObject):
     def __str__(self):
         retStr = 'totalProps: %d\n' % self.totalProps
         for track in range(0, len(Tracks)):
-            retStr += Tracks[track] + ' = ' + str(self.inventory[track]) + '\n'
+            retStr += Tracks[track] + ' = ' + str(list(self.inventory[track])) + '\n'
 
         return retStr
 
+    def readNetString(self, netString):
+        size = min(len(netString), InventoryNetSize)
+        self.buffer[:size] = netString[:size]
+        if size < InventoryNetSize:
+            self.buffer[size:] = bytes(InventoryNetSize - size)
+
     def updateInvString(self, invString):
-        inventory = self.makeFromNetString(invString)
-        self.updateInventory(inventory)
+        self.readNetString(invString)
+        self.calcTotalProps()
         return None
 
     def updateInventory(self, inv):
-        self.inventory = inv
+        for track in range(0, len(Tracks)):
+            self.inventory[track][:] = bytes(inv[track])
+
         self.calcTotalProps()
 
     def makeNetString(self):
-        dataList = self.inventory
-        datagram = PyDatagram()
-        for track in range(0, len(Tracks)):
-            for level in range(0, len(Levels[track])):
-                datagram.addUint8(dataList[track][level])
-
-        dgi = PyDatagramIterator(datagram)
-        return dgi.getRemainingBytes()
+        return bytes(self.buffer)
 
     def makeFromNetString(self, netString):
+        data = bytearray(netString[:InventoryNetSize])
+        if len(data) < InventoryNetSize:
+            data.extend(bytes(InventoryNetSize - len(data)))
         dataList = []
-        dg = PyDatagram(netString)
-        dgi = PyDatagramIterator(dg)
         for track in range(0, len(Tracks)):
-            subList = []
-            for level in range(0, len(Levels[track])):
-                if dgi.getRemainingSize() > 0:
-                    value = dgi.getUint8()
-                else:
-                    value = 0
-                subList.append(value)
-
-            dataList.append(subList)
+            dataList.append(list(data[TrackOffsets[track]:TrackOffsets[track] + len(Levels[track])]))
 
         return dataList
 
@@ -174,9 +181,7 @@ class InventoryBase(DirectObject.DirectObject):
     def calcTotalProps(self):
         self.totalProps = 0
         for track in range(0, len(Tracks)):
-            for level in range(0, len(Levels[track])):
-                if level <= LAST_REGULAR_GAG_LEVEL:
-                    self.totalProps += self.numItem(track, level)
+            self.totalProps += sum(self.inventory[track][:LAST_REGULAR_GAG_LEVEL + 1])
 
         return None
 
@@ -330,4 +335,6 @@ class InventoryBase(DirectObject.DirectObject):
         return None
 
     def _garbageInfo(self):
-        return self._createStack
+        if hasattr(self, '_createStack'):
+            return self._createStack
+        return 'inventory-track-allocations is off'
@@ -152,10 +152,13 @@ def createNPC(air, npcId, desc, zoneId, posIndex = 0, questCallback = None):
     return npc
 
 
+def getNpcIdsInZone(zoneId):
+    return zone2NpcDict.get(ZoneUtil.getCanonicalZoneId(zoneId), [])
+
+
 def createNpcsInZone(air, zoneId):
     npcs = []
-    canonicalZoneId = ZoneUtil.getCanonicalZoneId(zoneId)
-    npcIdList = zone2NpcDict.get(canonicalZoneId, [])
+    npcIdList = getNpcIdsInZone(zoneId)
     for i in range(len(npcIdList)):
         npcId = npcIdList[i]
         npcDesc = NPCToonDict.get(npcId)
@@ -0,0 +1,124 @@
+from otp.ai.AIBaseGlobal import *
+from direct.directnotify import DirectNotifyGlobal
+from direct.task import Task
+from toontown.toon import NPCToons
+
+
+class NPCZoneManagerAI:
+    """
+    Owns the NPC toons of building interiors and fishing ponds.
+
+    By default the NPCs of a zone are generated as soon as the zone is
+    added, as they always have been.  With want-lazy-npcs on, adding a
+    zone only records it: its NPCs are generated when the first toon
+    enters the zone, and deleted again once the zone has been empty
+    for lazy-npc-idle-timeout seconds.  Nothing outside the zone needs
+    the NPC objects themselves; quest and teleport code find an NPC's
+    zone through NPCToons.getNPCZone and zone2NpcDict, which don't
+    depend on it having been generated.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('NPCZoneManagerAI')
+
+    def __init__(self, air):
+        self.air = air
+        self.wantLazyNpcs = config.GetBool('want-lazy-npcs', False)
+        self.idleTimeout = config.GetFloat('lazy-npc-idle-timeout', 300.0)
+        self.zoneId2Npcs = {}
+        self.zoneId2Toons = {}
+        self.avId2ZoneId = {}
+        self.numGenerated = 0
+        self.numReclaimed = 0
+
+    def createNpcsInZone(self, zoneId):
+        """
+        Returns the NPCs generated for zoneId right away, which is none
+        of them in lazy mode.  Either way, call removeZone when the
+        zone goes away.
+        """
+        if not self.wantLazyNpcs:
+            return NPCToons.createNpcsInZone(self.air, zoneId)
+        if not NPCToons.getNpcIdsInZone(zoneId):
+            return []
+        self.zoneId2Npcs[zoneId] = None
+        if self.zoneId2Toons.get(zoneId):
+            self.__generateNpcs(zoneId)
+        return []
+
+    def removeZone(self, zoneId):
+        if zoneId not in self.zoneId2Npcs:
+            return
+        taskMgr.remove(self.__getReclaimTaskName(zoneId))
+        self.__deleteNpcs(zoneId)
+        del self.zoneId2Npcs[zoneId]
+
+    def getNpcs(self, zoneId):
+        return self.zoneId2Npcs.get(zoneId) or []
+
+    def toonChangedZone(self, avId, newZoneId):
+        oldZoneId = self.avId2ZoneId.get(avId)
+        if oldZoneId == newZoneId:
+            return
+        if oldZoneId is not None:
+            self.__removeToon(avId, oldZoneId)
+        if newZoneId is None:
+            self.avId2ZoneId.pop(avId, None)
+            return
+        self.avId2ZoneId[avId] = newZoneId
+        self.zoneId2Toons.setdefault(newZoneId, set()).add(avId)
+        if newZoneId in self.zoneId2Npcs:
+            taskMgr.remove(self.__getReclaimTaskName(newZoneId))
+            if self.zoneId2Npcs[newZoneId] is None:
+                self.__generateNpcs(newZoneId)
+
+    def toonLeft(self, avId):
+        self.toonChangedZone(avId, None)
+
+    def __removeToon(self, avId, zoneId):
+        toons = self.zoneId2Toons.get(zoneId)
+        if toons is None:
+            return
+        toons.discard(avId)
+        if toons:
+            return
+        del self.zoneId2Toons[zoneId]
+        if self.zoneId2Npcs.get(zoneId):
+            taskMgr.doMethodLater(self.idleTimeout, self.__reclaimNpcs, self.__getReclaimTaskName(zoneId), extraArgs=[zoneId])
+
+    def __getReclaimTaskName(self, zoneId):
+        return 'reclaimNpcs-%s' % zoneId
+
+    def __generateNpcs(self, zoneId):
+        npcs = NPCToons.createNpcsInZone(self.air, zoneId)
+        self.zoneId2Npcs[zoneId] = npcs
+        self.numGenerated += len(npcs)
+
+    def __deleteNpcs(self, zoneId):
+        npcs = self.zoneId2Npcs.get(zoneId)
+        if not npcs:
+            return
+        for npc in npcs:
+            npc.requestDelete()
+
+        self.numReclaimed += len(npcs)
+        self.zoneId2Npcs[zoneId] = None
+
+    def __reclaimNpcs(self, zoneId):
+        if self.zoneId2Toons.get(zoneId) or zoneId not in self.zoneId2Npcs:
+            return Task.done
+        for npc in self.zoneId2Npcs[zoneId] or []:
+            if npc.isBusy():
+                # Still finishing a movie for someone; try again later.
+                return Task.again
+        self.__deleteNpcs(zoneId)
+        return Task.done
+
+    def getStats(self):
+        numLive = 0
+        for npcs in self.zoneId2Npcs.values():
+            if npcs:
+                numLive += len(npcs)
+
+        return {'zones': len(self.zoneId2Npcs),
+         'liveNpcs': numLive,
+         'generated': self.numGenerated,
+         'reclaimed': self.numReclaimed}
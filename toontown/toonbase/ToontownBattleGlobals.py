@@ -1,5 +1,6 @@
 from .ToontownGlobals import *
 import math
+import bisect
 from . import TTLocalizer
 BattleCamFaceOffFov = 30.0
 BattleCamFaceOffPos = Point3(0, -10, 4)
@@ -722,16 +723,20 @@ AvPropTarget = (0,
  3,
  3)
 
-def getAvPropDamage(attackTrack, attackLevel, exp, organicBonus = False, propBonus = False, propAndOrganicBonusStack = False):
+def calcAvPropBaseDamage(attackTrack, attackLevel, exp):
     minD = AvPropDamage[attackTrack][attackLevel][0][0]
     maxD = AvPropDamage[attackTrack][attackLevel][0][1]
     minE = AvPropDamage[attackTrack][attackLevel][1][0]
     maxE = AvPropDamage[attackTrack][attackLevel][1][1]
     expVal = min(exp, maxE)
     expPerHp = float(maxE - minE + 1) / float(maxD - minD + 1)
-    damage = math.floor((expVal - minE) / expPerHp) + minD
+    return math.floor((expVal - minE) / expPerHp) + minD
+
+
+def calcAvPropDamage(attackTrack, attackLevel, exp, organicBonus = False, propBonus = False, propAndOrganicBonusStack = False):
+    damage = calcAvPropBaseDamage(attackTrack, attackLevel, exp)
     if damage <= 0:
-        damage = minD
+        damage = AvPropDamage[attackTrack][attackLevel][0][0]
     if propAndOrganicBonusStack:
         originalDamage = damage
         if organicBonus:
@@ -743,6 +748,88 @@ def getAvPropDamage(attackTrack, attackLevel, exp, organicBonus = False, propBon
     return damage
 
 
+def getPropBonusIndex(organicBonus, propBonus, propAndOrganicBonusStack):
+    if propAndOrganicBonusStack:
+        return PROP_BONUS_STACKED + bool(organicBonus) + bool(propBonus)
+    elif organicBonus or propBonus:
+        return PROP_BONUS_SINGLE
+    return PROP_BONUS_NONE
+
+
+def getAvPropDamage(attackTrack, attackLevel, exp, organicBonus = False, propBonus = False, propAndOrganicBonusStack = False):
+    thresholds, damages = AvPropDamageTable[attackTrack][attackLevel]
+    bonusIndex = getPropBonusIndex(organicBonus, propBonus, propAndOrganicBonusStack)
+    # Experience below the first threshold gets the lowest tier.
+    return damages[bonusIndex][max(bisect.bisect_right(thresholds, exp) - 1, 0)]
+
+
+def getAvPropAccuracy(attackTrack, attackLevel, organicBonus = False, propBonus = False, propAndOrganicBonusStack = False):
+    bonusIndex = getPropBonusIndex(organicBonus, propBonus, propAndOrganicBonusStack)
+    return AvPropAccuracyTable[attackTrack][attackLevel][bonusIndex]
+
+
+def _makeAvPropDamageEntry(attackTrack, attackLevel):
+    # Damage only changes at a handful of experience values, so we
+    # store those thresholds and the damage that applies from each one
+    # on.  The thresholds are found by bisecting calcAvPropBaseDamage
+    # itself (which never decreases with experience), so the table
+    # reproduces its floating point behavior exactly.
+    maxE = AvPropDamage[attackTrack][attackLevel][1][1]
+
+    def damageAt(exp):
+        return calcAvPropBaseDamage(attackTrack, attackLevel, exp)
+
+    thresholds = [0]
+    exp = 0
+    while exp < maxE:
+        damage = damageAt(exp)
+        low = exp + 1
+        high = maxE
+        if damageAt(high) == damage:
+            break
+        while low < high:
+            mid = (low + high) // 2
+            if damageAt(mid) == damage:
+                low = mid + 1
+            else:
+                high = mid
+
+        thresholds.append(low)
+        exp = low
+
+    damages = []
+    for bonusIndex in range(PROP_BONUS_INDEXES):
+        if bonusIndex >= PROP_BONUS_STACKED:
+            organicBonus = bonusIndex - PROP_BONUS_STACKED >= 1
+            propBonus = bonusIndex - PROP_BONUS_STACKED >= 2
+            stack = True
+        else:
+            organicBonus = bonusIndex == PROP_BONUS_SINGLE
+            propBonus = False
+            stack = False
+        damages.append(tuple([calcAvPropDamage(attackTrack, attackLevel, exp, organicBonus, propBonus, stack) for exp in thresholds]))
+
+    return (tuple(thresholds), tuple(damages))
+
+
+def _makeAvPropAccuracyEntry(attackTrack, attackLevel):
+    accuracy = AvPropAccuracy[attackTrack][attackLevel]
+    if attackTrack != LURE_TRACK:
+        return (accuracy,) * PROP_BONUS_INDEXES
+    bonusAccuracy = AvLureBonusAccuracy[attackLevel]
+    return (accuracy,
+     bonusAccuracy,
+     0,
+     bonusAccuracy,
+     bonusAccuracy * 2)
+
+
+PROP_BONUS_NONE = 0
+PROP_BONUS_SINGLE = 1
+PROP_BONUS_STACKED = 2
+PROP_BONUS_INDEXES = 5
+
+
 def getDamageBonus(normal):
     bonus = int(normal * 0.1)
     if bonus < 1 and normal > 0:
@@ -750,6 +837,10 @@ def getDamageBonus(normal):
     return bonus
 
 
+AvPropDamageTable = tuple([tuple([_makeAvPropDamageEntry(track, level) for level in range(len(AvPropDamage[track]))]) for track in range(len(AvPropDamage))])
+AvPropAccuracyTable = tuple([tuple([_makeAvPropAccuracyEntry(track, level) for level in range(len(AvPropAccuracy[track]))]) for track in range(len(AvPropAccuracy))])
+
+
 def isGroup(track, level):
     return AvPropTargetCat[AvPropTarget[track]][level]
 
@@ -1,6 +1,7 @@
 from direct.directnotify import DirectNotifyGlobal
 from pandac.PandaModules import ConfigVariableBool
 from direct.task import Task
+from toontown.uberdog import DataStoreJournal
 import pickle
 import os
 import sys
@@ -20,7 +21,8 @@ class DataStore:
         return newTypes
 
     notify = DirectNotifyGlobal.directNotify.newCategory('DataStore')
-    wantAnyDbm = ConfigVariableBool('want-ds-anydbm', 1).getValue()
+    wantJournal = ConfigVariableBool('want-ds-journal', 1).getValue()
+    wantAnyDbm = ConfigVariableBool('want-ds-anydbm', 1).getValue() and not wantJournal
 
     def __init__(self, filepath, writePeriod = 300, writeCountTrigger = 100):
         self.filepath = filepath
@@ -29,14 +31,19 @@ class DataStore:
         self.writeCount = 0
         self.data = None
         self.className = self.__class__.__name__
-        if self.wantAnyDbm:
+        if self.wantJournal:
+            self.filepath += '-journal'
+        elif self.wantAnyDbm:
             self.filepath += '-anydbm'
             self.notify.debug('anydbm default module used: %s ' % dbm._defaultmod.__name__)
         self.open()
         return
 
     def readDataFromFile(self):
-        if self.wantAnyDbm:
+        if self.wantJournal:
+            self.data = DataStoreJournal.DataStoreJournal(self.filepath, self.writePeriod, self.writeCountTrigger)
+            self.data.open()
+        elif self.wantAnyDbm:
             try:
                 if os.path.exists(self.filepath):
                     self.data = dbm.open(self.filepath, 'w')
@@ -72,7 +79,7 @@ class DataStore:
     def writeDataToFile(self):
         if self.data is not None:
             self.notify.debug('Data is now synced with disk at %s' % self.filepath)
-            if self.wantAnyDbm:
+            if self.wantJournal or self.wantAnyDbm:
                 self.data.sync()
             else:
                 try:
@@ -113,7 +120,7 @@ class DataStore:
     def close(self):
         if self.data is not None:
             self.writeDataToFile()
-            if self.wantAnyDbm:
+            if self.wantJournal or self.wantAnyDbm:
                 self.data.close()
             taskMgr.remove('%s-syncTask' % (self.className,))
             self.data = None
@@ -124,6 +131,9 @@ class DataStore:
         self.readDataFromFile()
         self.resetWriteCount()
         taskMgr.remove('%s-syncTask' % (self.className,))
+        if self.wantJournal:
+            # The journal flushes itself from its own writer thread.
+            return
         t = taskMgr.add(self.syncTask, '%s-syncTask' % (self.className,))
         t.timeElapsed = 0.0
 
@@ -133,7 +143,12 @@ class DataStore:
 
     def destroy(self):
         self.close()
-        if self.wantAnyDbm:
+        if self.wantJournal:
+            for path in DataStoreJournal.DataStoreJournal(self.filepath).getFilePaths():
+                if os.path.exists(path):
+                    os.remove(path)
+
+        elif self.wantAnyDbm:
             lt = time.asctime(time.localtime())
             trans = ': '.maketrans('__')
             t = lt.translate(trans)
@@ -165,13 +180,11 @@ class DataStore:
 
     def query(self, query):
         if self.data is not None:
-            qData = pickle.loads(query)
+            qData = DataStoreJournal.decodeValue(query)
             results = self.handleQuery(qData)
-            qResults = pickle.dumps(results)
         else:
             results = None
-            qResults = pickle.dumps(results)
-        return qResults
+        return DataStoreJournal.encodeValue(results)
 
     def handleQuery(self, query):
         results = None
@@ -0,0 +1,395 @@
+from direct.directnotify import DirectNotifyGlobal
+import os
+import struct
+import threading
+import zlib
+
+# Values are written with a small tagged binary encoding rather than
+# pickles: one tag byte, then a varint, a length-prefixed payload or a
+# run of nested values, depending on the tag.
+TAG_NONE = 0
+TAG_TRUE = 1
+TAG_FALSE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STR = 5
+TAG_BYTES = 6
+TAG_TUPLE = 7
+TAG_LIST = 8
+TAG_SET = 9
+TAG_FROZENSET = 10
+TAG_DICT = 11
+
+OP_SET = 1
+OP_DELETE = 2
+
+FILE_MAGIC = b'TTDS'
+FILE_VERSION = 1
+FILE_HEADER = FILE_MAGIC + bytes([FILE_VERSION])
+
+floatStruct = struct.Struct('<d')
+crcStruct = struct.Struct('<I')
+
+
+def encodeVarint(value, out):
+    while value > 127:
+        out.append(value & 127 | 128)
+        value >>= 7
+
+    out.append(value)
+
+
+def decodeVarint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 127) << shift
+        if not byte & 128:
+            return (value, offset)
+        shift += 7
+
+
+def encodeInto(value, out):
+    if value is None:
+        out.append(TAG_NONE)
+    elif value is True:
+        out.append(TAG_TRUE)
+    elif value is False:
+        out.append(TAG_FALSE)
+    elif isinstance(value, int):
+        out.append(TAG_INT)
+        if value < 0:
+            encodeVarint((-value << 1) - 1, out)
+        else:
+            encodeVarint(value << 1, out)
+    elif isinstance(value, float):
+        out.append(TAG_FLOAT)
+        out.extend(floatStruct.pack(value))
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        out.append(TAG_STR)
+        encodeVarint(len(data), out)
+        out.extend(data)
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(TAG_BYTES)
+        encodeVarint(len(value), out)
+        out.extend(value)
+    elif isinstance(value, dict):
+        out.append(TAG_DICT)
+        encodeVarint(len(value), out)
+        for key, item in value.items():
+            encodeInto(key, out)
+            encodeInto(item, out)
+
+    else:
+        if isinstance(value, tuple):
+            tag = TAG_TUPLE
+        elif isinstance(value, list):
+            tag = TAG_LIST
+        elif isinstance(value, set):
+            tag = TAG_SET
+        elif isinstance(value, frozenset):
+            tag = TAG_FROZENSET
+        else:
+            raise TypeError('cannot encode %s in a data store' % type(value).__name__)
+        out.append(tag)
+        encodeVarint(len(value), out)
+        for item in value:
+            encodeInto(item, out)
+
+
+def decodeFrom(data, offset):
+    tag = data[offset]
+    offset += 1
+    if tag == TAG_NONE:
+        return (None, offset)
+    elif tag == TAG_TRUE:
+        return (True, offset)
+    elif tag == TAG_FALSE:
+        return (False, offset)
+    elif tag == TAG_INT:
+        value, offset = decodeVarint(data, offset)
+        if value & 1:
+            return (-((value + 1) >> 1), offset)
+        return (value >> 1, offset)
+    elif tag == TAG_FLOAT:
+        return (floatStruct.unpack_from(data, offset)[0], offset + floatStruct.size)
+    elif tag in (TAG_STR, TAG_BYTES):
+        length, offset = decodeVarint(data, offset)
+        value = bytes(data[offset:offset + length])
+        if len(value) != length:
+            raise ValueError('truncated value')
+        if tag == TAG_STR:
+            value = value.decode('utf-8')
+        return (value, offset + length)
+    elif tag == TAG_DICT:
+        length, offset = decodeVarint(data, offset)
+        value = {}
+        for i in range(length):
+            key, offset = decodeFrom(data, offset)
+            value[key], offset = decodeFrom(data, offset)
+
+        return (value, offset)
+    elif tag in (TAG_TUPLE, TAG_LIST, TAG_SET, TAG_FROZENSET):
+        length, offset = decodeVarint(data, offset)
+        items = []
+        for i in range(length):
+            item, offset = decodeFrom(data, offset)
+            items.append(item)
+
+        if tag == TAG_TUPLE:
+            return (tuple(items), offset)
+        elif tag == TAG_SET:
+            return (set(items), offset)
+        elif tag == TAG_FROZENSET:
+            return (frozenset(items), offset)
+        return (items, offset)
+    raise ValueError('unknown tag %s' % tag)
+
+
+def encodeValue(value):
+    out = bytearray()
+    encodeInto(value, out)
+    return bytes(out)
+
+
+def decodeValue(data):
+    value, offset = decodeFrom(data, 0)
+    return value
+
+
+def encodeRecord(op, key, value=None):
+    """
+    A journal record is a varint payload length, the payload (op byte,
+    encoded key and, for OP_SET, encoded value) and a crc32 of the
+    payload, so a record torn by a crash is detected and dropped.
+    """
+    payload = bytearray([op])
+    encodeInto(key, payload)
+    if op == OP_SET:
+        encodeInto(value, payload)
+    record = bytearray()
+    encodeVarint(len(payload), record)
+    record.extend(payload)
+    record.extend(crcStruct.pack(zlib.crc32(bytes(payload)) & 4294967295))
+    return bytes(record)
+
+
+def iterRecords(data):
+    """
+    Yields (op, keyBytes, payload, endOffset) for each intact record in
+    a journal or snapshot file's contents, stopping at the first one
+    that is truncated or fails its checksum.
+    """
+    offset = len(FILE_HEADER)
+    if data[:offset] != FILE_HEADER:
+        return
+    while offset < len(data):
+        try:
+            length, start = decodeVarint(data, offset)
+        except IndexError:
+            return
+        end = start + length
+        if end + crcStruct.size > len(data) or length == 0:
+            return
+        payload = data[start:end]
+        if crcStruct.unpack_from(data, end)[0] != zlib.crc32(payload) & 4294967295:
+            return
+        try:
+            key, keyEnd = decodeFrom(payload, 1)
+        except (IndexError, ValueError, UnicodeDecodeError):
+            return
+        offset = end + crcStruct.size
+        yield (payload[0], payload[1:keyEnd], payload, offset)
+
+
+class DataStoreJournal:
+    """
+    The storage behind a DataStore: the whole store lives in memory as
+    a dict, and every change is appended to a journal file as a
+    checksummed binary record.  Records are buffered and written by a
+    background thread, either every writePeriod seconds or as soon as
+    flushCount of them are waiting, so the task loop never touches the
+    disk.
+
+    When the journal grows past compactSize bytes the writer thread
+    starts a fresh journal and folds the old one into a snapshot file,
+    which is written to a temporary name and renamed into place.  On
+    open the snapshot, any journal left over from an interrupted
+    compaction and the current journal are replayed in that order;
+    since records hold whole values, replaying one twice is harmless.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory('DataStoreJournal')
+
+    def __init__(self, filepath, writePeriod=300, flushCount=100, compactSize=16777216):
+        self.filepath = filepath
+        self.snapshotPath = filepath + '.snapshot'
+        self.journalPath = filepath + '.journal'
+        self.oldJournalPath = filepath + '.journal.old'
+        self.writePeriod = writePeriod
+        self.flushCount = flushCount
+        self.compactSize = compactSize
+        self.data = {}
+        self.pending = []
+        self.condition = threading.Condition()
+        self.flushRequested = False
+        self.stopping = False
+        self.thread = None
+        self.journalFile = None
+        self.numCompactions = 0
+
+    def getFilePaths(self):
+        return (self.snapshotPath, self.journalPath, self.oldJournalPath)
+
+    def open(self):
+        self.data = {}
+        for path in (self.snapshotPath, self.oldJournalPath):
+            self.__replayFile(path)
+
+        goodSize = self.__replayFile(self.journalPath)
+        if goodSize is None:
+            self.journalFile = open(self.journalPath, 'wb')
+            self.journalFile.write(FILE_HEADER)
+            self.journalFile.flush()
+        else:
+            # Drop a record torn by a crash so new records follow an
+            # intact one.
+            self.journalFile = open(self.journalPath, 'r+b')
+            self.journalFile.truncate(goodSize)
+            self.journalFile.seek(goodSize)
+        self.notify.debug('Opened %s with %s keys.' % (self.filepath, len(self.data)))
+        self.stopping = False
+        self.thread = threading.Thread(target=self.__writerLoop, name='DataStoreJournal-%s' % os.path.basename(self.filepath))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def close(self):
+        if self.thread is None:
+            return
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        self.thread.join()
+        self.thread = None
+        self.journalFile.close()
+        self.journalFile = None
+
+    def __replayFile(self, path):
+        """
+        Applies the intact records of path to self.data, returning the
+        size of the intact part of the file, or None if it is missing
+        or isn't one of our files.
+        """
+        try:
+            with open(path, 'rb') as file:
+                contents = file.read()
+        except EnvironmentError:
+            return None
+        if contents[:len(FILE_HEADER)] != FILE_HEADER:
+            self.notify.warning('Ignoring %s: not a data store file.' % path)
+            return None
+        goodSize = len(FILE_HEADER)
+        for op, keyBytes, payload, goodSize in iterRecords(contents):
+            key, offset = decodeFrom(payload, 1)
+            if op == OP_SET:
+                self.data[key] = decodeFrom(payload, offset)[0]
+            else:
+                self.data.pop(key, None)
+
+        if goodSize < len(contents):
+            self.notify.warning('Dropped %s trailing bytes of %s.' % (len(contents) - goodSize, path))
+        return goodSize
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    def keys(self):
+        return self.data.keys()
+
+    def __setitem__(self, key, value):
+        # The record is encoded now, so later changes to a mutable
+        # value aren't stored until it is set again.
+        self.data[key] = value
+        self.__append(encodeRecord(OP_SET, key, value))
+
+    def __delitem__(self, key):
+        del self.data[key]
+        self.__append(encodeRecord(OP_DELETE, key))
+
+    def __append(self, record):
+        with self.condition:
+            self.pending.append(record)
+            if len(self.pending) >= self.flushCount:
+                self.condition.notify()
+
+    def sync(self):
+        with self.condition:
+            self.flushRequested = True
+            self.condition.notify()
+
+    def __writerLoop(self):
+        while True:
+            with self.condition:
+                if not (self.pending or self.stopping or self.flushRequested):
+                    self.condition.wait(self.writePeriod)
+                records = self.pending
+                self.pending = []
+                self.flushRequested = False
+                stopping = self.stopping
+            try:
+                if records:
+                    self.journalFile.write(b''.join(records))
+                    self.journalFile.flush()
+                    os.fsync(self.journalFile.fileno())
+                if self.journalFile.tell() > self.compactSize:
+                    self.__compact()
+            except EnvironmentError as e:
+                self.notify.warning('Could not write %s: %s' % (self.filepath, e))
+            if stopping:
+                return
+
+    def __compact(self):
+        if not os.path.exists(self.oldJournalPath):
+            self.journalFile.close()
+            os.rename(self.journalPath, self.oldJournalPath)
+            self.journalFile = open(self.journalPath, 'wb')
+            self.journalFile.write(FILE_HEADER)
+            self.journalFile.flush()
+        records = {}
+        for path in (self.snapshotPath, self.oldJournalPath):
+            try:
+                with open(path, 'rb') as file:
+                    contents = file.read()
+            except EnvironmentError:
+                continue
+            start = len(FILE_HEADER)
+            for op, keyBytes, payload, end in iterRecords(contents):
+                if op == OP_SET:
+                    records[keyBytes] = contents[start:end]
+                else:
+                    records.pop(keyBytes, None)
+                start = end
+
+        tempPath = self.snapshotPath + '.tmp'
+        with open(tempPath, 'wb') as file:
+            file.write(FILE_HEADER)
+            for record in records.values():
+                file.write(record)
+
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tempPath, self.snapshotPath)
+        os.remove(self.oldJournalPath)
+        self.numCompactions += 1
+        self.notify.info('Compacted %s to %s keys.' % (self.filepath, len(records)))
@@ -22,28 +22,31 @@ class ScavengerHuntDataStore(DataStore):
 
     def __addGoalToAvatarId(self, avId, goal):
         if self.wantAnyDbm:
-            pAvId = cPickle.dumps(avId)
-            pGoal = cPickle.dumps(goal)
+            pAvId = pickle.dumps(avId)
+            pGoal = pickle.dumps(goal)
             pData = self.data.get(pAvId, None)
             if pData is not None:
-                data = cPickle.loads(pData)
+                data = pickle.loads(pData)
             else:
                 data = set()
             data.add(goal)
-            pData = cPickle.dumps(data)
+            pData = pickle.dumps(data)
             self.data[pAvId] = pData
         else:
-            self.data.setdefault(avId, set())
-            self.data[avId].add(goal)
+            # Store a new set rather than changing the stored one in
+            # place, so the journal sees the change.
+            data = set(self.data.get(avId, ()))
+            data.add(goal)
+            self.data[avId] = data
         self.incrementWriteCount()
         return
 
     def __getGoalsForAvatarId(self, avId):
         if self.wantAnyDbm:
-            pAvId = cPickle.dumps(avId)
+            pAvId = pickle.dumps(avId)
             pData = self.data.get(pAvId, None)
             if pData is not None:
-                data = list(cPickle.loads(pData))
+                data = list(pickle.loads(pData))
             else:
                 data = []
             return data